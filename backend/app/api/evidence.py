@@ -0,0 +1,80 @@
+"""API endpoints for querying trend evidence."""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.evidence import find_trends_by_evidence, top_evidence
+
+router = APIRouter(prefix="/api", tags=["evidence"])
+
+
+class EvidenceMatch(BaseModel):
+    """A trend citing a matching evidence string."""
+
+    radar_date: str
+    focus_area: str
+    tool_name: str
+    classification: str
+    kind: str
+    evidence: str
+
+
+class EvidenceCount(BaseModel):
+    """How often an evidence string is cited."""
+
+    evidence: str
+    kind: str
+    citations: int
+    tools: int
+
+
+def _date_range(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+) -> tuple[Optional[str], Optional[str]]:
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+    return (
+        from_date.isoformat() if from_date else None,
+        to_date.isoformat() if to_date else None,
+    )
+
+
+@router.get("/evidence", response_model=list[EvidenceMatch])
+def evidence_matches(
+    contains: str = Query(..., min_length=1),
+    kind: Optional[str] = Query(None, pattern="^(signal|noise)$"),
+    classification: Optional[str] = Query(None, pattern="^(signal|noise)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    date_range: tuple = Depends(_date_range),
+    db: Session = Depends(get_db),
+):
+    """
+    Find trends whose evidence contains a text, e.g. all signals citing benchmarks.
+
+    contains must start at a word boundary, as it is looked up in the search
+    index. kind selects signal_evidence or noise_indicators entries;
+    classification filters on the trend itself.
+    """
+    from_date, to_date = date_range
+    return find_trends_by_evidence(
+        db, contains, kind, classification, from_date, to_date, limit=limit
+    )
+
+
+@router.get("/evidence/top", response_model=list[EvidenceCount])
+def evidence_top(
+    kind: Optional[str] = Query(None, pattern="^(signal|noise)$"),
+    classification: Optional[str] = Query(None, pattern="^(signal|noise)$"),
+    limit: int = Query(20, ge=1, le=100),
+    date_range: tuple = Depends(_date_range),
+    db: Session = Depends(get_db),
+):
+    """Most cited evidence strings, with the number of distinct tools citing each."""
+    from_date, to_date = date_range
+    return top_evidence(db, kind, classification, from_date, to_date, limit=limit)
@@ -1,15 +1,39 @@
 """API endpoints for radar data."""
 
-import json
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 from pydantic import BaseModel
 
-from app.database import get_db
-from app.models import Trend
+from app.database import DB_MODE, get_async_db, get_db, get_write_db
+from app.models import RefreshJob
+from app.services.radar_cache import CachedRadar, etag_matches, radar_cache
+from app.services.radar_events import event_stream, radar_events
+from app.services.radar_store import (
+    CONTRACT_FIELDS,
+    RadarQuery,
+    get_latest_radar_date,
+    get_radar_snapshot,
+    iter_history_ndjson,
+    load_filtered_radar,
+    load_filtered_radar_async,
+    load_radar_async,
+    render_radar_payload,
+    render_stored_radar,
+)
 
 router = APIRouter(prefix="/api", tags=["radar"])
 
@@ -35,114 +59,267 @@ class RadarResponse(BaseModel):
     trends: list[TrendResponse]
 
 
-@router.get("/radar", response_model=RadarResponse)
+def _load_radar(db: Session, query_date: Optional[str]) -> bytes:
+    """
+    Load the serialized radar for query_date (latest when None).
+
+    Serves the snapshot rendered by refresh_radar when one exists; otherwise
+    renders from the stored rows.
+    """
+    snapshot = get_radar_snapshot(db, query_date)
+    if snapshot is not None:
+        return snapshot
+
+    if not query_date:
+        query_date = get_latest_radar_date(db)
+        if not query_date:
+            # Return empty response if no data
+            return render_radar_payload(str(date.today()), [])
+
+    return render_stored_radar(db, query_date)
+
+
+def radar_query(
+    focus_area: Optional[list[str]] = Query(None),
+    classification: Optional[str] = Query(None, pattern="^(signal|noise)$"),
+    min_confidence: Optional[int] = Query(None, ge=0, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated trend fields to return"),
+    shape: str = Query("flat", pattern="^(flat|grouped)$"),
+) -> RadarQuery:
+    """Parse the filter, projection and shape parameters of GET /api/radar."""
+    selected = CONTRACT_FIELDS
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise HTTPException(status_code=422, detail="fields must name at least one trend field")
+        unknown = requested.difference(CONTRACT_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown trend fields: {', '.join(sorted(unknown))}"
+            )
+        selected = tuple(name for name in CONTRACT_FIELDS if name in requested)
+
+    return RadarQuery(
+        focus_areas=tuple(sorted(set(focus_area or ()))),
+        classification=classification,
+        min_confidence=min_confidence,
+        fields=selected,
+        grouped=shape == "grouped",
+    )
+
+
+def _cache_key(date_param: Optional[str], query: RadarQuery):
+    if query.is_full:
+        return date_param or None
+    return (date_param or None, query)
+
+
+def _radar_response(request: Request, cached: CachedRadar) -> Response:
+    """Build the radar response, answering If-None-Match with 304."""
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
 def get_radar(
+    request: Request,
     date_param: Optional[str] = None,
+    query: RadarQuery = Depends(radar_query),
     db: Session = Depends(get_db),
 ):
     """
     Get radar analysis for a specific date.
 
-    If no date provided, returns the latest available data.
+    If no date provided, returns the latest available data. focus_area
+    (repeatable), classification and min_confidence filter trends, fields
+    limits the returned trend fields and shape=grouped nests trends by
+    focus area and classification. Responses are served from an in-process
+    cache with a strong ETag; a matching If-None-Match header gets
+    304 Not Modified.
+    """
+
+    def load() -> bytes:
+        if not query.is_full:
+            return load_filtered_radar(db, date_param, query)
+        return _load_radar(db, date_param)
+
+    cached = radar_cache.get_or_load(_cache_key(date_param, query), load)
+    return _radar_response(request, cached)
+
+
+async def get_radar_async(
+    request: Request,
+    date_param: Optional[str] = None,
+    query: RadarQuery = Depends(radar_query),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get radar analysis for a specific date.
+
+    If no date provided, returns the latest available data. Takes the
+    same filter, projection and shape parameters as the sync endpoint.
+    Responses are served from an in-process cache with a strong ETag; a
+    matching If-None-Match header gets 304 Not Modified.
     """
-    if date_param:
-        query_date = date_param
-    else:
-        # Get the most recent radar date
-        latest = db.query(Trend.radar_date).order_by(Trend.radar_date.desc()).first()
-        if not latest:
+
+    async def load() -> bytes:
+        if not query.is_full:
+            return await load_filtered_radar_async(db, date_param, query)
+        body = await load_radar_async(db, date_param)
+        if body is None:
             # Return empty response if no data
-            return RadarResponse(radar_date=str(date.today()), trends=[])
-        query_date = latest[0]
-
-    trends = db.query(Trend).filter(Trend.radar_date == query_date).all()
-
-    return RadarResponse(
-        radar_date=query_date,
-        trends=[
-            TrendResponse(
-                focus_area=t.focus_area,
-                tool_name=t.tool_name,
-                classification=t.classification,
-                confidence_score=t.confidence_score,
-                technical_insight=t.technical_insight,
-                signal_evidence=json.loads(t.signal_evidence) if t.signal_evidence else [],
-                noise_indicators=json.loads(t.noise_indicators) if t.noise_indicators else [],
-                architectural_verdict=t.architectural_verdict,
-                timestamp=t.timestamp,
-            )
-            for t in trends
-        ],
+            return render_radar_payload(str(date.today()), [])
+        return body
+
+    cached = await radar_cache.get_or_load_async(_cache_key(date_param, query), load)
+    return _radar_response(request, cached)
+
+
+# RADAR_DB_MODE selects between the threadpool and the aiosqlite read path
+router.add_api_route(
+    "/radar",
+    get_radar_async if DB_MODE == "async" else get_radar,
+    methods=["GET"],
+    response_model=RadarResponse,
+)
+
+
+@router.get("/radar/history")
+def get_radar_history(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream every stored trend between two radar dates as NDJSON.
+
+    Both bounds are inclusive and optional. Lines are written as rows come
+    off the database cursor, one trend per line with its radar_date.
+    """
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    return StreamingResponse(
+        iter_history_ndjson(
+            session_factory,
+            from_date.isoformat() if from_date else None,
+            to_date.isoformat() if to_date else None,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/radar/events")
+async def radar_event_stream(last_event_id: Optional[str] = Header(None)):
+    """
+    Stream radar updates as Server-Sent Events.
+
+    A "radar" event carrying the new radar date, its ETag and the trends
+    added, changed and removed since the previous radar is pushed when a
+    refresh commits; a "refresh" event reports each finished job. Browsers
+    resume from Last-Event-ID after a reconnect.
+    """
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    return StreamingResponse(
+        event_stream(radar_events, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
-class RefreshResponse(BaseModel):
-    """Response model for refresh operation."""
+class AreaProgress(BaseModel):
+    """Progress of a single focus area within a refresh job."""
 
     status: str
-    radar_date: str
-    trends_count: int
-    message: str
+    trends_count: Optional[int] = None
+    duration_ms: Optional[int] = None
+    first_trend_ms: Optional[int] = None
 
 
-@router.post("/radar/refresh", response_model=RefreshResponse)
-def refresh_radar(db: Session = Depends(get_db)):
-    """
-    Manually trigger a new radar analysis using Grok.
+class RefreshJobResponse(BaseModel):
+    """Response model for a background refresh job."""
 
-    This endpoint calls the Grok API to discover and classify
-    tools across all focus areas, then persists results to SQLite.
+    job_id: str
+    status: str
+    radar_date: Optional[str] = None
+    trends_count: Optional[int] = None
+    message: Optional[str] = None
+    focus_areas: dict[str, AreaProgress]
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    analysis_ms: Optional[int] = None
+    persist_ms: Optional[int] = None
+    reused_count: Optional[int] = None
+    reanalyzed_count: Optional[int] = None
+
+
+@router.post("/radar/refresh", response_model=RefreshJobResponse, status_code=202)
+def refresh_radar(
+    background_tasks: BackgroundTasks,
+    force: bool = False,
+    incremental: Optional[bool] = None,
+    db: Session = Depends(get_write_db),
+):
     """
-    from app.services.grok_service import run_full_analysis
-
-    try:
-        # Run analysis
-        result = run_full_analysis()
-        radar_date = result["radar_date"]
-        trends = result["trends"]
-
-        if not trends:
-            return RefreshResponse(
-                status="warning",
-                radar_date=radar_date,
-                trends_count=0,
-                message="Analysis completed but no trends discovered. Check API key configuration.",
-            )
+    Queue a new radar analysis using Grok.
+
+    Returns a job immediately; a background worker calls the Grok API to
+    discover and classify tools across all focus areas, then persists results
+    to SQLite through the serialized writer engine. If a refresh is already
+    queued or running, in any worker process, that job is returned.
+    force=true bypasses cached LLM completions. incremental=true (default
+    RADAR_INCREMENTAL_REFRESH) sends the latest radar's tools so only new or
+    changed tools are re-analyzed. Poll GET /api/radar/refresh/{job_id} for
+    progress.
+    """
+    from app.services.refresh_jobs import create_job, get_active_job, run_refresh_job
+
+    active = get_active_job(db)
+    if active:
+        return active.to_dict()
+
+    job = create_job(db)
+    if job is None:
+        # Another worker queued a refresh after the check above
+        active = get_active_job(db)
+        if active is None:
+            raise HTTPException(status_code=409, detail="A refresh is already in progress")
+        return active.to_dict()
+    background_tasks.add_task(
+        run_refresh_job, job.id, db.get_bind(), force=force, incremental=incremental
+    )
+    return job.to_dict()
 
-        # Delete existing data for today (replace with fresh analysis)
-        db.query(Trend).filter(Trend.radar_date == radar_date).delete()
-
-        # Insert new trends
-        for trend_data in trends:
-            trend = Trend(
-                radar_date=radar_date,
-                focus_area=trend_data["focus_area"],
-                tool_name=trend_data["tool_name"],
-                classification=trend_data["classification"],
-                confidence_score=trend_data["confidence_score"],
-                technical_insight=trend_data["technical_insight"],
-                signal_evidence=json.dumps(trend_data.get("signal_evidence", [])),
-                noise_indicators=json.dumps(trend_data.get("noise_indicators", [])),
-                architectural_verdict=trend_data["architectural_verdict"],
-                timestamp=trend_data["timestamp"],
-            )
-            db.add(trend)
 
-        db.commit()
+def get_refresh_job(job_id: str, db: Session = Depends(get_db)):
+    """Get status, per focus area progress and timings of a refresh job."""
+    from app.services.refresh_jobs import get_job
 
-        return RefreshResponse(
-            status="success",
-            radar_date=radar_date,
-            trends_count=len(trends),
-            message=f"Successfully analyzed and stored {len(trends)} trends.",
-        )
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Refresh job not found: {job_id}")
+    return job.to_dict()
 
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to refresh radar data: {str(e)}",
-        )
+
+async def get_refresh_job_async(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get status, per focus area progress and timings of a refresh job."""
+    job = await db.get(RefreshJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Refresh job not found: {job_id}")
+    return job.to_dict()
+
+
+router.add_api_route(
+    "/radar/refresh/{job_id}",
+    get_refresh_job_async if DB_MODE == "async" else get_refresh_job,
+    methods=["GET"],
+    response_model=RefreshJobResponse,
+)
 
 
 @router.get("/health")
@@ -151,6 +328,39 @@ def health_check():
     return {"status": "healthy"}
 
 
+@router.get("/metrics/llm")
+def llm_call_metrics(
+    runs: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    LLM call telemetry aggregated per refresh run, most recent first.
+
+    Each run reports call, error and cache hit counts, p50/p95 latency,
+    token totals and estimated cost. Buffered calls are flushed first.
+    """
+    from app.services.llm_telemetry import llm_telemetry, summarize_runs
+
+    llm_telemetry.flush()
+    return {"runs": summarize_runs(db, limit=runs)}
+
+
+@router.get("/metrics/llm-cache")
+def llm_cache_stats():
+    """LLM completion cache hit/miss counters."""
+    from app.services.llm_cache import llm_cache
+
+    return llm_cache.stats()
+
+
+@router.get("/metrics/llm-http")
+def llm_http_stats():
+    """LLM connection pool usage: requests, new connections and connect time."""
+    from app.services.llm_http import llm_http
+
+    return llm_http.stats.snapshot()
+
+
 @router.get("/health/grok")
 def grok_health_check():
     """Check Grok API connection status."""
@@ -0,0 +1,64 @@
+"""API endpoint for full-text search over trends."""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.trend_search import search_trends
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+
+class SearchResult(BaseModel):
+    """A trend matching a search, with its highlighted snippet."""
+
+    radar_date: str
+    focus_area: str
+    tool_name: str
+    classification: str
+    confidence_score: int
+    snippet: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Response model for trend search."""
+
+    query: str
+    results: list[SearchResult]
+
+
+@router.get("/search", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    focus_area: Optional[str] = None,
+    classification: Optional[str] = Query(None, pattern="^(signal|noise)$"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    Search tool names, insights and evidence across all stored radars.
+
+    Results are ranked by bm25 (lower is better) and include an
+    HTML-escaped snippet with matches wrapped in <mark> tags. A trailing *
+    matches prefixes.
+    """
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+
+    results = search_trends(
+        db,
+        q,
+        from_date=from_date.isoformat() if from_date else None,
+        to_date=to_date.isoformat() if to_date else None,
+        focus_area=focus_area,
+        classification=classification,
+        limit=limit,
+    )
+    return {"query": q, "results": results}
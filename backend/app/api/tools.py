@@ -0,0 +1,47 @@
+"""API endpoints for the tool registry."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.tool_registry import get_tool_timeline
+
+router = APIRouter(prefix="/api", tags=["tools"])
+
+
+class TimelineEntry(BaseModel):
+    """How a tool was classified in one radar."""
+
+    radar_date: str
+    focus_area: str
+    tool_name: str
+    classification: str
+    confidence_score: int
+    architectural_verdict: bool
+
+
+class ToolTimelineResponse(BaseModel):
+    """Response model for a tool's classification history."""
+
+    tool_name: str
+    canonical_name: str
+    first_seen: Optional[str] = None
+    last_seen: Optional[str] = None
+    timeline: list[TimelineEntry]
+
+
+@router.get("/tools/{name}/timeline", response_model=ToolTimelineResponse)
+def tool_timeline(name: str, db: Session = Depends(get_db)):
+    """
+    Get every radar classification of a tool, oldest first.
+
+    name is matched on its canonical form, so "LangGraph", "langgraph" and
+    "lang-graph" return the same timeline.
+    """
+    timeline = get_tool_timeline(db, name)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail=f"Tool not found: {name}")
+    return timeline
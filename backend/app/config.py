@@ -0,0 +1,24 @@
+"""Process-wide configuration loading."""
+
+import os
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def load_environment() -> None:
+    """Load backend/.env into os.environ; later calls are no-ops."""
+    load_dotenv()
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean setting; '1', 'true' and 'yes' (any case) are true."""
+    load_environment()
+    return os.getenv(name, "true" if default else "false").lower() in ("1", "true", "yes")
+
+
+load_environment()
+
+# Import LiteLLM while the app starts instead of on the first refresh
+LLM_EAGER_IMPORT = env_flag("LLM_EAGER_IMPORT")
@@ -1,29 +1,162 @@
 """Database connection and session management."""
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
 
+from app.config import load_environment
+from app.migrations import SCHEMA_VERSION, get_schema_version, migrate
 from app.models import Base
 
-load_dotenv()
+load_environment()
 
 DATABASE_URL = os.getenv("RADAR_DATABASE_URL", "sqlite:///./radar.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# SQLite concurrency profile
+SQLITE_JOURNAL_MODE = os.getenv("RADAR_SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("RADAR_SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("RADAR_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE = int(os.getenv("RADAR_SQLITE_CACHE_SIZE", "-20000"))  # negative = KiB
+SQLITE_MMAP_SIZE = int(os.getenv("RADAR_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+READ_POOL_SIZE = int(os.getenv("RADAR_READ_POOL_SIZE", "8"))
+WRITE_POOL_TIMEOUT = float(os.getenv("RADAR_WRITE_POOL_TIMEOUT", "30"))
+
+# Read endpoint mode: 'sync' (threadpool + Session) or 'async' (aiosqlite + AsyncSession)
+DB_MODE = os.getenv("RADAR_DB_MODE", "sync")
+ASYNC_DATABASE_URL = os.getenv(
+    "RADAR_ASYNC_DATABASE_URL",
+    DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1),
+)
+
+
+def _is_file_sqlite(url: str) -> bool:
+    """Check whether url points at an on-disk SQLite database."""
+    return url.startswith("sqlite") and url not in ("sqlite://", "sqlite:///:memory:")
+
+
+def configure_sqlite(target: Engine, read_only: bool = False) -> None:
+    """Apply the SQLite pragmas of the concurrency profile to every new connection."""
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        if not read_only:
+            # journal_mode is stored in the database file, so the writer sets it
+            cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+
+if _is_file_sqlite(DATABASE_URL):
+    # A single pooled connection serializes all writers in this process
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=WRITE_POOL_TIMEOUT,
+    )
+    configure_sqlite(engine)
+
+    read_engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=READ_POOL_SIZE,
+        max_overflow=READ_POOL_SIZE,
+    )
+    configure_sqlite(read_engine, read_only=True)
+else:
+    # In-memory or non-SQLite databases can't be shared across engines
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    )
+    read_engine = engine
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+_async_session_factory = None
+
+
+def get_async_session_factory():
+    """
+    Return the async read session factory, creating the engine on first use.
+
+    Created lazily so aiosqlite is only needed when RADAR_DB_MODE=async.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+        if _is_file_sqlite(DATABASE_URL):
+            # aiosqlite defaults to NullPool; keep connections open like the sync reader
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=READ_POOL_SIZE,
+                max_overflow=READ_POOL_SIZE,
+            )
+            configure_sqlite(async_engine.sync_engine, read_only=True)
+        else:
+            async_engine = create_async_engine(ASYNC_DATABASE_URL)
+        _async_session_factory = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
 
-def init_db():
-    """Initialize the database by creating all tables."""
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections, if it was ever created."""
+    global _async_session_factory
+    if _async_session_factory is not None:
+        factory, _async_session_factory = _async_session_factory, None
+        await factory.kw["bind"].dispose()
+
+
+def init_db() -> bool:
+    """
+    Initialize the database by creating all tables and migrating old files.
+
+    A SQLite file already stamped with the current SCHEMA_VERSION is left
+    alone, so warm restarts skip the table inspection. Returns whether any
+    schema work ran.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            if get_schema_version(conn) == SCHEMA_VERSION:
+                return False
     Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    return True
 
 
 def get_db():
-    """Dependency for getting database sessions."""
+    """Dependency for getting read-only database sessions."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_write_db():
+    """Dependency for getting sessions on the serialized writer engine."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting read-only async database sessions."""
+    async with get_async_session_factory()() as db:
+        yield db
@@ -0,0 +1,64 @@
+"""Deferred imports for heavy optional-at-startup modules."""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Callable
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Attribute reads are forwarded to the real module. Assignments stay on
+    the proxy, which is what mock.patch relies on; code that configures
+    the real module registers an on_load callback instead, which runs
+    immediately if the module is already imported.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__.update(_name=name, _module=None, _callbacks=[], _lock=threading.RLock())
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the real module has been imported, by this proxy or anyone else."""
+        return self._module is not None or self._name in sys.modules
+
+    def load(self) -> ModuleType:
+        """Import the module (once) and run pending on_load callbacks."""
+        if self._module is not None:
+            return self._module
+        with self._lock:
+            if self._module is None:
+                module = importlib.import_module(self._name)
+                callbacks, self._callbacks[:] = list(self._callbacks), []
+                self.__dict__["_module"] = module
+                for callback in callbacks:
+                    callback(module)
+        return self._module
+
+    def on_load(self, callback: Callable[[ModuleType], None]) -> None:
+        """Run callback(module) once the module is imported."""
+        with self._lock:
+            if self.loaded:
+                callback(self.load())
+            else:
+                self._callbacks.append(callback)
+
+    def discard(self, callback: Callable[[ModuleType], None]) -> None:
+        """Forget a callback that has not run yet."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+# About four seconds of imports; only refreshes and health probes need it
+litellm = LazyModule("litellm")
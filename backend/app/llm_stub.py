@@ -0,0 +1,401 @@
+"""
+OpenAI-compatible stub of the LiteLLM proxy for offline refresh runs.
+
+Serves /chat/completions (plain and streamed) with canned trend arrays per
+focus area (an object keyed by area for batched prompts, only the missing
+tools for follow-ups) and injects latency, 429/500 errors, truncated JSON
+and slow streaming, so refresh concurrency, retries and parsing can be
+measured without the proxy or an xAI key. Point LITELLM_BASE_URL at it:
+
+    python -m app.llm_stub --port 4010 --latency-ms 800 --error-rate-429 0.1
+    LITELLM_BASE_URL=http://localhost:4010 uvicorn app.main:app
+
+Faults are drawn from a seeded RNG, so a run with the same seed and request
+order is reproducible. GET/POST /stub/config reads or changes the settings
+at runtime, GET /stub/stats counts outcomes and POST /stub/reset clears them.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+DEFAULT_TRENDS = {
+    "voice_ai_ux": [
+        {
+            "tool_name": "LiveKit Agents",
+            "classification": "signal",
+            "confidence_score": 88,
+            "technical_insight": "WebRTC SFU with streaming STT/TTS plugins; published 180ms p50 voice-to-voice",
+            "signal_evidence": ["Published latency benchmarks", "Production case studies"],
+            "noise_indicators": [],
+            "architectural_verdict": True,
+        },
+        {
+            "tool_name": "EchoVoice",
+            "classification": "noise",
+            "confidence_score": 35,
+            "technical_insight": "Claims human-level latency without numbers or SDK",
+            "signal_evidence": [],
+            "noise_indicators": ["No benchmarks", "Waitlist only"],
+            "architectural_verdict": False,
+        },
+    ],
+    "agent_orchestration": [
+        {
+            "tool_name": "LangGraph",
+            "classification": "signal",
+            "confidence_score": 84,
+            "technical_insight": "Graph-based agent state with checkpointers and human-in-the-loop interrupts",
+            "signal_evidence": ["Checkpoint API documented", "Active GitHub community"],
+            "noise_indicators": [],
+            "architectural_verdict": True,
+        },
+        {
+            "tool_name": "AgentVerse Pro",
+            "classification": "noise",
+            "confidence_score": 30,
+            "technical_insight": "Marketing site promises autonomous agents with no architecture details",
+            "signal_evidence": [],
+            "noise_indicators": ["Marketing language", "Pre-announcement hype"],
+            "architectural_verdict": False,
+        },
+    ],
+    "durable_runtime": [
+        {
+            "tool_name": "Temporal",
+            "classification": "signal",
+            "confidence_score": 90,
+            "technical_insight": "Event-sourced workflow history with deterministic replay and automatic retries",
+            "signal_evidence": ["Production usage at scale", "Published SLAs"],
+            "noise_indicators": [],
+            "architectural_verdict": True,
+        },
+        {
+            "tool_name": "InstantFlow",
+            "classification": "noise",
+            "confidence_score": 25,
+            "technical_insight": "Claims zero cold-start without benchmarks",
+            "signal_evidence": [],
+            "noise_indicators": ["Vague performance claims"],
+            "architectural_verdict": False,
+        },
+    ],
+}
+
+_AREA_PATTERN = re.compile(r"tools related to (\w+)")
+_BATCH_PATTERN = re.compile(r"tools in each of these focus areas: ([\w, ]+)\.")
+_RECEIVED_PATTERN = re.compile(r"^Already received - do NOT repeat these: (.+)$", re.MULTILINE)
+_PREVIOUS_TOOL_PATTERN = re.compile(r"^- (.+?): (?:signal|noise) \(\d+\)$", re.MULTILINE)
+
+
+class StubConfig(BaseModel):
+    """Fault and latency settings; rates are probabilities per request."""
+
+    latency_ms: float = Field(0, ge=0, description="median time before the first byte")
+    latency_dist: Literal["fixed", "uniform", "exponential", "lognormal"] = "fixed"
+    latency_spread: float = Field(
+        0.5, ge=0, description="uniform: +/- fraction of latency_ms; lognormal: sigma"
+    )
+    error_rate_429: float = Field(0, ge=0, le=1)
+    error_rate_500: float = Field(0, ge=0, le=1)
+    retry_after_seconds: Optional[float] = Field(1, ge=0, description="Retry-After on 429s")
+    truncate_rate: float = Field(0, ge=0, le=1, description="cut the JSON array short")
+    unchanged_rate: float = Field(
+        0, ge=0, le=1, description="answer unchanged for tools listed in incremental prompts"
+    )
+    stream_chunk_chars: int = Field(24, ge=1)
+    stream_chunk_delay_ms: float = Field(0, ge=0, description="pause between streamed chunks")
+    seed: Optional[int] = None
+
+
+def config_from_env() -> StubConfig:
+    """Build a StubConfig from LLM_STUB_<FIELD> environment variables."""
+    values = {}
+    for name in StubConfig.model_fields:
+        raw = os.getenv(f"LLM_STUB_{name.upper()}")
+        if raw is not None and raw != "":
+            values[name] = raw
+    return StubConfig(**values)
+
+
+def load_fixtures(path: Optional[str]) -> dict[str, list[dict]]:
+    """Read {focus_area: [trend, ...]} from a JSON file, falling back to DEFAULT_TRENDS."""
+    if not path:
+        return DEFAULT_TRENDS
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def detect_focus_area(prompt: str, areas) -> Optional[str]:
+    """Return the focus area a discovery prompt asks about, if known."""
+    match = _AREA_PATTERN.search(prompt)
+    if match and match.group(1) in areas:
+        return match.group(1)
+    return next((area for area in areas if area in prompt), None)
+
+
+def detect_batch_areas(prompt: str, areas) -> list[str]:
+    """Return the focus areas a batched prompt asks about; empty for per-area prompts."""
+    match = _BATCH_PATTERN.search(prompt)
+    if not match:
+        return []
+    return [area.strip() for area in match.group(1).split(",") if area.strip() in areas]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (4 characters per token) for usage reporting."""
+    return max(1, len(text) // 4)
+
+
+class LLMStub:
+    """Decides the outcome and content of each stubbed completion."""
+
+    def __init__(self, config: StubConfig, fixtures: dict[str, list[dict]]):
+        self.fixtures = fixtures
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self.configure(config)
+
+    def configure(self, config: StubConfig) -> None:
+        with self._lock:
+            self.config = config
+            self._rng = random.Random(config.seed)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self._rng = random.Random(self.config.seed)
+
+    def _roll(self, rate: float) -> bool:
+        return rate > 0 and self._rng.random() < rate
+
+    def latency_seconds(self) -> float:
+        config = self.config
+        base = config.latency_ms / 1000
+        if base == 0 or config.latency_dist == "fixed":
+            return base
+        with self._lock:
+            if config.latency_dist == "uniform":
+                spread = base * config.latency_spread
+                return max(0.0, self._rng.uniform(base - spread, base + spread))
+            if config.latency_dist == "exponential":
+                return self._rng.expovariate(1 / base)
+            # lognormal with median base
+            return self._rng.lognormvariate(math.log(base), config.latency_spread)
+
+    def plan(self, prompt: str) -> tuple[str, str]:
+        """Return (outcome, content) where outcome is ok, truncated, 429 or 500."""
+        with self._lock:
+            config = self.config
+            if self._roll(config.error_rate_429):
+                outcome = "429"
+            elif self._roll(config.error_rate_500):
+                outcome = "500"
+            elif self._roll(config.truncate_rate):
+                outcome = "truncated"
+            else:
+                outcome = "ok"
+            unchanged = {
+                name
+                for name in _PREVIOUS_TOOL_PATTERN.findall(prompt)
+                if self._roll(config.unchanged_rate)
+            }
+            self.stats["requests"] += 1
+            self.stats[outcome] += 1
+
+        batch_areas = detect_batch_areas(prompt, self.fixtures)
+        if batch_areas:
+            # Unchanged tools are matched to the area whose fixtures list them
+            content = json.dumps(
+                {
+                    area: self._entries(area, unchanged, listed_only=True)
+                    for area in batch_areas
+                },
+                indent=2,
+            )
+        else:
+            area = detect_focus_area(prompt, self.fixtures)
+            entries = self._entries(area, unchanged)
+            received = _RECEIVED_PATTERN.search(prompt)
+            if received:
+                # Follow-up after a lossy answer: only the tools not yet received
+                names = set(received.group(1).split(", "))
+                entries = [e for e in entries if e["tool_name"] not in names]
+            content = json.dumps(entries, indent=2)
+        if outcome == "truncated":
+            content = content[: max(1, int(len(content) * 0.6))]
+        return outcome, content
+
+    def _entries(self, area: Optional[str], unchanged: set[str], listed_only: bool = False) -> list:
+        trends = list(self.fixtures.get(area, []))
+        if listed_only:
+            unchanged = unchanged & {t["tool_name"] for t in trends}
+        entries: list = [{"tool_name": name, "unchanged": True} for name in sorted(unchanged)]
+        return entries + [t for t in trends if t["tool_name"] not in unchanged]
+
+
+def _error(status: int, message: str, headers: Optional[dict] = None) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"message": message, "type": "stub_error", "code": status}},
+        status_code=status,
+        headers=headers,
+    )
+
+
+def create_app(
+    config: Optional[StubConfig] = None, fixtures: Optional[dict[str, list[dict]]] = None
+) -> FastAPI:
+    """Build the stub ASGI app; defaults come from the environment."""
+    fixtures = fixtures or load_fixtures(os.getenv("LLM_STUB_FIXTURES"))
+    stub = LLMStub(config or config_from_env(), fixtures)
+    app = FastAPI(title="LLM stub", docs_url=None, redoc_url=None)
+    app.state.stub = stub
+
+    @app.post("/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "stub")
+        prompt = "\n".join(
+            m.get("content") or "" for m in body.get("messages", []) if isinstance(m, dict)
+        )
+        outcome, content = stub.plan(prompt)
+        await asyncio.sleep(stub.latency_seconds())
+
+        if outcome == "429":
+            retry_after = stub.config.retry_after_seconds
+            headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else None
+            return _error(429, "Rate limit exceeded (injected)", headers)
+        if outcome == "500":
+            return _error(500, "Upstream failure (injected)")
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(content),
+            "total_tokens": estimate_tokens(prompt) + estimate_tokens(content),
+        }
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "length" if outcome == "truncated" else "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+
+        return StreamingResponse(
+            _stream(stub.config, completion_id, created, model, content, usage),
+            media_type="text/event-stream",
+        )
+
+    @app.get("/stub/config")
+    def get_config():
+        return stub.config
+
+    @app.post("/stub/config")
+    def set_config(changes: StubConfig):
+        # Validated as a whole config; only the fields the client sent are applied
+        stub.configure(stub.config.model_copy(update=changes.model_dump(exclude_unset=True)))
+        return stub.config
+
+    @app.get("/stub/stats")
+    def get_stats():
+        return dict(stub.stats)
+
+    @app.post("/stub/reset")
+    def reset():
+        stub.reset()
+        return {"status": "reset"}
+
+    @app.get("/health")
+    @app.get("/health/liveliness")
+    def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+async def _stream(
+    config: StubConfig,
+    completion_id: str,
+    created: int,
+    model: str,
+    content: str,
+    usage: dict,
+) -> AsyncIterator[bytes]:
+    """
+    Yield content as chat.completion.chunk events with an optional pause between them.
+
+    Usage is attached to the final chunk as xAI does; without it LiteLLM
+    tries to download a tokenizer to count the streamed tokens itself.
+    """
+
+    def event(choices: list, **extra) -> bytes:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": choices,
+            **extra,
+        }
+        return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+    yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+    size = config.stream_chunk_chars
+    for i in range(0, len(content), size):
+        if config.stream_chunk_delay_ms:
+            await asyncio.sleep(config.stream_chunk_delay_ms / 1000)
+        yield event(
+            [{"index": 0, "delta": {"content": content[i : i + size]}, "finish_reason": None}]
+        )
+    yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}], usage=usage)
+    yield b"data: [DONE]\n\n"
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stub with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4010)
+    parser.add_argument("--fixtures", default=os.getenv("LLM_STUB_FIXTURES"))
+    for name, field in StubConfig.model_fields.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, help=field.description)
+    args = parser.parse_args()
+
+    env_config = config_from_env().model_dump()
+    overrides = {
+        name: getattr(args, name)
+        for name in StubConfig.model_fields
+        if getattr(args, name) is not None
+    }
+    config = StubConfig(**{**env_config, **overrides})
+    uvicorn.run(create_app(config, load_fixtures(args.fixtures)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
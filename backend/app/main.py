@@ -4,20 +4,49 @@ import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
 
-from app.database import init_db
+from app.config import LLM_EAGER_IMPORT, load_environment
+from app.database import SessionLocal, dispose_async_engine, init_db
+from app.metrics import MetricsMiddleware, instrument_engines, render_metrics
+from app.api.evidence import router as evidence_router
 from app.api.radar import router as radar_router
+from app.api.search import router as search_router
+from app.api.tools import router as tools_router
 
-load_dotenv()
+load_environment()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
+    """
+    Initialize database and recover refresh job state on startup.
+
+    Also opens the pooled LLM HTTP clients (optionally pre-warming
+    connections to the LiteLLM proxy) and closes them on shutdown, along
+    with the async database engine if RADAR_DB_MODE=async created it.
+    LiteLLM itself is imported by the first refresh unless
+    LLM_EAGER_IMPORT is set.
+    """
+    from app.lazy_imports import litellm
+    from app.services.grok_service import LITELLM_BASE_URL
+    from app.services.llm_http import llm_http
+    from app.services.llm_telemetry import llm_telemetry
+    from app.services.refresh_jobs import mark_interrupted_jobs
+
     init_db()
+    with SessionLocal() as db:
+        mark_interrupted_jobs(db)
+    llm_telemetry.configure(SessionLocal)
+    if LLM_EAGER_IMPORT:
+        litellm.load()
+    llm_http.open()
+    await llm_http.warm_up(LITELLM_BASE_URL)
     yield
+    await llm_http.close()
+    llm_telemetry.flush()
+    await dispose_async_engine()
 
 
 app = FastAPI(
@@ -35,10 +64,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Latency histograms and Server-Timing; added last so it wraps CORS too
+instrument_engines()
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(radar_router)
+app.include_router(tools_router)
+app.include_router(search_router)
+app.include_router(evidence_router)
 
 
 @app.get("/")
@@ -49,3 +86,9 @@ def root():
         "version": "1.0.0",
         "docs": "/docs",
     }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Per-route latency histograms in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,181 @@
+"""HTTP latency histograms, Prometheus exposition and Server-Timing headers."""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds in seconds; the PRD budget for /api/radar is 200ms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0)
+
+# Phase durations (ms) of the current request; None outside a request
+_request_timings: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def add_timing(phase: str, ms: float) -> None:
+    """Add time spent in a phase to the current request's Server-Timing."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + ms
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Time a block as a Server-Timing phase; a no-op outside requests."""
+    if _request_timings.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(phase, (time.perf_counter() - start) * 1000)
+
+
+def _query_start(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _query_end(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if starts:
+        add_timing("db", (time.perf_counter() - starts.pop()) * 1000)
+
+
+def instrument_engines(target=Engine) -> None:
+    """
+    Count cursor executions as the 'db' phase of the current request.
+
+    Listening on the Engine class covers the writer, reader and async
+    engines (via their sync_engine) alike. Safe to call more than once.
+    """
+    if not event.contains(target, "before_cursor_execute", _query_start):
+        event.listen(target, "before_cursor_execute", _query_start)
+        event.listen(target, "after_cursor_execute", _query_end)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # bucket counts, then sum and count
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def expose(self) -> list[str]:
+        """Render the histogram in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)
+            )
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {series[-1]}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_seconds",
+    "Database time spent per HTTP request by route template.",
+    ("method", "route"),
+)
+
+
+def render_metrics() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    lines = REQUEST_DURATION.expose() + REQUEST_DB_DURATION.expose()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Adds a Server-Timing header with db, serialize and total phases and
+    records per-route latency histograms once the response body is sent.
+    Routes are labelled by their template (/api/tools/{name}/timeline) to
+    keep label cardinality bounded. Event streams are timed but not observed,
+    since their duration is the client's connection time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        state = {"status": 500, "stream": False, "observed": False}
+
+        def observe() -> None:
+            # Background tasks run after the body, so observe when it is sent
+            state["observed"] = True
+            if state["stream"]:
+                return
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched")
+            REQUEST_DURATION.observe(labels + (str(state["status"]),), time.perf_counter() - start)
+            REQUEST_DB_DURATION.observe(labels, timings.get("db", 0.0) / 1000)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                state["stream"] = any(
+                    name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in headers
+                )
+                total = (time.perf_counter() - start) * 1000
+                parts = [f"{phase};dur={ms:.1f}" for phase, ms in sorted(timings.items())]
+                parts.append(f"total;dur={total:.1f}")
+                headers.append((b"server-timing", ", ".join(parts).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            if not state["observed"]:
+                observe()
@@ -0,0 +1,197 @@
+"""Lightweight in-place schema migrations for existing radar.db files."""
+
+import logging
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models import (
+    REFRESH_JOB_SINGLE_ACTIVE_DDL,
+    TREND_EVIDENCE_DDL,
+    TREND_SEARCH_DDL,
+    TREND_SEARCH_REINDEX_SQL,
+    RadarRun,
+    Trend,
+)
+from app.services.radar_store import render_stored_radar
+from app.services.tool_registry import resolve_tool_ids
+
+logger = logging.getLogger(__name__)
+
+# Bump when adding a migration step below or a new table (init_db skips
+# create_all when the file is already at this version); stored in PRAGMA user_version
+SCHEMA_VERSION = 8
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Return the schema version recorded in the SQLite file."""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def _migrate_v1(conn: Connection) -> None:
+    """Add radar_day, the trends indexes, and backfill radar_runs."""
+    columns = {column["name"] for column in inspect(conn).get_columns("trends")}
+    if "radar_day" not in columns:
+        conn.exec_driver_sql("ALTER TABLE trends ADD COLUMN radar_day DATE")
+    conn.exec_driver_sql(
+        "UPDATE trends SET radar_day = radar_date "
+        "WHERE radar_day IS NULL AND date(radar_date) = radar_date"
+    )
+
+    for index in Trend.__table__.indexes:
+        if index.name in ("ix_trends_date_area_class", "ix_trends_radar_day"):
+            index.create(conn, checkfirst=True)
+
+    conn.exec_driver_sql(
+        """
+        INSERT INTO radar_runs (radar_date, radar_day, status, trends_count, completed_at)
+        SELECT radar_date, radar_date, 'complete', COUNT(*), MAX(timestamp)
+        FROM trends
+        WHERE date(radar_date) = radar_date
+          AND radar_date NOT IN (SELECT radar_date FROM radar_runs)
+        GROUP BY radar_date
+        """
+    )
+
+
+def _migrate_v2(conn: Connection) -> None:
+    """Add radar_runs.payload and render snapshots for existing radars."""
+    columns = {column["name"] for column in inspect(conn).get_columns("radar_runs")}
+    if "payload" not in columns:
+        conn.exec_driver_sql("ALTER TABLE radar_runs ADD COLUMN payload BLOB")
+
+    db = Session(bind=conn)
+    for run in db.query(RadarRun).filter(RadarRun.payload.is_(None)).all():
+        run.payload = render_stored_radar(db, run.radar_date)
+    db.flush()
+
+
+def _migrate_v3(conn: Connection) -> None:
+    """Add trends.tool_id with its index and register existing tool names."""
+    columns = {column["name"] for column in inspect(conn).get_columns("trends")}
+    if "tool_id" not in columns:
+        conn.exec_driver_sql("ALTER TABLE trends ADD COLUMN tool_id INTEGER REFERENCES tools (id)")
+    for index in Trend.__table__.indexes:
+        if index.name == "ix_trends_tool_date":
+            index.create(conn, checkfirst=True)
+
+    db = Session(bind=conn)
+    pending = (
+        db.query(Trend.radar_date, Trend.tool_name)
+        .filter(Trend.tool_id.is_(None))
+        .distinct()
+        .order_by(Trend.radar_date)
+        .all()
+    )
+    # Oldest radars first, so each tool keeps its earliest spelling
+    for radar_date, tool_name in pending:
+        [tool_id] = resolve_tool_ids(db, radar_date, [tool_name])
+        db.query(Trend).filter(
+            Trend.radar_date == radar_date,
+            Trend.tool_name == tool_name,
+            Trend.tool_id.is_(None),
+        ).update({Trend.tool_id: tool_id}, synchronize_session=False)
+    db.flush()
+
+
+def _migrate_v4(conn: Connection) -> None:
+    """Create the trends_fts full-text index and its triggers, then index existing rows."""
+    for statement in TREND_SEARCH_DDL:
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql("DELETE FROM trends_fts")
+    conn.exec_driver_sql(TREND_SEARCH_REINDEX_SQL)
+
+
+def _migrate_v5(conn: Connection) -> None:
+    """Install the trend_evidence triggers and split existing evidence arrays."""
+    for statement in TREND_EVIDENCE_DDL:
+        conn.exec_driver_sql(statement)
+    for kind, column in (("signal", "signal_evidence"), ("noise", "noise_indicators")):
+        conn.exec_driver_sql(
+            f"""
+            INSERT INTO trend_evidence (trend_id, kind, position, text)
+            SELECT t.id, '{kind}', CAST(e.key AS INTEGER), e.value
+            FROM trends AS t,
+                 json_each(CASE WHEN json_valid(t.{column}) THEN t.{column} ELSE '[]' END) AS e
+            WHERE e.type = 'text'
+              AND NOT EXISTS (
+                  SELECT 1 FROM trend_evidence AS x WHERE x.trend_id = t.id AND x.kind = '{kind}'
+              )
+            """
+        )
+
+
+def _migrate_v6(conn: Connection) -> None:
+    """Add the incremental refresh counters to refresh_jobs."""
+    columns = {column["name"] for column in inspect(conn).get_columns("refresh_jobs")}
+    for name in ("reused_count", "reanalyzed_count"):
+        if name not in columns:
+            conn.exec_driver_sql(f"ALTER TABLE refresh_jobs ADD COLUMN {name} INTEGER")
+
+
+def _migrate_v7(conn: Connection) -> None:
+    """Add refresh_jobs.owner and allow only one queued or running job."""
+    columns = {column["name"] for column in inspect(conn).get_columns("refresh_jobs")}
+    if "owner" not in columns:
+        conn.exec_driver_sql("ALTER TABLE refresh_jobs ADD COLUMN owner VARCHAR")
+    # The index can't be built over duplicates; keep only the newest active job
+    conn.exec_driver_sql(
+        """
+        UPDATE refresh_jobs
+        SET status = 'interrupted', message = 'Superseded by a newer refresh.',
+            finished_at = strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')
+        WHERE status IN ('queued', 'running')
+          AND id NOT IN (
+              SELECT id FROM refresh_jobs WHERE status IN ('queued', 'running')
+              ORDER BY created_at DESC LIMIT 1
+          )
+        """
+    )
+    conn.exec_driver_sql(REFRESH_JOB_SINGLE_ACTIVE_DDL)
+
+
+def _migrate_v8(conn: Connection) -> None:
+    """Rebuild trends_fts over joined evidence text instead of the raw JSON arrays."""
+    for trigger in ("trends_fts_ai", "trends_fts_ad", "trends_fts_au"):
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.exec_driver_sql("DROP TABLE IF EXISTS trends_fts")
+    for statement in TREND_SEARCH_DDL:
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql(TREND_SEARCH_REINDEX_SQL)
+
+
+MIGRATIONS = {
+    1: _migrate_v1,
+    2: _migrate_v2,
+    3: _migrate_v3,
+    4: _migrate_v4,
+    5: _migrate_v5,
+    6: _migrate_v6,
+    7: _migrate_v7,
+    8: _migrate_v8,
+}
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Bring an existing SQLite database up to SCHEMA_VERSION.
+
+    Expects Base.metadata.create_all to have run so new tables exist.
+    Each step commits in its own transaction together with the user_version
+    it reaches, so a failing step leaves the file at the last completed
+    version; steps are safe to re-run.
+    Returns the resulting schema version.
+    """
+    if engine.dialect.name != "sqlite":
+        return SCHEMA_VERSION
+
+    with engine.connect() as conn:
+        version = get_schema_version(conn)
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        logger.info(f"Migrating radar schema to version {target}")
+        with engine.begin() as conn:
+            MIGRATIONS[target](conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {target}")
+
+    return max(version, SCHEMA_VERSION)
@@ -1,20 +1,62 @@
 """SQLite ORM models for CodeScale Research Radar."""
 
-from sqlalchemy import Column, Integer, String, Boolean, Text
+from datetime import date
+
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
 
+def _radar_day_default(context):
+    """Derive the date-typed radar_day from the inserted radar_date string."""
+    try:
+        return date.fromisoformat(context.get_current_parameters()["radar_date"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class Tool(Base):
+    """Model for the registry of tools, one row per canonical name."""
+
+    __tablename__ = "tools"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    canonical_name = Column(String, nullable=False, unique=True)
+    display_name = Column(String, nullable=False)  # spelling first seen
+    first_seen = Column(String, nullable=False)  # radar_date
+    last_seen = Column(String, nullable=False)  # radar_date
+
+
 class Trend(Base):
     """Model for storing radar trend analyses."""
 
     __tablename__ = "trends"
+    __table_args__ = (
+        Index("ix_trends_date_area_class", "radar_date", "focus_area", "classification"),
+        Index("ix_trends_radar_day", "radar_day"),
+        Index("ix_trends_tool_date", "tool_id", "radar_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     radar_date = Column(String, nullable=False)
+    radar_day = Column(Date, default=_radar_day_default)  # radar_date as a DATE
     focus_area = Column(String, nullable=False)
     tool_name = Column(String, nullable=False)
+    tool_id = Column(Integer, ForeignKey("tools.id"))
     classification = Column(String, nullable=False)  # 'signal' or 'noise'
     confidence_score = Column(Integer, nullable=False)
     technical_insight = Column(Text, nullable=False)
@@ -38,3 +80,217 @@ class Trend(Base):
             "architectural_verdict": self.architectural_verdict,
             "timestamp": self.timestamp,
         }
+
+
+def _evidence_text(column: str) -> str:
+    """SQL joining the strings of JSON array column `column` into plain text."""
+    return (
+        f"(SELECT group_concat(value, '; ') "
+        f"FROM json_each(CASE WHEN json_valid({column}) THEN {column} ELSE '[]' END) "
+        f"WHERE type = 'text')"
+    )
+
+
+def _search_values(row: str) -> str:
+    """SQL values of the trends_fts columns for trigger row `row` (new or old)."""
+    return (
+        f"{row}.id, {row}.tool_name, {row}.technical_insight, "
+        f"{_evidence_text(f'{row}.signal_evidence')}, {_evidence_text(f'{row}.noise_indicators')}"
+    )
+
+
+_TREND_SEARCH_COLUMNS = "rowid, tool_name, technical_insight, signal_evidence, noise_indicators"
+
+# FTS5 index over trends, kept in sync by triggers so the index is updated
+# inside the same transaction as the rows it covers. It keeps its own copy of
+# the text with the evidence arrays joined, so escaped non-ASCII is searchable
+# and snippets carry no JSON syntax.
+TREND_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS trends_fts USING fts5(
+        tool_name, technical_insight, signal_evidence, noise_indicators,
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trends_fts_ai AFTER INSERT ON trends BEGIN
+        INSERT INTO trends_fts ({_TREND_SEARCH_COLUMNS}) VALUES ({_search_values("new")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trends_fts_ad AFTER DELETE ON trends BEGIN
+        DELETE FROM trends_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trends_fts_au
+    AFTER UPDATE OF tool_name, technical_insight, signal_evidence, noise_indicators ON trends BEGIN
+        DELETE FROM trends_fts WHERE rowid = old.id;
+        INSERT INTO trends_fts ({_TREND_SEARCH_COLUMNS}) VALUES ({_search_values("new")});
+    END
+    """,
+)
+
+# Rebuilds trends_fts from the stored trends, e.g. after a migration
+TREND_SEARCH_REINDEX_SQL = f"""
+    INSERT INTO trends_fts ({_TREND_SEARCH_COLUMNS})
+    SELECT {_search_values("trends")} FROM trends
+"""
+
+for _statement in TREND_SEARCH_DDL:
+    event.listen(Trend.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# Triggers go with the table; the virtual table has to be dropped explicitly
+event.listen(
+    Trend.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS trends_fts").execute_if(dialect="sqlite"),
+)
+
+
+class TrendEvidence(Base):
+    """Model for one evidence string of a trend, derived from its JSON arrays."""
+
+    __tablename__ = "trend_evidence"
+    __table_args__ = (
+        Index("ix_trend_evidence_trend", "trend_id"),
+        Index("ix_trend_evidence_kind_text", "kind", "text"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    trend_id = Column(Integer, ForeignKey("trends.id"), nullable=False)
+    kind = Column(String, nullable=False)  # 'signal' or 'noise'
+    position = Column(Integer, nullable=False)  # index within the JSON array
+    text = Column(Text, nullable=False)
+
+
+def _evidence_insert(row: str) -> str:
+    """SQL inserting the evidence arrays of trigger row `row` (new or old)."""
+    return "\n".join(
+        f"""
+        INSERT INTO trend_evidence (trend_id, kind, position, text)
+        SELECT {row}.id, '{kind}', CAST(key AS INTEGER), value
+        FROM json_each(CASE WHEN json_valid({row}.{column}) THEN {row}.{column} ELSE '[]' END)
+        WHERE type = 'text';"""
+        for kind, column in (("signal", "signal_evidence"), ("noise", "noise_indicators"))
+    )
+
+
+# trend_evidence is derived from the JSON TEXT columns by triggers, so it is
+# written in the same transaction as the trends rows and needs no app code
+TREND_EVIDENCE_DDL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trend_evidence_ai AFTER INSERT ON trends BEGIN
+        {_evidence_insert("new")}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trend_evidence_ad AFTER DELETE ON trends BEGIN
+        DELETE FROM trend_evidence WHERE trend_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trend_evidence_au
+    AFTER UPDATE OF signal_evidence, noise_indicators ON trends BEGIN
+        DELETE FROM trend_evidence WHERE trend_id = old.id;
+        {_evidence_insert("new")}
+    END
+    """,
+)
+
+for _statement in TREND_EVIDENCE_DDL:
+    event.listen(
+        TrendEvidence.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+
+
+class RadarRun(Base):
+    """Model recording each completed radar, one row per radar date."""
+
+    __tablename__ = "radar_runs"
+    __table_args__ = (Index("ix_radar_runs_status_day", "status", "radar_day"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    radar_date = Column(String, nullable=False, unique=True)
+    radar_day = Column(Date, nullable=False)
+    status = Column(String, nullable=False)  # 'complete'
+    trends_count = Column(Integer, nullable=False)
+    completed_at = Column(String, nullable=False)  # ISO 8601
+    payload = Column(LargeBinary)  # Golden Contract JSON, rendered at write time
+
+
+class LLMCall(Base):
+    """Model recording one LLM completion attempt or cache hit."""
+
+    __tablename__ = "llm_calls"
+    __table_args__ = (
+        Index("ix_llm_calls_run", "run_id", "started_at"),
+        Index("ix_llm_calls_started", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String)  # refresh job id, NULL outside jobs
+    model = Column(String, nullable=False)
+    focus_area = Column(String)
+    attempt = Column(Integer, nullable=False)  # 1-based retry attempt
+    outcome = Column(String, nullable=False)  # success, error, cancelled (hedge loser), cache_hit
+    streamed = Column(Boolean, nullable=False, default=False)
+    started_at = Column(String, nullable=False)  # ISO 8601
+    latency_ms = Column(Integer, nullable=False)
+    prompt_tokens = Column(Integer)
+    completion_tokens = Column(Integer)
+    cost_usd = Column(Float)
+    error = Column(Text)
+
+
+class RefreshJob(Base):
+    """Model for tracking background radar refresh jobs."""
+
+    __tablename__ = "refresh_jobs"
+
+    id = Column(String, primary_key=True)  # UUID hex
+    status = Column(String, nullable=False)  # queued, running, success, warning, failed, interrupted
+    radar_date = Column(String)
+    trends_count = Column(Integer)
+    message = Column(Text)
+    area_progress = Column(Text)  # JSON object as TEXT, keyed by focus area
+    created_at = Column(String, nullable=False)  # ISO 8601
+    started_at = Column(String)  # ISO 8601
+    finished_at = Column(String)  # ISO 8601
+    analysis_ms = Column(Integer)
+    persist_ms = Column(Integer)
+    reused_count = Column(Integer)  # trends carried forward by an incremental refresh
+    reanalyzed_count = Column(Integer)
+    owner = Column(String)  # host:pid:boot of the worker process running the job
+
+    def to_dict(self):
+        """Convert model to dictionary for JSON serialization."""
+        import json
+
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "radar_date": self.radar_date,
+            "trends_count": self.trends_count,
+            "message": self.message,
+            "focus_areas": json.loads(self.area_progress) if self.area_progress else {},
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "analysis_ms": self.analysis_ms,
+            "persist_ms": self.persist_ms,
+            "reused_count": self.reused_count,
+            "reanalyzed_count": self.reanalyzed_count,
+        }
+
+
+# At most one queued or running refresh, even across worker processes
+REFRESH_JOB_SINGLE_ACTIVE_DDL = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_jobs_single_active "
+    "ON refresh_jobs ((1)) WHERE status IN ('queued', 'running')"
+)
+
+event.listen(
+    RefreshJob.__table__,
+    "after_create",
+    DDL(REFRESH_JOB_SINGLE_ACTIVE_DDL).execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,92 @@
+"""SQL queries over per-trend evidence rows."""
+
+from typing import Optional
+
+from sqlalchemy import Integer, column, func, select, text
+from sqlalchemy.orm import Session
+
+from app.models import Trend, TrendEvidence
+
+# trends_fts columns holding each kind of evidence as joined text
+_FTS_COLUMNS = {"signal": "signal_evidence", "noise": "noise_indicators"}
+
+
+def _filtered(statement, kind, classification, from_date, to_date):
+    if kind:
+        statement = statement.where(TrendEvidence.kind == kind)
+    if classification:
+        statement = statement.where(Trend.classification == classification)
+    if from_date:
+        statement = statement.where(Trend.radar_date >= from_date)
+    if to_date:
+        statement = statement.where(Trend.radar_date <= to_date)
+    return statement
+
+
+def _evidence_match(contains: str, kind: Optional[str]) -> str:
+    """FTS5 expression for evidence with a word starting with contains, in kind's column."""
+    columns = [_FTS_COLUMNS[kind]] if kind else list(_FTS_COLUMNS.values())
+    return "{" + " ".join(columns) + '} : "' + contains.replace('"', '""') + '"*'
+
+
+def find_trends_by_evidence(
+    db: Session,
+    contains: str,
+    kind: Optional[str] = None,
+    classification: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    limit: int = 100,
+) -> list[dict]:
+    """
+    Return trends citing evidence that contains the given text (case-insensitive).
+
+    Candidate trends come from the trends_fts index, so the text has to start
+    at a word boundary; the evidence strings of those trends are then checked
+    for the exact text. One result per matching evidence string, newest radar
+    first.
+    """
+    candidates = text("SELECT rowid FROM trends_fts WHERE trends_fts MATCH :match")
+    candidates = candidates.bindparams(match=_evidence_match(contains, kind))
+    statement = (
+        select(
+            Trend.radar_date,
+            Trend.focus_area,
+            Trend.tool_name,
+            Trend.classification,
+            TrendEvidence.kind,
+            TrendEvidence.text.label("evidence"),
+        )
+        .join(Trend, Trend.id == TrendEvidence.trend_id)
+        .where(TrendEvidence.trend_id.in_(candidates.columns(column("rowid", Integer))))
+        .where(func.instr(func.lower(TrendEvidence.text), contains.lower()) > 0)
+    )
+    if kind:
+        # Unary + stops SQLite driving the query by the two-valued kind index
+        statement = statement.where(text("+trend_evidence.kind = :kind").bindparams(kind=kind))
+    statement = _filtered(statement, None, classification, from_date, to_date)
+    statement = statement.order_by(Trend.radar_date.desc(), Trend.id, TrendEvidence.position)
+    return [row._asdict() for row in db.execute(statement.limit(limit))]
+
+
+def top_evidence(
+    db: Session,
+    kind: Optional[str] = None,
+    classification: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    limit: int = 20,
+) -> list[dict]:
+    """Return the most frequently cited evidence strings with their citation counts."""
+    citations = func.count(TrendEvidence.id).label("citations")
+    statement = select(
+        TrendEvidence.text.label("evidence"),
+        TrendEvidence.kind,
+        citations,
+        func.count(func.distinct(Trend.tool_id)).label("tools"),
+    ).join(Trend, Trend.id == TrendEvidence.trend_id)
+    statement = _filtered(statement, kind, classification, from_date, to_date)
+    statement = statement.group_by(TrendEvidence.kind, TrendEvidence.text).order_by(
+        citations.desc(), TrendEvidence.text
+    )
+    return [row._asdict() for row in db.execute(statement.limit(limit))]
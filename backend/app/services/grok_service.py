@@ -1,16 +1,27 @@
 """Grok/LiteLLM service for AI-powered radar analysis."""
 
-import json
+import asyncio
 import logging
 import os
 import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
-import litellm
-from dotenv import load_dotenv
+from app.config import env_flag, load_environment
+from app.lazy_imports import litellm
+from app.services.json_salvage import SalvagedArray, salvage_json_array, salvage_keyed_arrays
+from app.services.json_stream import JsonArrayStreamParser
+from app.services.llm_cache import llm_cache
+from app.services.llm_telemetry import llm_telemetry
+from app.services.retry_policy import (
+    LLM_HEDGE_AFTER_MS,
+    hedged,
+    llm_circuit_breaker,
+    retry_policy,
+)
+from app.services.tool_registry import canonical_tool_name
 
-load_dotenv()
+load_environment()
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,10 +30,23 @@ logger = logging.getLogger(__name__)
 LITELLM_BASE_URL = os.getenv("LITELLM_BASE_URL", "http://localhost:4010")
 LITELLM_API_KEY = os.getenv("LITELLM_API_KEY", "sk-radar-local-dev")
 GROK_MODEL = os.getenv("GROK_MODEL", "grok-3")
+GROK_TEMPERATURE = 0.7
 
-# Retry configuration
-MAX_RETRIES = 3
-INITIAL_BACKOFF = 1.0  # seconds
+# Concurrency configuration (max focus areas analyzed at once)
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "3"))
+
+# Stream completions and validate each trend as soon as it closes
+LLM_STREAMING = env_flag("LLM_STREAMING")
+
+# Ask for every focus area in one structured-output request instead of one per area
+LLM_BATCHED_ANALYSIS = env_flag("LLM_BATCHED_ANALYSIS")
+
+# Ask once for tools lost to a truncated or malformed response instead of re-running the area
+LLM_SALVAGE_FOLLOW_UP = env_flag("LLM_SALVAGE_FOLLOW_UP", default=True)
+
+# Tools requested per focus area (the "2-4 tools" of the prompts)
+MIN_TOOLS_PER_AREA = 2
+MAX_TOOLS_PER_AREA = 4
 
 FOCUS_AREAS = {
     "voice_ai_ux": {
@@ -54,16 +78,8 @@ FOCUS_AREAS = {
     },
 }
 
-DISCOVERY_PROMPT_TEMPLATE = """Using your real-time knowledge of X/Twitter discussions and tech news from the past 7 days,
-SEARCH for and ANALYZE tools related to {focus_area}.
-
-STEP 1 - DISCOVER:
-Search your knowledge for tools being discussed in the {focus_area_name} space.
-Look for announcements, releases, technical discussions, and trending topics.
-
-STEP 2 - CLASSIFY each discovered tool as SIGNAL or NOISE:
-
-SIGNAL criteria (worth evaluating):
+# Shared by the per-area and batched prompts; literal braces are doubled for str.format
+CLASSIFICATION_CRITERIA = """SIGNAL criteria (worth evaluating):
 - Has published benchmarks or performance data
 - Shows production usage or real case studies
 - Provides specific technical architecture details
@@ -73,14 +89,9 @@ NOISE criteria (skip):
 - Uses marketing language without substance
 - No benchmarks or only vague claims
 - Pre-announcement hype or vaporware
-- Engagement farming without technical depth
-
-For {focus_area_name}, specifically evaluate:
-{evaluation_criteria}
+- Engagement farming without technical depth"""
 
-Return a JSON array with 2-4 tools (mix of signal and noise). Format:
-[
-  {{
+TREND_FORMAT = """  {{
     "tool_name": "string",
     "classification": "signal" or "noise",
     "confidence_score": 1-100,
@@ -88,10 +99,106 @@ Return a JSON array with 2-4 tools (mix of signal and noise). Format:
     "signal_evidence": ["evidence1", "evidence2"],
     "noise_indicators": ["indicator1", "indicator2"],
     "architectural_verdict": true or false
-  }}
+  }}"""
+
+DISCOVERY_PROMPT_TEMPLATE = (
+    """Using your real-time knowledge of X/Twitter discussions and tech news from the past 7 days,
+SEARCH for and ANALYZE tools related to {focus_area}.
+
+STEP 1 - DISCOVER:
+Search your knowledge for tools being discussed in the {focus_area_name} space.
+Look for announcements, releases, technical discussions, and trending topics.
+
+STEP 2 - CLASSIFY each discovered tool as SIGNAL or NOISE:
+
+"""
+    + CLASSIFICATION_CRITERIA
+    + """
+
+For {focus_area_name}, specifically evaluate:
+{evaluation_criteria}
+
+Return a JSON array with 2-4 tools (mix of signal and noise). Format:
+[
+"""
+    + TREND_FORMAT
+    + """
+]
+
+IMPORTANT: Return ONLY the JSON array, no other text."""
+)
+
+BATCH_PROMPT_TEMPLATE = (
+    """Using your real-time knowledge of X/Twitter discussions and tech news from the past 7 days,
+SEARCH for and ANALYZE tools in each of these focus areas: {focus_area_list}.
+
+STEP 1 - DISCOVER:
+For each focus area below, search your knowledge for tools being discussed in that space.
+Look for announcements, releases, technical discussions, and trending topics.
+
+STEP 2 - CLASSIFY each discovered tool as SIGNAL or NOISE:
+
+"""
+    + CLASSIFICATION_CRITERIA
+    + """
+
+FOCUS AREAS:
+{area_sections}
+
+Return a JSON object with one key per focus area ({focus_area_list}). Each value is an array
+of 2-4 tools for that area (mix of signal and noise). Format:
+{{
+  "<focus_area>": [
+"""
+    + TREND_FORMAT
+    + """
+  ]
+}}
+
+IMPORTANT: Return ONLY the JSON object, no other text."""
+)
+
+FOLLOW_UP_PROMPT_TEMPLATE = (
+    """An earlier answer about tools related to {focus_area} ({focus_area_name}), from X/Twitter
+discussions and tech news of the past 7 days, was cut off or malformed.
+
+Already received - do NOT repeat these: {received_tools}
+{lost_hint}
+Return a JSON array with ONLY the {missing_count} missing tool(s), classified as SIGNAL or NOISE:
+
+"""
+    + CLASSIFICATION_CRITERIA
+    + """
+
+For {focus_area_name}, specifically evaluate:
+{evaluation_criteria}
+
+Format:
+[
+"""
+    + TREND_FORMAT
+    + """
 ]
 
 IMPORTANT: Return ONLY the JSON array, no other text."""
+)
+
+BATCH_AREA_TEMPLATE = """
+### {focus_area} ({focus_area_name})
+Specifically evaluate:
+{evaluation_criteria}"""
+
+INCREMENTAL_PROMPT_TEMPLATE = """
+
+INCREMENTAL UPDATE - tools on the previous radar for {focus_area_name}:
+{previous_tools}
+
+For each previous tool whose classification, confidence and evidence have NOT materially changed,
+include only this short entry in the array instead of the full format:
+  {{"tool_name": "<name exactly as listed>", "unchanged": true}}
+Use the full format only for newly discovered tools and for previous tools with material changes
+(new benchmarks, releases, production evidence, or a different classification).
+Leave out previous tools that are no longer relevant. The 2-4 tool limit applies to full entries only."""
 
 
 def validate_trend(trend: dict) -> bool:
@@ -107,6 +214,10 @@ def validate_trend(trend: dict) -> bool:
         if field not in trend:
             return False
 
+    # A name made only of separators has no registry key
+    if not isinstance(trend["tool_name"], str) or not canonical_tool_name(trend["tool_name"]):
+        return False
+
     # Validate classification value
     if trend["classification"] not in ("signal", "noise"):
         return False
@@ -118,125 +229,820 @@ def validate_trend(trend: dict) -> bool:
     return True
 
 
-def call_grok_with_retry(prompt: str) -> Optional[str]:
+def _elapsed_ms(start: float) -> int:
+    return int((time.perf_counter() - start) * 1000)
+
+
+def has_trend_array(content: str) -> bool:
+    """Whether a response holds a JSON array, i.e. is worth caching."""
+    return salvage_json_array(content).found
+
+
+def call_grok_with_retry(
+    prompt: str,
+    use_cache: bool = True,
+    focus_area: Optional[str] = None,
+    cacheable: Optional[Callable[[str], bool]] = None,
+) -> Optional[str]:
+    """
+    Blocking wrapper around call_grok_with_retry_async for scripts.
+
+    Runs its own event loop, so it must not be called from a coroutine.
+    """
+    return asyncio.run(
+        call_grok_with_retry_async(prompt, use_cache, focus_area, cacheable=cacheable)
+    )
+
+
+def build_discovery_prompt(focus_area: str, previous: Optional[list[dict]] = None) -> str:
+    """
+    Build the discovery prompt for a focus area.
+
+    With previous trends for the area the prompt lists them and asks for a
+    short {"tool_name", "unchanged": true} entry for each tool that has not
+    materially changed, so only new or changed tools are fully analyzed.
+    Raises ValueError for unknown focus areas.
+    """
+    if focus_area not in FOCUS_AREAS:
+        raise ValueError(f"Unknown focus area: {focus_area}")
+
+    area_config = FOCUS_AREAS[focus_area]
+    prompt = DISCOVERY_PROMPT_TEMPLATE.format(
+        focus_area=focus_area,
+        focus_area_name=area_config["name"],
+        evaluation_criteria=area_config["evaluation_criteria"],
+    )
+    return prompt + _incremental_section(focus_area, previous)
+
+
+def _incremental_section(focus_area: str, previous: Optional[list[dict]]) -> str:
+    """Render the previous-tools section of an incremental prompt, or nothing."""
+    if not previous:
+        return ""
+    previous_tools = "\n".join(
+        f"- {t['tool_name']}: {t['classification']} ({t['confidence_score']})" for t in previous
+    )
+    return INCREMENTAL_PROMPT_TEMPLATE.format(
+        focus_area_name=FOCUS_AREAS[focus_area]["name"], previous_tools=previous_tools
+    )
+
+
+def build_batch_prompt(
+    focus_areas: list[str], previous_by_area: Optional[dict[str, list[dict]]] = None
+) -> str:
+    """
+    Build one prompt asking for every focus area at once.
+
+    The discovery steps and signal/noise criteria appear once, followed by
+    a section per area with its evaluation criteria (and previous tools,
+    as in build_discovery_prompt). The answer is a JSON object keyed by
+    focus area. Raises ValueError for unknown focus areas.
+    """
+    unknown = [area for area in focus_areas if area not in FOCUS_AREAS]
+    if unknown:
+        raise ValueError(f"Unknown focus area: {unknown[0]}")
+
+    previous_by_area = previous_by_area or {}
+    sections = "\n".join(
+        BATCH_AREA_TEMPLATE.format(
+            focus_area=area,
+            focus_area_name=FOCUS_AREAS[area]["name"],
+            evaluation_criteria=FOCUS_AREAS[area]["evaluation_criteria"],
+        )
+        + _incremental_section(area, previous_by_area.get(area))
+        for area in focus_areas
+    )
+    return BATCH_PROMPT_TEMPLATE.format(
+        focus_area_list=", ".join(focus_areas), area_sections=sections
+    )
+
+
+TREND_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tool_name": {"type": "string"},
+        "classification": {"type": "string", "enum": ["signal", "noise"]},
+        "confidence_score": {"type": "integer"},
+        "technical_insight": {"type": "string"},
+        "signal_evidence": {"type": "array", "items": {"type": "string"}},
+        "noise_indicators": {"type": "array", "items": {"type": "string"}},
+        "architectural_verdict": {"type": "boolean"},
+    },
+    "required": [
+        "tool_name",
+        "classification",
+        "confidence_score",
+        "technical_insight",
+        "signal_evidence",
+        "noise_indicators",
+        "architectural_verdict",
+    ],
+    "additionalProperties": False,
+}
+
+UNCHANGED_TREND_SCHEMA = {
+    "type": "object",
+    "properties": {"tool_name": {"type": "string"}, "unchanged": {"type": "boolean"}},
+    "required": ["tool_name", "unchanged"],
+    "additionalProperties": False,
+}
+
+
+def batch_response_format(focus_areas: list[str], incremental: bool = False) -> dict:
+    """
+    Build the response_format JSON schema for a batched prompt.
+
+    The object has one required array per focus area; incremental prompts
+    also allow the short unchanged entries.
+    """
+    items = {"anyOf": [TREND_SCHEMA, UNCHANGED_TREND_SCHEMA]} if incremental else TREND_SCHEMA
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "radar_trends",
+            "schema": {
+                "type": "object",
+                "properties": {area: {"type": "array", "items": items} for area in focus_areas},
+                "required": list(focus_areas),
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def _index_previous(previous: Optional[list[dict]]) -> dict[str, dict]:
+    """Map canonical tool names to previous trends for carrying them forward."""
+    return {canonical_tool_name(t["tool_name"]): t for t in previous or []}
+
+
+def prepare_trend(
+    focus_area: str, trend, previous: Optional[dict[str, dict]] = None
+) -> Optional[dict]:
+    """
+    Validate one raw trend and annotate it with focus area and timestamp.
+
+    An {"tool_name", "unchanged": true} entry is replaced by the matching
+    trend from previous (keyed by canonical name) and marked
+    carried_forward. Returns the trend dictionary or None if it fails
+    validation.
+    """
+    if isinstance(trend, dict) and trend.get("unchanged") and previous:
+        prior = previous.get(canonical_tool_name(str(trend.get("tool_name", ""))))
+        if prior is None:
+            logger.warning(f"Unchanged entry for unknown tool skipped: {trend.get('tool_name')}")
+            return None
+        return {
+            **prior,
+            "focus_area": focus_area,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "carried_forward": True,
+        }
+
+    if not isinstance(trend, dict) or not validate_trend(trend):
+        name = trend.get("tool_name", "unknown") if isinstance(trend, dict) else "unknown"
+        logger.warning(f"Invalid trend skipped: {name}")
+        return None
+
+    trend["focus_area"] = focus_area
+    trend["timestamp"] = datetime.now(timezone.utc).isoformat()
+    # Ensure arrays exist
+    trend.setdefault("signal_evidence", [])
+    trend.setdefault("noise_indicators", [])
+    return trend
+
+
+def parse_trends(
+    focus_area: str, content: str, previous: Optional[list[dict]] = None
+) -> Optional[list[dict]]:
+    """
+    Extract and validate the JSON trend array from a Grok response.
+
+    previous holds the area's trends from the last radar for resolving
+    unchanged entries of an incremental response. Malformed or truncated
+    arrays keep every complete element (see extract_trends).
+    Returns list of trend dictionaries or None if no array can be parsed.
+    """
+    return extract_trends(focus_area, content, previous)[0]
+
+
+def extract_trends(
+    focus_area: str, content: str, previous: Optional[list[dict]] = None
+) -> tuple[Optional[list[dict]], SalvagedArray]:
     """
-    Call Grok API with exponential backoff retry logic.
+    Salvage and validate the trend array of a response.
 
+    Returns (trends, salvage) where trends is None if no array was found
+    and salvage reports the repairs made and the elements dropped.
+    """
+    salvage = salvage_json_array(content)
+    if not salvage.found:
+        logger.warning(f"No JSON array found in response for {focus_area}")
+        return None, salvage
+    if salvage.repairs:
+        logger.info(f"Repaired response for {focus_area}: {', '.join(salvage.repairs)}")
+    if salvage.dropped:
+        logger.warning(
+            f"Dropped {len(salvage.dropped)} element(s) from response for {focus_area}: "
+            f"{'; '.join(salvage.dropped)}"
+        )
+    return _prepare_trends(focus_area, salvage.elements, previous), salvage
+
+
+def missing_tool_count(trends: list[dict], salvage: SalvagedArray) -> int:
+    """
+    Number of tools worth a follow-up request after a lossy response.
+
+    Only elements the response lost count; a short but well-formed answer
+    does not trigger a follow-up. Capped so the area stays within 2-4 tools.
+    """
+    if not LLM_SALVAGE_FOLLOW_UP or not salvage.dropped:
+        return 0
+    wanted = max(len(salvage.dropped), MIN_TOOLS_PER_AREA - len(trends))
+    return max(0, min(wanted, MAX_TOOLS_PER_AREA - len(trends)))
+
+
+def build_follow_up_prompt(
+    focus_area: str, received: list[dict], salvage: SalvagedArray, missing_count: int
+) -> str:
+    """Build the prompt asking only for the tools a lossy response dropped."""
+    area_config = FOCUS_AREAS[focus_area]
+    received_tools = ", ".join(t["tool_name"] for t in received) or "none"
+    lost_hint = ""
+    if salvage.dropped_names:
+        lost_hint = f"The lost entries were for: {', '.join(salvage.dropped_names)}\n"
+    return FOLLOW_UP_PROMPT_TEMPLATE.format(
+        focus_area=focus_area,
+        focus_area_name=area_config["name"],
+        evaluation_criteria=area_config["evaluation_criteria"],
+        received_tools=received_tools,
+        lost_hint=lost_hint,
+        missing_count=missing_count,
+    )
+
+
+def merge_follow_up(
+    focus_area: str,
+    trends: list[dict],
+    content: Optional[str],
+    previous: Optional[list[dict]] = None,
+) -> list[dict]:
+    """Return the follow-up's trends that are not already in trends (by canonical name)."""
+    if not content:
+        logger.warning(f"Follow-up for {focus_area} failed; keeping {len(trends)} salvaged trends")
+        return []
+    extra, _ = extract_trends(focus_area, content, previous)
+    seen = {canonical_tool_name(t["tool_name"]) for t in trends}
+    added = []
+    for trend in extra or []:
+        name = canonical_tool_name(trend["tool_name"])
+        if name not in seen:
+            seen.add(name)
+            added.append(trend)
+    logger.info(f"Follow-up for {focus_area} recovered {len(added)} trends")
+    return added
+
+
+def _prepare_trends(focus_area: str, trends: list, previous: Optional[list[dict]]) -> list[dict]:
+    """Validate and annotate the raw trends of one area, dropping invalid ones."""
+    previous_by_name = _index_previous(previous)
+    valid_trends = []
+    for trend in trends:
+        trend = prepare_trend(focus_area, trend, previous_by_name)
+        if trend is not None:
+            valid_trends.append(trend)
+
+    logger.info(f"Found {len(valid_trends)} valid trends for {focus_area}")
+    return valid_trends
+
+
+def split_batch_response(
+    content: str,
+    focus_areas: list[str],
+    previous_by_area: Optional[dict[str, list[dict]]] = None,
+) -> dict[str, Optional[list[dict]]]:
+    """
+    Split a batched response into per-area trend lists.
+
+    The object is repaired as salvage_json_array would, and when it is
+    malformed or truncated each area keeps the elements that closed. Each
+    area's array is validated as parse_trends would. An area whose array
+    is missing, or cut off before any element closed, maps to None so
+    callers can fall back to per-area prompts.
+    """
+    previous_by_area = previous_by_area or {}
+    arrays = salvage_keyed_arrays(content, focus_areas)
+    if not arrays:
+        logger.warning("No trend arrays found in batched response")
+
+    results: dict[str, Optional[list[dict]]] = {}
+    for area in focus_areas:
+        salvage = arrays.get(area)
+        if salvage is None or not (salvage.complete or salvage.elements):
+            logger.warning(f"Batched response has no trend array for {area}")
+            results[area] = None
+            continue
+        if salvage.dropped:
+            logger.warning(
+                f"Dropped {len(salvage.dropped)} element(s) from batched response for {area}: "
+                f"{'; '.join(salvage.dropped)}"
+            )
+        results[area] = _prepare_trends(area, salvage.elements, previous_by_area.get(area))
+    return results
+
+
+def analyze_focus_area(
+    focus_area: str, use_cache: bool = True, previous: Optional[list[dict]] = None
+) -> Optional[list[dict]]:
+    """
+    Blocking wrapper around analyze_focus_area_async for scripts.
+
+    Runs its own event loop, so it must not be called from a coroutine.
+    Returns list of trend dictionaries or None if analysis fails.
+    """
+    return asyncio.run(analyze_focus_area_async(focus_area, use_cache, previous))
+
+
+async def call_grok_with_retry_async(
+    prompt: str,
+    use_cache: bool = True,
+    focus_area: Optional[str] = None,
+    response_format: Optional[dict] = None,
+    cacheable: Optional[Callable[[str], bool]] = None,
+) -> Optional[str]:
+    """
+    Call Grok API via litellm.acompletion, retrying per the shared retry policy.
+
+    Transient errors are retried with jittered backoff, honoring
+    Retry-After on 429s; fatal errors are not retried and no call is made
+    while the circuit breaker is open. Backoff sleeps yield to the event
+    loop so other focus areas keep running. With LLM_HEDGE_AFTER_MS set, a
+    slow attempt is hedged with a duplicate request and the first answer
+    wins. Completions are served from and written to the on-disk LLM
+    cache; use_cache=False skips the lookup but still stores the fresh
+    response. With cacheable given, only responses it accepts are stored,
+    so a refusal is not replayed for the whole cache TTL. response_format
+    is passed through for structured output.
+    Every request, including a hedge and a cancelled loser, and every
+    cache hit is recorded in LLM call telemetry.
     Returns response content string or None if all retries fail.
     """
-    backoff = INITIAL_BACKOFF
+    model = f"openai/{GROK_MODEL}"
+    if use_cache:
+        cached = await llm_cache.get_async(model, prompt, GROK_TEMPERATURE)
+        if cached is not None:
+            llm_telemetry.record(model, "cache_hit", 0, focus_area=focus_area, attempt=0)
+            return cached
+
+    extra = {"response_format": response_format} if response_format else {}
 
-    for attempt in range(MAX_RETRIES):
+    async def request(attempt: int) -> str:
+        start = time.perf_counter()
         try:
             # Use openai/ prefix to route through LiteLLM proxy
-            response = litellm.completion(
-                model=f"openai/{GROK_MODEL}",
+            response = await litellm.acompletion(
+                model=model,
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
+                temperature=GROK_TEMPERATURE,
                 api_base=LITELLM_BASE_URL,
                 api_key=LITELLM_API_KEY,
+                max_retries=0,
+                **extra,
+            )
+            content = response.choices[0].message.content.strip()
+        except asyncio.CancelledError:
+            llm_telemetry.record(model, "cancelled", _elapsed_ms(start), focus_area, attempt)
+            raise
+        except Exception as e:
+            llm_telemetry.record(
+                model, "error", _elapsed_ms(start), focus_area, attempt, error=str(e)
             )
-            return response.choices[0].message.content.strip()
+            raise
+        llm_telemetry.record(model, "success", _elapsed_ms(start), focus_area, attempt, response)
+        return content
+
+    for attempt in range(1, retry_policy.max_attempts + 1):
+        if not llm_circuit_breaker.allow():
+            logger.warning(f"LLM circuit open; not calling Grok for {focus_area or 'prompt'}")
+            return None
+        try:
+            if LLM_HEDGE_AFTER_MS > 0 and llm_circuit_breaker.state == "closed":
+                content = await hedged(lambda: request(attempt), LLM_HEDGE_AFTER_MS / 1000)
+            else:
+                content = await request(attempt)
+            llm_circuit_breaker.record_success()
+            if cacheable is None or cacheable(content):
+                await llm_cache.put_async(model, prompt, GROK_TEMPERATURE, content)
+            return content
 
         except Exception as e:
+            llm_circuit_breaker.record_failure(e)
+            decision = retry_policy.decide(e, attempt)
             logger.warning(
-                f"Grok API call failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}"
+                f"Grok API call failed (attempt {attempt}/{retry_policy.max_attempts}): {e}"
             )
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(backoff)
-                backoff *= 2  # Exponential backoff
+            if not decision.retry:
+                logger.error(f"Giving up on Grok API call: {decision.reason}")
+                return None
+            await asyncio.sleep(decision.delay)
+        except BaseException:
+            # Cancelled, e.g. by a client disconnect: free the half-open probe
+            llm_circuit_breaker.release_probe()
+            raise
 
-    logger.error(f"All {MAX_RETRIES} Grok API attempts failed")
     return None
 
 
-def analyze_focus_area(focus_area: str) -> Optional[list[dict]]:
+async def analyze_focus_area_async(
+    focus_area: str, use_cache: bool = True, previous: Optional[list[dict]] = None
+) -> Optional[list[dict]]:
     """
-    Analyze a single focus area using Grok via LiteLLM.
+    Analyze a single focus area without blocking the event loop.
 
+    Lossy responses are salvaged and followed up as in analyze_focus_area.
     Returns list of trend dictionaries or None if analysis fails.
     """
-    if focus_area not in FOCUS_AREAS:
-        raise ValueError(f"Unknown focus area: {focus_area}")
-
-    area_config = FOCUS_AREAS[focus_area]
-    prompt = DISCOVERY_PROMPT_TEMPLATE.format(
-        focus_area=focus_area,
-        focus_area_name=area_config["name"],
-        evaluation_criteria=area_config["evaluation_criteria"],
-    )
+    prompt = build_discovery_prompt(focus_area, previous)
 
     logger.info(f"Analyzing focus area: {focus_area}")
 
-    # Call Grok API with retry logic
-    content = call_grok_with_retry(prompt)
+    content = await call_grok_with_retry_async(
+        prompt, use_cache=use_cache, focus_area=focus_area, cacheable=has_trend_array
+    )
     if not content:
         logger.error(f"Failed to get response for {focus_area}")
         return None
 
-    try:
-        # Try to extract JSON from response
-        if content.startswith("["):
-            trends = json.loads(content)
-        else:
-            # Try to find JSON array in response
-            start = content.find("[")
-            end = content.rfind("]") + 1
-            if start != -1 and end > start:
-                trends = json.loads(content[start:end])
-            else:
-                logger.warning(f"No JSON array found in response for {focus_area}")
-                return None
+    trends, salvage = extract_trends(focus_area, content, previous)
+    missing = missing_tool_count(trends or [], salvage)
+    if missing:
+        follow_up = await call_grok_with_retry_async(
+            build_follow_up_prompt(focus_area, trends, salvage, missing),
+            use_cache=use_cache,
+            focus_area=focus_area,
+            cacheable=has_trend_array,
+        )
+        trends += merge_follow_up(focus_area, trends, follow_up, previous)
+    return trends
 
-        # Validate and filter trends
-        valid_trends = []
-        for trend in trends:
-            if validate_trend(trend):
-                trend["focus_area"] = focus_area
-                trend["timestamp"] = datetime.now(timezone.utc).isoformat()
-                # Ensure arrays exist
-                trend.setdefault("signal_evidence", [])
-                trend.setdefault("noise_indicators", [])
-                valid_trends.append(trend)
-            else:
-                logger.warning(f"Invalid trend skipped: {trend.get('tool_name', 'unknown')}")
 
-        logger.info(f"Found {len(valid_trends)} valid trends for {focus_area}")
-        return valid_trends
+async def analyze_batch_async(
+    focus_areas: list[str],
+    use_cache: bool = True,
+    previous_by_area: Optional[dict[str, list[dict]]] = None,
+) -> dict[str, Optional[list[dict]]]:
+    """
+    Analyze several focus areas with a single structured-output request.
 
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error for {focus_area}: {e}")
-        return None
+    The shared prompt prefix is sent and paid for once, and the areas wait
+    on one round trip instead of one each. Telemetry records the call under
+    focus area "batch". Returns {focus_area: trends} where an area is None
+    if the call failed or the response had no array for it.
+    """
+    prompt = build_batch_prompt(focus_areas, previous_by_area)
+    response_format = batch_response_format(focus_areas, incremental=bool(previous_by_area))
+
+    logger.info(f"Analyzing focus areas in one batch: {', '.join(focus_areas)}")
+
+    content = await call_grok_with_retry_async(
+        prompt,
+        use_cache=use_cache,
+        focus_area="batch",
+        response_format=response_format,
+        cacheable=has_trend_array,
+    )
+    if not content:
+        logger.error("Failed to get batched response")
+        return {area: None for area in focus_areas}
+
+    return split_batch_response(content, focus_areas, previous_by_area)
 
 
 def run_full_analysis() -> dict:
     """
-    Run analysis for all focus areas.
+    Blocking wrapper around run_full_analysis_async for scripts.
 
+    Runs its own event loop, so it must not be called from a coroutine.
     Returns dict with radar_date and trends list.
     """
+    return asyncio.run(run_full_analysis_async())
+
+
+TrendCallback = Callable[[dict], Awaitable[None]]
+
+
+async def stream_focus_area_async(
+    focus_area: str,
+    on_trend: Optional[TrendCallback] = None,
+    use_cache: bool = True,
+    previous: Optional[list[dict]] = None,
+) -> Optional[list[dict]]:
+    """
+    Analyze a focus area from a streamed completion.
+
+    Each array element is validated as soon as its closing brace arrives and
+    passed to on_trend, so work on early trends overlaps the rest of the
+    stream. A failed attempt is retried only if no trend was emitted yet;
+    otherwise the trends received so far are kept. Elements lost to a
+    truncated, malformed or failed stream, or to a salvaged cached reply,
+    are requested once with a follow-up prompt, as in analyze_focus_area;
+    a stream whose array never closed is not cached.
+    Returns list of trend dictionaries or None if analysis fails.
+    """
+    prompt = build_discovery_prompt(focus_area, previous)
+    model = f"openai/{GROK_MODEL}"
+    previous_by_name = _index_previous(previous)
+
+    logger.info(f"Streaming analysis for focus area: {focus_area}")
+
+    if use_cache:
+        cached = await llm_cache.get_async(model, prompt, GROK_TEMPERATURE)
+        if cached is not None:
+            llm_telemetry.record(model, "cache_hit", 0, focus_area=focus_area, attempt=0)
+            trends, salvage = extract_trends(focus_area, cached, previous)
+            if trends is None:
+                return None
+            for trend in trends:
+                if on_trend is not None:
+                    await on_trend(trend)
+            return await _follow_up_stream(focus_area, trends, salvage, on_trend, use_cache, previous)
+
+    valid_trends: list[dict] = []
+
+    for attempt in range(1, retry_policy.max_attempts + 1):
+        if not llm_circuit_breaker.allow():
+            logger.warning(f"LLM circuit open; not streaming Grok for {focus_area}")
+            return None
+        parser = JsonArrayStreamParser()
+        chunks = []
+        usage_chunk = None
+        start = time.perf_counter()
+        try:
+            response = await litellm.acompletion(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=GROK_TEMPERATURE,
+                api_base=LITELLM_BASE_URL,
+                api_key=LITELLM_API_KEY,
+                stream=True,
+                # Ask for token usage on the final chunk so streamed calls are costed
+                stream_options={"include_usage": True},
+                max_retries=0,
+            )
+            async for chunk in response:
+                # Some providers attach usage to the final chunk
+                if getattr(chunk, "usage", None) is not None:
+                    usage_chunk = chunk
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                chunks.append(delta)
+                for element in parser.feed(delta):
+                    trend = prepare_trend(focus_area, element, previous_by_name)
+                    if trend is None:
+                        continue
+                    valid_trends.append(trend)
+                    if on_trend is not None:
+                        await on_trend(trend)
+
+            llm_circuit_breaker.record_success()
+            llm_telemetry.record(
+                model, "success", _elapsed_ms(start), focus_area, attempt, usage_chunk, streamed=True
+            )
+            if not parser.started:
+                logger.warning(f"No JSON array found in response for {focus_area}")
+                return None
+
+            content = "".join(chunks).strip()
+            if parser.done:
+                await llm_cache.put_async(model, prompt, GROK_TEMPERATURE, content)
+            logger.info(f"Found {len(valid_trends)} valid trends for {focus_area}")
+            break
+
+        except Exception as e:
+            llm_circuit_breaker.record_failure(e)
+            llm_telemetry.record(
+                model, "error", _elapsed_ms(start), focus_area, attempt, error=str(e), streamed=True
+            )
+            logger.warning(
+                f"Grok streaming call failed (attempt {attempt}/{retry_policy.max_attempts}): {e}"
+            )
+            if valid_trends:
+                # Trends were already handed out; keep them rather than re-emit
+                # and ask only for what the cut-off stream lost
+                salvage = salvage_json_array("".join(chunks))
+                if not salvage.dropped and not salvage.complete:
+                    salvage = salvage._replace(dropped=["stream failed before the array closed"])
+                return await _follow_up_stream(
+                    focus_area, valid_trends, salvage, on_trend, use_cache, previous
+                )
+            decision = retry_policy.decide(e, attempt)
+            if not decision.retry:
+                logger.error(f"Giving up on Grok streaming for {focus_area}: {decision.reason}")
+                return None
+            await asyncio.sleep(decision.delay)
+        except BaseException:
+            llm_circuit_breaker.release_probe()
+            raise
+    else:
+        return None
+
+    if parser.rejected or parser.partial is not None or not parser.done:
+        # Truncated or malformed stream: ask only for what was lost
+        salvage = salvage_json_array(content)
+        if not salvage.dropped and not salvage.complete:
+            salvage = salvage._replace(dropped=["stream ended before the array closed"])
+        logger.warning(
+            f"Dropped {len(salvage.dropped)} element(s) from stream for {focus_area}: "
+            f"{'; '.join(salvage.dropped)}"
+        )
+        await _follow_up_stream(focus_area, valid_trends, salvage, on_trend, use_cache, previous)
+        if not parser.done and not valid_trends:
+            logger.error(f"Stream for {focus_area} ended before any trend arrived")
+            return None
+    return valid_trends
+
+
+async def _follow_up_stream(
+    focus_area: str,
+    trends: list[dict],
+    salvage: SalvagedArray,
+    on_trend: Optional[TrendCallback],
+    use_cache: bool,
+    previous: Optional[list[dict]],
+) -> list[dict]:
+    """Request the tools a lossy streamed response dropped and emit the recovered ones."""
+    missing = missing_tool_count(trends, salvage)
+    if missing:
+        follow_up = await call_grok_with_retry_async(
+            build_follow_up_prompt(focus_area, trends, salvage, missing),
+            use_cache=use_cache,
+            focus_area=focus_area,
+            cacheable=has_trend_array,
+        )
+        for trend in merge_follow_up(focus_area, trends, follow_up, previous):
+            trends.append(trend)
+            if on_trend is not None:
+                await on_trend(trend)
+    return trends
+
+
+ProgressCallback = Callable[[str, dict], Awaitable[None]]
+
+
+async def _report_progress(
+    on_progress: Optional[ProgressCallback], focus_area: str, update: dict
+) -> None:
+    """Forward a per-area progress update, never letting it break analysis."""
+    if on_progress is None:
+        return
+    try:
+        await on_progress(focus_area, update)
+    except Exception as e:
+        logger.warning(f"Progress callback failed for {focus_area}: {e}")
+
+
+async def run_full_analysis_async(
+    max_concurrency: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    use_cache: bool = True,
+    streaming: Optional[bool] = None,
+    previous_trends: Optional[list[dict]] = None,
+    batched: Optional[bool] = None,
+) -> dict:
+    """
+    Run analysis for all focus areas concurrently.
+
+    At most max_concurrency areas (default ANALYSIS_CONCURRENCY) are in flight
+    at once. A failing area is logged and skipped, as in run_full_analysis.
+    If on_progress is given it is awaited with (focus_area, update) whenever an
+    area starts or finishes; update carries status, trends_count and duration_ms.
+    use_cache=False bypasses cached LLM completions. streaming (default
+    LLM_STREAMING) uses stream_focus_area_async, adding trends_count and
+    first_trend_ms updates while each area is still streaming.
+    previous_trends (the last radar's trends) makes the analysis incremental:
+    unchanged tools are carried forward instead of re-analyzed.
+    batched (default LLM_BATCHED_ANALYSIS) first asks for all areas in one
+    request via analyze_batch_async; areas the batch does not deliver fall
+    back to the per-area analysis above.
+    Returns dict with radar_date, trends list, and reused_count and
+    reanalyzed_count.
+    """
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    all_trends = []
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or ANALYSIS_CONCURRENCY))
+    if streaming is None:
+        streaming = LLM_STREAMING
+    if batched is None:
+        batched = LLM_BATCHED_ANALYSIS
+    previous_by_area: dict[str, list[dict]] = {}
+    for trend in previous_trends or []:
+        previous_by_area.setdefault(trend["focus_area"], []).append(trend)
+
+    logger.info(f"Starting concurrent radar analysis for {today}")
+
+    async def analyze_bounded(focus_area: str) -> Optional[list[dict]]:
+        async with semaphore:
+            await _report_progress(on_progress, focus_area, {"status": "running"})
+            start = time.perf_counter()
+            streamed = {}
+            trends = None
 
-    logger.info(f"Starting full radar analysis for {today}")
+            async def on_trend(trend: dict) -> None:
+                streamed.setdefault("first_trend_ms", int((time.perf_counter() - start) * 1000))
+                streamed["trends_count"] = streamed.get("trends_count", 0) + 1
+                await _report_progress(on_progress, focus_area, {"status": "running", **streamed})
+
+            previous = previous_by_area.get(focus_area)
+            try:
+                if streaming:
+                    trends = await stream_focus_area_async(
+                        focus_area, on_trend=on_trend, use_cache=use_cache, previous=previous
+                    )
+                else:
+                    trends = await analyze_focus_area_async(
+                        focus_area, use_cache=use_cache, previous=previous
+                    )
+                return trends
+            finally:
+                await _report_progress(
+                    on_progress,
+                    focus_area,
+                    {
+                        **streamed,
+                        "status": "done" if trends is not None else "failed",
+                        "trends_count": len(trends or []),
+                        "duration_ms": int((time.perf_counter() - start) * 1000),
+                    },
+                )
+
+    areas = list(FOCUS_AREAS)
+    batch_results: dict[str, Optional[list[dict]]] = {}
+    if batched:
+        batch_results = await _run_batch(areas, on_progress, use_cache, previous_by_area)
+    fallback_areas = [area for area in areas if batch_results.get(area) is None]
+    if batched and fallback_areas:
+        logger.warning(f"Falling back to per-area analysis for {', '.join(fallback_areas)}")
+
+    fallback_results = await asyncio.gather(
+        *(analyze_bounded(focus_area) for focus_area in fallback_areas),
+        return_exceptions=True,
+    )
+    results_by_area = {**batch_results, **dict(zip(fallback_areas, fallback_results))}
 
-    for focus_area in FOCUS_AREAS:
-        trends = analyze_focus_area(focus_area)
+    all_trends = []
+    for focus_area in areas:
+        trends = results_by_area[focus_area]
+        if isinstance(trends, Exception):
+            logger.error(f"Analysis failed for {focus_area}: {trends}")
+            continue
         if trends:
             all_trends.extend(trends)
 
-    logger.info(f"Analysis complete: {len(all_trends)} total trends discovered")
+    reused = sum(1 for trend in all_trends if trend.get("carried_forward"))
+    logger.info(
+        f"Analysis complete: {len(all_trends)} total trends discovered ({reused} carried forward)"
+    )
 
     return {
         "radar_date": today,
         "trends": all_trends,
+        "reused_count": reused,
+        "reanalyzed_count": len(all_trends) - reused,
     }
 
 
+async def _run_batch(
+    areas: list[str],
+    on_progress: Optional[ProgressCallback],
+    use_cache: bool,
+    previous_by_area: dict[str, list[dict]],
+) -> dict[str, Optional[list[dict]]]:
+    """Run the batched request for run_full_analysis_async, reporting areas it delivered."""
+    for focus_area in areas:
+        await _report_progress(on_progress, focus_area, {"status": "running"})
+    start = time.perf_counter()
+    try:
+        results = await analyze_batch_async(
+            areas, use_cache=use_cache, previous_by_area=previous_by_area
+        )
+    except Exception as e:
+        logger.error(f"Batched analysis failed: {e}")
+        return {}
+    duration_ms = int((time.perf_counter() - start) * 1000)
+    for focus_area, trends in results.items():
+        if trends is not None:
+            await _report_progress(
+                on_progress,
+                focus_area,
+                {"status": "done", "trends_count": len(trends), "duration_ms": duration_ms},
+            )
+    return results
+
+
 def check_api_connection() -> dict:
     """
     Check if the Grok API connection is working.
 
+    The probe bypasses the circuit breaker and reports its state.
     Returns dict with status and message.
     """
     try:
@@ -253,10 +1059,12 @@ def check_api_connection() -> dict:
             "message": "Grok API connection successful",
             "model": GROK_MODEL,
             "litellm_base_url": LITELLM_BASE_URL,
+            "circuit_breaker": llm_circuit_breaker.snapshot(),
         }
     except Exception as e:
         return {
             "status": "error",
             "message": f"Grok API connection failed: {str(e)}",
             "litellm_base_url": LITELLM_BASE_URL,
+            "circuit_breaker": llm_circuit_breaker.snapshot(),
         }
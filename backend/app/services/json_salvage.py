@@ -0,0 +1,146 @@
+"""Tolerant extraction of the trend array from imperfect LLM output."""
+
+import json
+import re
+from typing import NamedTuple
+
+from app.services.json_stream import JsonArrayStreamParser, strip_trailing_commas
+
+# Keys models wrap the array in, e.g. {"tools": [...]}
+WRAPPER_KEYS = ("tools", "trends", "results", "items", "data")
+
+_FENCE_PATTERN = re.compile(r"```[\w-]*[ \t]*\n?(.*?)(?:```|\Z)", re.DOTALL)
+_WRAPPER_PATTERN = re.compile(r'"(%s)"\s*:\s*\[' % "|".join(WRAPPER_KEYS))
+_TOOL_NAME_PATTERN = re.compile(r'"tool_name"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+class SalvagedArray(NamedTuple):
+    """The recoverable part of a JSON array and what was lost on the way."""
+
+    elements: list
+    found: bool
+    complete: bool
+    repairs: list[str]
+    dropped: list[str]
+    dropped_names: list[str]
+
+
+def _wrapped_array(data: dict):
+    for key in WRAPPER_KEYS:
+        if isinstance(data.get(key), list):
+            return key, data[key]
+    lists = [(key, value) for key, value in data.items() if isinstance(value, list)]
+    return lists[0] if len(lists) == 1 else (None, None)
+
+
+def _tool_name(text: str):
+    match = _TOOL_NAME_PATTERN.search(text)
+    if match is None:
+        return None
+    try:
+        return json.loads(f'"{match.group(1)}"')
+    except json.JSONDecodeError:
+        return match.group(1)
+
+
+def _salvage_elements(text: str, repairs: list[str]) -> SalvagedArray:
+    """Keep every element that closed in the array starting at text."""
+    parser = JsonArrayStreamParser()
+    elements = parser.feed(text)
+    dropped = [f"undecodable element: {element[:80]!r}" for element in parser.rejected]
+    lost_texts = list(parser.rejected)
+    if parser.partial is not None:
+        dropped.append("truncated final element")
+        lost_texts.append(parser.partial)
+    names = [name for name in map(_tool_name, lost_texts) if name]
+    return SalvagedArray(elements, True, parser.done, repairs, dropped, names)
+
+
+def salvage_json_array(content: str) -> SalvagedArray:
+    """
+    Recover the elements of the JSON array in an LLM response.
+
+    Handles markdown fences, text around the array, trailing commas and
+    arrays wrapped in an object such as {"tools": [...]}. When the array
+    is malformed or cut off, every element that closed and decodes is
+    kept; dropped lists one entry per lost element (a truncated final
+    element or an undecodable one) and dropped_names the tool names that
+    could still be read from them. found is False when no array exists.
+    """
+    repairs: list[str] = []
+    text = content.strip()
+    fence = _FENCE_PATTERN.search(text)
+    if fence:
+        text = fence.group(1).strip()
+        repairs.append("markdown fence")
+    text, commas = strip_trailing_commas(text)
+    if commas:
+        repairs.append(f"{commas} trailing comma(s)")
+
+    # Whole response, or the outermost brackets, as valid JSON
+    candidates = [text]
+    start, end = text.find("["), text.rfind("]") + 1
+    if start != -1 and end > start and (start, end) != (0, len(text)):
+        candidates.append(text[start:end])
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            key, data = _wrapped_array(data)
+            if key is not None:
+                repairs.append(f'{{"{key}": [...]}} wrapper')
+        if isinstance(data, list):
+            return SalvagedArray(data, True, True, repairs, [], [])
+
+    # Malformed or truncated: keep every element that closed
+    wrapper = _WRAPPER_PATTERN.search(text)
+    if wrapper:
+        start = wrapper.end() - 1
+        repairs.append(f'{{"{wrapper.group(1)}": [...]}} wrapper')
+    if start == -1:
+        return SalvagedArray([], False, False, repairs, [], [])
+
+    return _salvage_elements(text[start:], repairs)
+
+
+def salvage_keyed_arrays(content: str, keys: list[str]) -> dict[str, SalvagedArray]:
+    """
+    Recover the array under each key of a JSON object such as {"a": [...]}.
+
+    Applies the repairs of salvage_json_array to the whole object; when it
+    still does not decode, each key's array is salvaged on its own, so a
+    truncated or broken area does not cost the ones before it. Keys without
+    an array are left out of the result.
+    """
+    repairs: list[str] = []
+    text = content.strip()
+    fence = _FENCE_PATTERN.search(text)
+    if fence:
+        text = fence.group(1).strip()
+        repairs.append("markdown fence")
+    text, commas = strip_trailing_commas(text)
+    if commas:
+        repairs.append(f"{commas} trailing comma(s)")
+
+    start, end = text.find("{"), text.rfind("}") + 1
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start:end])
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict):
+            return {
+                key: SalvagedArray(data[key], True, True, repairs, [], [])
+                for key in keys
+                if isinstance(data.get(key), list)
+            }
+
+    arrays = {}
+    for key in keys:
+        match = re.search(r'"%s"\s*:\s*\[' % re.escape(key), text)
+        if match is None:
+            continue
+        arrays[key] = _salvage_elements(text[match.end() - 1 :], repairs + ["malformed object"])
+    return arrays
@@ -0,0 +1,139 @@
+"""Incremental parser for JSON arrays arriving in streamed chunks."""
+
+import json
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def strip_trailing_commas(text: str) -> tuple[str, int]:
+    """
+    Remove commas directly before a closing brace or bracket.
+
+    Commas inside strings are left alone. Returns the repaired text and the
+    number of commas removed.
+    """
+    result = []
+    comma_at = None
+    removed = 0
+    in_string = escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            comma_at = None
+        elif char == ",":
+            comma_at = len(result)
+        elif char in "}]":
+            if comma_at is not None:
+                result[comma_at] = ""
+                removed += 1
+            comma_at = None
+        elif not char.isspace():
+            comma_at = None
+        result.append(char)
+    return "".join(result), removed
+
+
+class JsonArrayStreamParser:
+    """
+    Extract complete elements of the first top-level JSON array in a stream.
+
+    Text before the opening bracket (e.g. "Here are the results:") is
+    skipped. feed() returns the object and array elements that closed
+    within the chunk, so callers can act on each one before the stream ends.
+    Elements that still fail to decode after dropping trailing commas are
+    kept in rejected; partial holds the element left open when the text ends.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._element_start = None
+        self.started = False
+        self.done = False
+        self.elements_seen = 0
+        self.decode_errors = 0
+        self.rejected: list[str] = []
+
+    def feed(self, chunk: str) -> list:
+        """Consume a chunk; return elements completed by it."""
+        if self.done or not chunk:
+            return []
+
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            char = buffer[i]
+
+            if not self.started:
+                if char == "[":
+                    self.started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 1:
+                    self._element_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._element_start is not None:
+                    completed.extend(self._decode(buffer[self._element_start : i + 1]))
+                    self._element_start = None
+                elif self._depth == 0:
+                    self.done = True
+                    break
+            i += 1
+
+        # Drop consumed text so the buffer only holds the open element
+        keep_from = self._element_start if self._element_start is not None else i
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._element_start is not None:
+            self._element_start = 0
+        return completed
+
+    @property
+    def partial(self) -> Optional[str]:
+        """Text of the element still open, e.g. cut off by a truncated response."""
+        if self.done or self._element_start is None:
+            return None
+        return self._buffer[self._element_start :]
+
+    def _decode(self, text: str) -> list:
+        self.elements_seen += 1
+        try:
+            return [json.loads(text)]
+        except json.JSONDecodeError:
+            pass
+        try:
+            return [json.loads(strip_trailing_commas(text)[0])]
+        except json.JSONDecodeError as e:
+            self.decode_errors += 1
+            self.rejected.append(text)
+            logger.warning(f"Skipping undecodable streamed element: {e}")
+            return []
@@ -0,0 +1,196 @@
+"""Content-addressed on-disk cache for LLM completions."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.config import env_flag, load_environment
+
+load_environment()
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = env_flag("LLM_CACHE_ENABLED", default=True)
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "./.llm_cache")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+def cache_key(model: str, prompt: str, temperature: float) -> str:
+    """Build the content address for a (model, prompt hash, temperature) triple."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    material = json.dumps(
+        {"model": model, "prompt_sha256": prompt_hash, "temperature": temperature},
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Raw completion cache stored as one JSON file per key.
+
+    Entries expire after ttl_seconds. The directory size is scanned once
+    and then tracked as entries are written and removed; only when it grows
+    past max_bytes is the directory rescanned and the least recently used
+    entries evicted. Async callers use get_async and put_async so file
+    I/O and any eviction run off the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str = LLM_CACHE_DIR,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        enabled: bool = LLM_CACHE_ENABLED,
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, model: str, prompt: str, temperature: float) -> Optional[str]:
+        """Return the cached completion content, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        path = self._path(cache_key(model, prompt, temperature))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            size = self._file_size(path)
+            path.unlink(missing_ok=True)
+            self._track(-size)
+            self._count(hit=False)
+            return None
+
+        try:
+            # Touch for LRU eviction
+            os.utime(path)
+        except OSError:
+            # Evicted or replaced since the read; the content is still good
+            pass
+        self._count(hit=True)
+        return entry["content"]
+
+    async def get_async(self, model: str, prompt: str, temperature: float) -> Optional[str]:
+        """Look up a completion from a worker thread so the event loop is not blocked."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, model, prompt, temperature)
+
+    def put(self, model: str, prompt: str, temperature: float, content: str) -> None:
+        """Store a completion; failures are logged, never raised."""
+        if not self.enabled:
+            return
+
+        path = self._path(cache_key(model, prompt, temperature))
+        entry = {
+            "model": model,
+            "temperature": temperature,
+            "created_at": time.time(),
+            "content": content,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            replaced = self._file_size(path)
+            # Write to a temp file and rename so readers never see partial entries
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_name, path)
+            if self._track(self._file_size(path) - replaced) > self.max_bytes:
+                self._evict()
+        except OSError as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def put_async(self, model: str, prompt: str, temperature: float, content: str) -> None:
+        """Store a completion from a worker thread so the event loop is not blocked."""
+        if self.enabled:
+            await asyncio.to_thread(self.put, model, prompt, temperature, content)
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _track(self, delta: int) -> int:
+        """Apply a size change and return the tracked directory size."""
+        if self._size is None:
+            # First write in this process: start from what is on disk
+            size = sum(size for _, size, _ in self._scan())
+            with self._lock:
+                if self._size is None:
+                    self._size = size - delta
+        with self._lock:
+            self._size += delta
+            return self._size
+
+    def _evict(self) -> None:
+        files = self._scan()
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(files):
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+                if total <= self.max_bytes:
+                    break
+        with self._lock:
+            self.evictions += evicted
+            self._size = total
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters since process start."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "directory": str(self.directory),
+                "ttl_seconds": self.ttl_seconds,
+                "max_bytes": self.max_bytes,
+            }
+
+
+llm_cache = LLMCache()
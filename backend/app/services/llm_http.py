@@ -0,0 +1,199 @@
+"""Shared keep-alive HTTP clients for LiteLLM calls, with connect timing."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+
+from app.lazy_imports import litellm
+
+logger = logging.getLogger(__name__)
+
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "90"))  # seconds
+LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "10"))
+# Matches request_timeout in litellm_config.yaml; analyses can take minutes
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))
+# Connections opened to LITELLM_BASE_URL at startup; 0 disables warm-up
+LLM_HTTP_WARMUP_CONNECTIONS = int(os.getenv("LLM_HTTP_WARMUP_CONNECTIONS", "0"))
+
+# Connect samples kept for percentiles
+_SAMPLE_SIZE = 1000
+
+
+def _percentile(values: list[float], percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))], 2)
+
+
+class ConnectionStats:
+    """Counts requests and the TCP/TLS setup time of the ones that opened a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+            self._connect_ms: deque[float] = deque(maxlen=_SAMPLE_SIZE)
+
+    def observe(self, connect_ms: Optional[float]) -> None:
+        """Record a request; connect_ms is None when it reused a pooled connection."""
+        with self._lock:
+            self.requests += 1
+            if connect_ms is not None:
+                self.new_connections += 1
+                self._connect_ms.append(connect_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = list(self._connect_ms)
+            requests, new = self.requests, self.new_connections
+        return {
+            "requests": requests,
+            "new_connections": new,
+            "reused_connections": requests - new,
+            "connect_p50_ms": _percentile(samples, 50),
+            "connect_p95_ms": _percentile(samples, 95),
+            "connect_total_ms": round(sum(samples), 2),
+        }
+
+
+class _ConnectTrace:
+    """httpcore trace callback timing connect_tcp and start_tls for one request."""
+
+    def __init__(self):
+        self.started: dict[str, float] = {}
+        self.connect_ms: Optional[float] = None
+
+    def __call__(self, name: str, info: dict) -> None:
+        for phase in ("connect_tcp", "start_tls"):
+            if name == f"connection.{phase}.started":
+                self.started[phase] = time.perf_counter()
+            elif name == f"connection.{phase}.complete" and phase in self.started:
+                elapsed = (time.perf_counter() - self.started[phase]) * 1000
+                self.connect_ms = (self.connect_ms or 0.0) + elapsed
+
+
+class _AsyncConnectTrace(_ConnectTrace):
+    async def __call__(self, name: str, info: dict) -> None:
+        super().__call__(name, info)
+
+
+class LLMHttpPool:
+    """
+    Long-lived httpx clients installed as LiteLLM's client sessions.
+
+    open() builds one sync and one async client with a bounded keep-alive
+    pool and hands them to litellm, so every focus area, retry and health
+    probe reuses warm connections instead of paying TCP/TLS setup per call.
+    Each request is traced; connection stats show how many calls opened a
+    connection and how long the setup took. Called from the app lifespan.
+    """
+
+    def __init__(self):
+        self.stats = ConnectionStats()
+        self.client: Optional[httpx.Client] = None
+        self.aclient: Optional[httpx.AsyncClient] = None
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(LLM_HTTP_TIMEOUT, connect=LLM_HTTP_CONNECT_TIMEOUT)
+
+    def open(self) -> None:
+        """
+        Create the clients and install them as litellm's sessions.
+
+        Does not import litellm: if it is not loaded yet the sessions are
+        installed by the first refresh that loads it.
+        """
+        stats = self.stats
+
+        def trace_request(request: httpx.Request) -> None:
+            request.extensions["trace"] = _ConnectTrace()
+
+        def record_response(response: httpx.Response) -> None:
+            stats.observe(response.request.extensions["trace"].connect_ms)
+
+        async def atrace_request(request: httpx.Request) -> None:
+            request.extensions["trace"] = _AsyncConnectTrace()
+
+        async def arecord_response(response: httpx.Response) -> None:
+            record_response(response)
+
+        self.client = httpx.Client(
+            limits=self._limits(),
+            timeout=self._timeout(),
+            event_hooks={"request": [trace_request], "response": [record_response]},
+        )
+        self.aclient = httpx.AsyncClient(
+            limits=self._limits(),
+            timeout=self._timeout(),
+            event_hooks={"request": [atrace_request], "response": [arecord_response]},
+        )
+        litellm.on_load(self._install)
+
+    def _install(self, module) -> None:
+        module.client_session = self.client
+        module.aclient_session = self.aclient
+        self._forget_litellm_clients(module)
+
+    async def warm_up(self, base_url: str, connections: int = LLM_HTTP_WARMUP_CONNECTIONS) -> int:
+        """
+        Open connections to base_url concurrently so first calls find them warm.
+
+        Any HTTP answer counts; failures are logged and never block startup.
+        Returns how many requests got a response.
+        """
+        if self.aclient is None or connections <= 0:
+            return 0
+        url = base_url.rstrip("/") + "/health/liveliness"
+        results = await asyncio.gather(
+            *(self.aclient.get(url) for _ in range(connections)), return_exceptions=True
+        )
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"LLM connection warm-up: {len(failures)} failed: {failures[0]}")
+        return len(results) - len(failures)
+
+    async def close(self) -> None:
+        """Close the clients and restore litellm's default sessions."""
+        litellm.discard(self._install)
+        if litellm.loaded:
+            module = litellm.load()
+            if module.client_session is self.client:
+                module.client_session = None
+            if module.aclient_session is self.aclient:
+                module.aclient_session = None
+            self._forget_litellm_clients(module)
+        if self.aclient is not None:
+            await self.aclient.aclose()
+        if self.client is not None:
+            self.client.close()
+        self.client = self.aclient = None
+
+    @staticmethod
+    def _forget_litellm_clients(module) -> None:
+        # Newer litellm caches OpenAI clients bound to the previous session
+        cache = getattr(module, "in_memory_llm_clients_cache", None)
+        if cache is not None and hasattr(cache, "flush_cache"):
+            cache.flush_cache()
+
+
+llm_http = LLMHttpPool()
@@ -0,0 +1,216 @@
+"""Per-call LLM telemetry buffered in memory and persisted to llm_calls."""
+
+import contextvars
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.lazy_imports import litellm
+from app.models import LLMCall
+
+logger = logging.getLogger(__name__)
+
+# Optional prices (USD per 1K tokens); when unset litellm's price table is used
+LLM_PROMPT_COST_PER_1K = os.getenv("LLM_PROMPT_COST_PER_1K")
+LLM_COMPLETION_COST_PER_1K = os.getenv("LLM_COMPLETION_COST_PER_1K")
+# Calls kept in memory between flushes; the oldest are dropped beyond this
+LLM_TELEMETRY_BUFFER = int(os.getenv("LLM_TELEMETRY_BUFFER", "10000"))
+
+# Refresh job the current task's calls belong to; inherited by gathered tasks
+current_run_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "llm_run_id", default=None
+)
+
+
+def usage_tokens(response: Any) -> tuple[Optional[int], Optional[int]]:
+    """Return (prompt_tokens, completion_tokens) from a LiteLLM response or chunk."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None, None
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    return (
+        prompt if isinstance(prompt, int) else None,
+        completion if isinstance(completion, int) else None,
+    )
+
+
+def estimate_cost(
+    model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]
+) -> Optional[float]:
+    """
+    Estimate the USD cost of a call.
+
+    Configured LLM_*_COST_PER_1K prices win; otherwise litellm's bundled
+    price table is consulted (the openai/ proxy prefix is ignored). Returns
+    None when the model has no known price.
+    """
+    if prompt_tokens is None and completion_tokens is None:
+        return None
+    if LLM_PROMPT_COST_PER_1K is not None or LLM_COMPLETION_COST_PER_1K is not None:
+        return (
+            (prompt_tokens or 0) * float(LLM_PROMPT_COST_PER_1K or 0)
+            + (completion_tokens or 0) * float(LLM_COMPLETION_COST_PER_1K or 0)
+        ) / 1000
+
+    # Table lookup only; completion_cost() may try to fetch tokenizers
+    name = model if model in litellm.model_cost else model.split("/", 1)[-1]
+    if name not in litellm.model_cost:
+        return None
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=name,
+            prompt_tokens=prompt_tokens or 0,
+            completion_tokens=completion_tokens or 0,
+        )
+    except Exception:
+        return None
+    return prompt_cost + completion_cost
+
+
+class LLMTelemetry:
+    """
+    Buffer of completed LLM calls.
+
+    record() only appends under a lock, so it is cheap on the event loop;
+    flush() writes the buffered calls to llm_calls in one transaction and is
+    called from the threadpool when a refresh job finishes.
+    """
+
+    def __init__(self, max_buffer: int = LLM_TELEMETRY_BUFFER):
+        self._lock = threading.Lock()
+        self._buffer: deque[dict] = deque(maxlen=max_buffer)
+        self._session_factory: Optional[sessionmaker] = None
+
+    def configure(self, session_factory: sessionmaker) -> None:
+        """Set the session factory used by flush() when none is passed."""
+        self._session_factory = session_factory
+
+    def record(
+        self,
+        model: str,
+        outcome: str,
+        latency_ms: int,
+        focus_area: Optional[str] = None,
+        attempt: int = 1,
+        response: Any = None,
+        error: Optional[str] = None,
+        streamed: bool = False,
+    ) -> dict:
+        """Buffer one call; outcome is 'success', 'error' or 'cache_hit'."""
+        prompt_tokens, completion_tokens = usage_tokens(response)
+        call = {
+            "run_id": current_run_id.get(),
+            "model": model,
+            "focus_area": focus_area,
+            "attempt": attempt,
+            "outcome": outcome,
+            "streamed": streamed,
+            "started_at": (
+                datetime.now(timezone.utc) - timedelta(milliseconds=latency_ms)
+            ).isoformat(),
+            "latency_ms": latency_ms,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": estimate_cost(model, prompt_tokens, completion_tokens),
+            "error": error[:500] if error else None,
+        }
+        with self._lock:
+            self._buffer.append(call)
+        return call
+
+    def pending(self) -> list[dict]:
+        """Return a copy of the calls not yet flushed."""
+        with self._lock:
+            return list(self._buffer)
+
+    def discard(self) -> None:
+        """Drop buffered calls without persisting them."""
+        with self._lock:
+            self._buffer.clear()
+
+    def flush(self, session_factory: Optional[sessionmaker] = None) -> int:
+        """Persist buffered calls; returns how many were written."""
+        session_factory = session_factory or self._session_factory
+        if session_factory is None:
+            return 0
+        with self._lock:
+            calls = list(self._buffer)
+            self._buffer.clear()
+        if not calls:
+            return 0
+        try:
+            with session_factory() as db:
+                db.add_all(LLMCall(**call) for call in calls)
+                db.commit()
+        except Exception as e:
+            logger.warning(f"Could not persist {len(calls)} LLM call records: {e}")
+            return 0
+        return len(calls)
+
+
+def _percentile(values: list[int], percentile: float) -> Optional[int]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))]
+
+
+def summarize_runs(db: Session, limit: int = 10) -> list[dict]:
+    """
+    Aggregate llm_calls per run, most recent run first.
+
+    Counts, tokens and cost come from one GROUP BY query; latency
+    percentiles from a second query reading only the latencies of the
+    listed runs. Percentiles cover calls that reached the API (successes
+    and errors), not cache hits. Calls made outside a refresh job are
+    grouped under run_id None.
+    """
+    last_call = func.max(LLMCall.started_at)
+    runs = db.execute(
+        select(
+            LLMCall.run_id,
+            func.min(LLMCall.started_at).label("first_call"),
+            last_call.label("last_call"),
+            func.count().label("calls"),
+            func.sum(case((LLMCall.outcome == "error", 1), else_=0)).label("errors"),
+            func.sum(case((LLMCall.outcome == "cache_hit", 1), else_=0)).label("cache_hits"),
+            func.coalesce(func.sum(LLMCall.prompt_tokens), 0).label("prompt_tokens"),
+            func.coalesce(func.sum(LLMCall.completion_tokens), 0).label("completion_tokens"),
+            func.sum(LLMCall.cost_usd).label("cost_usd"),
+        )
+        .group_by(LLMCall.run_id)
+        .order_by(last_call.desc())
+        .limit(limit)
+    ).all()
+    if not runs:
+        return []
+
+    latencies: dict[Optional[str], list[int]] = {run.run_id: [] for run in runs}
+    run_ids = [run_id for run_id in latencies if run_id is not None]
+    match = LLMCall.run_id.in_(run_ids)
+    if None in latencies:
+        match = or_(match, LLMCall.run_id.is_(None))
+    for run_id, latency_ms in db.execute(
+        select(LLMCall.run_id, LLMCall.latency_ms).where(match, LLMCall.outcome != "cache_hit")
+    ):
+        latencies[run_id].append(latency_ms)
+
+    return [
+        {
+            **run._asdict(),
+            "p50_latency_ms": _percentile(latencies[run.run_id], 50),
+            "p95_latency_ms": _percentile(latencies[run.run_id], 95),
+            "cost_usd": round(run.cost_usd, 6) if run.cost_usd is not None else None,
+        }
+        for run in runs
+    ]
+
+
+llm_telemetry = LLMTelemetry()
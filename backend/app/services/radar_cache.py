@@ -0,0 +1,156 @@
+"""In-process cache of serialized radar responses."""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, NamedTuple, Optional
+
+# Upper bound on staleness when several worker processes share one database;
+# a refresh only invalidates the cache of the process that committed it.
+RADAR_CACHE_TTL_SECONDS = float(os.getenv("RADAR_CACHE_TTL_SECONDS", "300"))
+# Dates and filter combinations are client-chosen, so the key space is bounded by LRU
+RADAR_CACHE_MAX_ENTRIES = int(os.getenv("RADAR_CACHE_MAX_ENTRIES", "256"))
+
+
+class CachedRadar(NamedTuple):
+    """Serialized radar payload with its strong ETag."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from the response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class RadarCache:
+    """
+    Cache of serialized radar responses keyed by radar date.
+
+    Concurrent misses for the same key are merged: one caller runs the
+    loader while the others wait on a per-key lock and reuse its result.
+    At most max_entries responses are kept (least recently used go first),
+    and a key's lock is dropped once no caller is loading it.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = RADAR_CACHE_TTL_SECONDS,
+        max_entries: int = RADAR_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CachedRadar] = OrderedDict()
+        # key -> [lock, callers holding or waiting for it]
+        self._key_locks: dict[Hashable, list] = {}
+        self._async_key_locks: dict[Hashable, list] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def _fresh(self, key: Hashable) -> Optional[CachedRadar]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _claim(self, locks: dict[Hashable, list], key: Hashable, factory) -> list:
+        with self._lock:
+            slot = locks.get(key)
+            if slot is None:
+                slot = locks[key] = [factory(), 0]
+            slot[1] += 1
+            return slot
+
+    def _release(self, locks: dict[Hashable, list], key: Hashable, slot: list) -> None:
+        with self._lock:
+            slot[1] -= 1
+            if slot[1] == 0 and locks.get(key) is slot:
+                del locks[key]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], bytes]) -> CachedRadar:
+        """Return the cached entry for key, calling loader once on a miss."""
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry
+
+        slot = self._claim(self._key_locks, key, threading.Lock)
+        try:
+            with slot[0]:
+                # Another caller may have filled the entry while we waited
+                entry = self._fresh(key)
+                if entry is not None:
+                    return entry
+
+                generation = self._generation
+                return self._store(key, loader(), generation)
+        finally:
+            self._release(self._key_locks, key, slot)
+
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[bytes]]
+    ) -> CachedRadar:
+        """Async variant of get_or_load; waiters yield to the event loop."""
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry
+
+        slot = self._claim(self._async_key_locks, key, asyncio.Lock)
+        try:
+            async with slot[0]:
+                entry = self._fresh(key)
+                if entry is not None:
+                    return entry
+
+                generation = self._generation
+                return self._store(key, await loader(), generation)
+        finally:
+            self._release(self._async_key_locks, key, slot)
+
+    def _store(self, key: Hashable, body: bytes, generation: int) -> CachedRadar:
+        entry = CachedRadar(
+            body=body,
+            etag=make_etag(body),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        with self._lock:
+            # Don't store a result that raced with an invalidation
+            if generation == self._generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self) -> None:
+        """Drop all cached entries; called after a refresh commits."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+radar_cache = RadarCache()
@@ -0,0 +1,175 @@
+"""
+Server-Sent Events broadcast of radar updates.
+
+Subscribers and the event backlog live in process memory, so the stream
+assumes a single uvicorn worker: with --workers N a client only sees the
+refreshes that ran in the worker serving its connection.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+RADAR_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("RADAR_EVENTS_HEARTBEAT_SECONDS", "15"))
+RADAR_EVENTS_BACKLOG = int(os.getenv("RADAR_EVENTS_BACKLOG", "100"))
+# Events buffered per client before the oldest undelivered ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+# Client reconnect delay sent in the stream preamble
+RETRY_MS = 5000
+
+# Trend fields compared when deciding whether a trend changed
+_IDENTITY = ("focus_area", "tool_name")
+
+
+class RadarEvent(NamedTuple):
+    """A published event with its monotonically increasing id."""
+
+    id: int
+    type: str
+    data: dict
+
+
+def format_sse(event: RadarEvent) -> bytes:
+    """Encode an event in the text/event-stream wire format."""
+    data = json.dumps(event.data, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n".encode("utf-8")
+
+
+def compute_radar_delta(previous: list[dict], current: list[dict]) -> dict:
+    """
+    Diff two Golden Contract trend lists keyed by (focus_area, tool_name).
+
+    added and changed carry the full new trend so clients can patch their
+    copy in place; removed carries only the key. Timestamps are ignored
+    when comparing, since every analysis stamps trends anew.
+    """
+
+    def key(trend: dict) -> tuple:
+        return tuple(trend[field] for field in _IDENTITY)
+
+    def comparable(trend: dict) -> dict:
+        return {k: v for k, v in trend.items() if k != "timestamp"}
+
+    before = {key(t): t for t in previous}
+    after = {key(t): t for t in current}
+
+    return {
+        "added": [t for k, t in after.items() if k not in before],
+        "changed": [
+            t for k, t in after.items() if k in before and comparable(before[k]) != comparable(t)
+        ],
+        "removed": [dict(zip(_IDENTITY, k)) for k in before if k not in after],
+    }
+
+
+class RadarEventBroadcaster:
+    """
+    Fan-out of radar events to connected SSE clients.
+
+    publish() is thread-safe and never blocks: it is called from threadpool
+    workers after a commit as well as from the event loop. Each subscriber
+    owns a bounded asyncio.Queue fed through its loop's call_soon_threadsafe,
+    so idle connections cost one parked coroutine and no polling. Recent
+    events are kept so reconnecting clients can resume from Last-Event-ID.
+    """
+
+    def __init__(self, backlog: int = RADAR_EVENTS_BACKLOG):
+        self._lock = threading.Lock()
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._backlog: deque[RadarEvent] = deque(maxlen=backlog)
+        self._last_id = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    @property
+    def last_event_id(self) -> int:
+        with self._lock:
+            return self._last_id
+
+    def events_since(self, last_event_id: int) -> list[RadarEvent]:
+        """Return buffered events newer than last_event_id."""
+        with self._lock:
+            return [event for event in self._backlog if event.id > last_event_id]
+
+    def publish(self, event_type: str, data: dict) -> RadarEvent:
+        """Assign the next id to an event and deliver it to every subscriber."""
+        with self._lock:
+            self._last_id += 1
+            event = RadarEvent(self._last_id, event_type, data)
+            self._backlog.append(event)
+            subscribers = list(self._subscribers.items())
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self._remove(queue)
+        return event
+
+    @contextmanager
+    def subscribe(self, last_event_id: Optional[int] = None) -> Iterator[asyncio.Queue]:
+        """
+        Register a queue on the running loop for the duration of the block.
+
+        With last_event_id, buffered events after it are queued first.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._backlog:
+                    if event.id > last_event_id:
+                        _offer(queue, event)
+            self._subscribers[queue] = loop
+        try:
+            yield queue
+        finally:
+            self._remove(queue)
+
+    def _remove(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+
+def _offer(queue: asyncio.Queue, event: RadarEvent) -> None:
+    """Queue an event, dropping the oldest one if the client is behind."""
+    if queue.full():
+        queue.get_nowait()
+        logger.debug("Dropped radar event for a slow subscriber")
+    queue.put_nowait(event)
+
+
+async def event_stream(
+    broadcaster: RadarEventBroadcaster,
+    last_event_id: Optional[int] = None,
+    heartbeat_seconds: float = RADAR_EVENTS_HEARTBEAT_SECONDS,
+) -> AsyncIterator[bytes]:
+    """
+    Yield a client's text/event-stream body until it disconnects.
+
+    A comment line is sent when no event arrived within heartbeat_seconds
+    to keep proxies from closing the idle connection.
+    """
+    with broadcaster.subscribe(last_event_id) as queue:
+        yield f"retry: {RETRY_MS}\n\n".encode("utf-8")
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+
+
+radar_events = RadarEventBroadcaster()
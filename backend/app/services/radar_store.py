@@ -0,0 +1,335 @@
+"""Persistence of analyzed radar trends."""
+
+import json
+import os
+from datetime import date, datetime, timezone
+from typing import Iterator, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.metrics import timed
+from app.models import RadarRun, Trend
+from app.services.radar_cache import make_etag, radar_cache
+from app.services.radar_events import compute_radar_delta, radar_events
+from app.services.tool_registry import resolve_tool_ids
+
+
+def contract_trend(t: dict) -> dict:
+    """Return a trend with exactly the Golden Contract fields, in order."""
+    return {
+        "focus_area": t["focus_area"],
+        "tool_name": t["tool_name"],
+        "classification": t["classification"],
+        "confidence_score": t["confidence_score"],
+        "technical_insight": t["technical_insight"],
+        "signal_evidence": list(t.get("signal_evidence") or []),
+        "noise_indicators": list(t.get("noise_indicators") or []),
+        "architectural_verdict": t["architectural_verdict"],
+        "timestamp": t["timestamp"],
+    }
+
+
+# Rows fetched per server-side cursor batch when streaming history
+HISTORY_BATCH_SIZE = int(os.getenv("RADAR_HISTORY_BATCH_SIZE", "500"))
+
+CONTRACT_FIELDS = (
+    "focus_area",
+    "tool_name",
+    "classification",
+    "confidence_score",
+    "technical_insight",
+    "signal_evidence",
+    "noise_indicators",
+    "architectural_verdict",
+    "timestamp",
+)
+
+# Trend columns stored as JSON array TEXT
+_JSON_FIELDS = ("signal_evidence", "noise_indicators")
+
+
+class RadarQuery(NamedTuple):
+    """Filters, projection and response shape for a radar read."""
+
+    focus_areas: tuple[str, ...] = ()
+    classification: Optional[str] = None
+    min_confidence: Optional[int] = None
+    fields: tuple[str, ...] = CONTRACT_FIELDS
+    grouped: bool = False
+
+    @property
+    def is_full(self) -> bool:
+        """Whether this is the unfiltered flat radar served from snapshots."""
+        return self == RadarQuery()
+
+
+def render_radar_payload(radar_date: str, trends: list[dict]) -> bytes:
+    """Render the Golden Contract JSON for a radar as UTF-8 bytes."""
+    with timed("serialize"):
+        payload = {"radar_date": radar_date, "trends": [contract_trend(t) for t in trends]}
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def render_stored_radar(db: Session, radar_date: str) -> bytes:
+    """
+    Render the Golden Contract JSON from the stored trend rows.
+
+    Selects only the contract columns, so it also runs during migrations
+    on tables that lack newer columns.
+    """
+    query = RadarQuery()
+    rows = db.execute(_filtered_trends_query(radar_date, query))
+    return render_filtered_radar(radar_date, rows, query)
+
+
+def save_radar(db: Session, radar_date: str, trends: list[dict]) -> int:
+    """
+    Replace the stored radar for radar_date with the given trends.
+
+    Runs as a single transaction: existing rows for the date are deleted, the
+    new trends inserted, and the radar_runs row, including the pre-rendered
+    Golden Contract payload, recorded before commit. The radar response cache
+    is invalidated once the commit succeeds. Returns the number of stored
+    trends.
+
+    After the commit a "radar" event with the diff against the previously
+    latest radar is published to SSE subscribers.
+    """
+    previous_date = get_latest_radar_date(db)
+    previous_trends = load_radar_trends(db, previous_date) if previous_date else []
+
+    try:
+        # Delete existing data for the date (replace with fresh analysis)
+        db.query(Trend).filter(Trend.radar_date == radar_date).delete()
+
+        # Insert new trends, linked to their registry entries
+        tool_ids = resolve_tool_ids(db, radar_date, [t["tool_name"] for t in trends])
+        for trend_data, tool_id in zip(trends, tool_ids):
+            trend = Trend(
+                radar_date=radar_date,
+                focus_area=trend_data["focus_area"],
+                tool_name=trend_data["tool_name"],
+                tool_id=tool_id,
+                classification=trend_data["classification"],
+                confidence_score=trend_data["confidence_score"],
+                technical_insight=trend_data["technical_insight"],
+                signal_evidence=json.dumps(
+                    trend_data.get("signal_evidence", []), ensure_ascii=False
+                ),
+                noise_indicators=json.dumps(
+                    trend_data.get("noise_indicators", []), ensure_ascii=False
+                ),
+                architectural_verdict=trend_data["architectural_verdict"],
+                timestamp=trend_data["timestamp"],
+            )
+            db.add(trend)
+
+        run = db.query(RadarRun).filter(RadarRun.radar_date == radar_date).first()
+        if run is None:
+            run = RadarRun(radar_date=radar_date)
+            db.add(run)
+        run.radar_day = date.fromisoformat(radar_date)
+        run.status = "complete"
+        run.trends_count = len(trends)
+        run.completed_at = datetime.now(timezone.utc).isoformat()
+        run.payload = render_radar_payload(radar_date, trends)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    radar_cache.invalidate()
+
+    is_latest = previous_date is None or radar_date >= previous_date
+    event = {
+        "radar_date": radar_date,
+        "previous_radar_date": previous_date,
+        "latest": is_latest,
+        "trends_count": len(trends),
+        "etag": make_etag(run.payload),
+    }
+    if is_latest:
+        event.update(compute_radar_delta(previous_trends, [contract_trend(t) for t in trends]))
+    radar_events.publish("radar", event)
+    return len(trends)
+
+
+def load_radar_trends(db: Session, radar_date: str) -> list[dict]:
+    """Return the stored Golden Contract trends of a radar, from its snapshot when available."""
+    snapshot = get_radar_snapshot(db, radar_date)
+    if snapshot is not None:
+        return json.loads(snapshot)["trends"]
+    return json.loads(render_stored_radar(db, radar_date))["trends"]
+
+
+def get_latest_radar_date(db: Session) -> Optional[str]:
+    """
+    Return the most recent radar date, or None if nothing is stored.
+
+    Reads one row through the radar_runs (status, radar_day) index. Falls
+    back to MAX(radar_date) over the trends index for rows written without
+    a run record.
+    """
+    latest = db.execute(_latest_run_query()).scalar()
+    if latest is not None:
+        return latest
+    return db.query(func.max(Trend.radar_date)).scalar()
+
+
+def _latest_run_query():
+    return (
+        select(RadarRun.radar_date)
+        .where(RadarRun.status == "complete")
+        .order_by(RadarRun.radar_day.desc())
+        .limit(1)
+    )
+
+
+def _filtered_trends_query(radar_date: str, query: RadarQuery):
+    """
+    Select the projected columns of matching trends for one radar.
+
+    Equality filters on radar_date, focus_area and classification are
+    served by the ix_trends_date_area_class index.
+    """
+    columns = set(query.fields)
+    if query.grouped:
+        columns.update(("focus_area", "classification"))
+    statement = select(*(getattr(Trend, name) for name in CONTRACT_FIELDS if name in columns))
+    statement = statement.where(Trend.radar_date == radar_date)
+    if query.focus_areas:
+        statement = statement.where(Trend.focus_area.in_(query.focus_areas))
+    if query.classification:
+        statement = statement.where(Trend.classification == query.classification)
+    if query.min_confidence is not None:
+        statement = statement.where(Trend.confidence_score >= query.min_confidence)
+    return statement.order_by(Trend.id)
+
+
+def render_filtered_radar(radar_date: str, rows, query: RadarQuery) -> bytes:
+    """
+    Render filtered trend rows as JSON bytes in the shape query asks for.
+
+    The flat shape keeps the Golden Contract envelope with only the
+    requested fields per trend. The grouped shape nests trends under
+    focus_areas -> area -> signal/noise.
+    """
+    with timed("serialize"):
+        trends = []
+        for row in rows:
+            values = row._asdict()
+            for name in _JSON_FIELDS:
+                if name in values:
+                    values[name] = json.loads(values[name]) if values[name] else []
+            trends.append(values)
+
+        def project(trend: dict) -> dict:
+            return {name: trend[name] for name in CONTRACT_FIELDS if name in query.fields}
+
+        if query.grouped:
+            groups: dict = {}
+            for trend in trends:
+                area = groups.setdefault(trend["focus_area"], {"signal": [], "noise": []})
+                area.setdefault(trend["classification"], []).append(project(trend))
+            payload = {"radar_date": radar_date, "focus_areas": groups}
+        else:
+            payload = {"radar_date": radar_date, "trends": [project(t) for t in trends]}
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_filtered_radar(db: Session, radar_date: Optional[str], query: RadarQuery) -> bytes:
+    """Load a filtered, projected radar (latest when radar_date is None)."""
+    radar_date = radar_date or get_latest_radar_date(db)
+    if not radar_date:
+        return render_filtered_radar(str(date.today()), [], query)
+    rows = db.execute(_filtered_trends_query(radar_date, query))
+    return render_filtered_radar(radar_date, rows, query)
+
+
+async def load_filtered_radar_async(db, radar_date: Optional[str], query: RadarQuery) -> bytes:
+    """Async counterpart of load_filtered_radar for an AsyncSession."""
+    if not radar_date:
+        radar_date = (await db.execute(_latest_run_query())).scalar()
+    if not radar_date:
+        radar_date = (await db.execute(select(func.max(Trend.radar_date)))).scalar()
+    if not radar_date:
+        return render_filtered_radar(str(date.today()), [], query)
+    rows = await db.execute(_filtered_trends_query(radar_date, query))
+    return render_filtered_radar(radar_date, rows, query)
+
+
+def iter_history_ndjson(
+    session_factory,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    batch_size: int = HISTORY_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Stream stored trends between two radar dates (inclusive) as NDJSON.
+
+    Each line is one trend with its radar_date. Rows are fetched with a
+    yield_per cursor in index order, so no sort step delays the first batch
+    and memory stays bounded by batch_size however long the range is. One
+    chunk is yielded per batch. Opens its own session, since the request's
+    session is closed before a streaming response body is sent.
+    """
+    columns = [Trend.radar_date] + [getattr(Trend, name) for name in CONTRACT_FIELDS]
+    statement = select(*columns)
+    if from_date:
+        statement = statement.where(Trend.radar_date >= from_date)
+    if to_date:
+        statement = statement.where(Trend.radar_date <= to_date)
+    # Matches ix_trends_date_area_class (rowid last) so SQLite streams from the index
+    statement = statement.order_by(
+        Trend.radar_date, Trend.focus_area, Trend.classification, Trend.id
+    ).execution_options(yield_per=batch_size)
+
+    with session_factory() as db:
+        for partition in db.execute(statement).partitions():
+            lines = []
+            for row in partition:
+                values = row._asdict()
+                for name in _JSON_FIELDS:
+                    values[name] = json.loads(values[name]) if values[name] else []
+                lines.append(json.dumps(values, ensure_ascii=False, separators=(",", ":")))
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _snapshot_query(radar_date: Optional[str]):
+    query = select(RadarRun.payload).where(RadarRun.status == "complete")
+    if radar_date:
+        return query.where(RadarRun.radar_date == radar_date).limit(1)
+    return query.order_by(RadarRun.radar_day.desc()).limit(1)
+
+
+def get_radar_snapshot(db: Session, radar_date: Optional[str] = None) -> Optional[bytes]:
+    """
+    Return the stored Golden Contract bytes for a radar date.
+
+    With no date the latest complete radar is used. Returns None when no
+    snapshot exists, e.g. for trends written without a run record.
+    """
+    return db.execute(_snapshot_query(radar_date)).scalar()
+
+
+async def load_radar_async(db, radar_date: Optional[str] = None) -> Optional[bytes]:
+    """
+    Async counterpart of the radar read path for an AsyncSession.
+
+    Returns the stored snapshot when one exists, otherwise renders from the
+    stored rows; None when there is no radar at all.
+    """
+    snapshot = (await db.execute(_snapshot_query(radar_date))).scalar()
+    if snapshot is not None:
+        return snapshot
+
+    if not radar_date:
+        radar_date = (await db.execute(select(func.max(Trend.radar_date)))).scalar()
+        if not radar_date:
+            return None
+
+    query = RadarQuery()
+    rows = await db.execute(_filtered_trends_query(radar_date, query))
+    return render_filtered_radar(radar_date, rows, query)
@@ -0,0 +1,270 @@
+"""Background radar refresh jobs with persisted status."""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.config import env_flag
+from app.models import RefreshJob
+from app.services import grok_service
+from app.services.llm_telemetry import current_run_id, llm_telemetry
+from app.services.radar_events import radar_events
+from app.services.radar_store import get_latest_radar_date, load_radar_trends, save_radar
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Default for refreshes that don't choose: carry unchanged tools forward
+INCREMENTAL_REFRESH = env_flag("RADAR_INCREMENTAL_REFRESH")
+
+
+# Tells this process apart from an earlier one that reused its pid
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def process_owner() -> str:
+    """Identify the current worker process as host:pid:boot."""
+    return f"{socket.gethostname()}:{os.getpid()}:{_BOOT_ID}"
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process; assume a single worker
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_gone(owner: Optional[str]) -> bool:
+    """Whether the process that owned a job has exited."""
+    if owner == process_owner():
+        return False
+    try:
+        host, pid, _ = owner.rsplit(":", 2)
+        pid = int(pid)
+    except (AttributeError, ValueError):
+        # Jobs from before owners were recorded
+        return True
+    if host != socket.gethostname():
+        # Only that host can tell; leave its jobs alone
+        return False
+    return pid == os.getpid() or not _pid_alive(pid)
+
+
+def create_job(db: Session) -> Optional[RefreshJob]:
+    """
+    Create and persist a new queued refresh job owned by this process.
+
+    Returns None if another job is already queued or running; the unique
+    index on active jobs enforces this across worker processes.
+    """
+    job = RefreshJob(
+        id=uuid.uuid4().hex,
+        status="queued",
+        area_progress=json.dumps(
+            {focus_area: {"status": "pending"} for focus_area in grok_service.FOCUS_AREAS}
+        ),
+        created_at=_now(),
+        owner=process_owner(),
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> Optional[RefreshJob]:
+    """Return the refresh job with the given id, if any."""
+    return db.get(RefreshJob, job_id)
+
+
+def get_active_job(db: Session) -> Optional[RefreshJob]:
+    """Return the most recent queued or running job, if any."""
+    return (
+        db.query(RefreshJob)
+        .filter(RefreshJob.status.in_(ACTIVE_STATUSES))
+        .order_by(RefreshJob.created_at.desc())
+        .first()
+    )
+
+
+def mark_interrupted_jobs(db: Session) -> int:
+    """
+    Mark jobs left queued or running by an exited process as interrupted.
+
+    Called on startup. Jobs owned by worker processes that are still alive
+    keep running, so starting one worker does not fail its siblings' jobs.
+    Returns the number of jobs updated.
+    """
+    active = db.query(RefreshJob).filter(RefreshJob.status.in_(ACTIVE_STATUSES)).all()
+    stale = [job for job in active if _owner_gone(job.owner)]
+    for job in stale:
+        job.status = "interrupted"
+        job.message = "Server restarted before the refresh finished."
+        job.finished_at = _now()
+    db.commit()
+    return len(stale)
+
+
+def _update_job(session_factory: sessionmaker, job_id: str, **fields) -> None:
+    """Apply field updates to a job in its own short transaction."""
+    with session_factory() as db:
+        job = db.get(RefreshJob, job_id)
+        if job is None:
+            return
+        for name, value in fields.items():
+            setattr(job, name, value)
+        db.commit()
+
+
+def _load_latest_trends(session_factory: sessionmaker) -> list[dict]:
+    with session_factory() as db:
+        radar_date = get_latest_radar_date(db)
+        return load_radar_trends(db, radar_date) if radar_date else []
+
+
+def _persist(session_factory: sessionmaker, radar_date: str, trends: list[dict]) -> int:
+    with session_factory() as db:
+        return save_radar(db, radar_date, trends)
+
+
+async def run_refresh_job(
+    job_id: str, bind: Engine, force: bool = False, incremental: Optional[bool] = None
+) -> None:
+    """
+    Run the Grok analysis and persistence step for a queued job.
+
+    Analysis runs on the event loop; database work is pushed to the
+    threadpool in short transactions so no session is held while waiting
+    on the LLM. Progress per focus area is saved as it arrives. With
+    force=True cached LLM completions are bypassed. With incremental
+    (default INCREMENTAL_REFRESH) the latest stored radar is sent along so
+    unchanged tools are carried forward; the job records how many trends
+    were reused and re-analyzed. LLM calls are attributed to the job in
+    llm_calls telemetry, which is flushed before the job is finalized. A
+    cancelled job is marked interrupted before the cancellation propagates. A
+    "refresh" event with the final status is published once the job is
+    recorded.
+    """
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+    if incremental is None:
+        incremental = INCREMENTAL_REFRESH
+    progress = {focus_area: {"status": "pending"} for focus_area in grok_service.FOCUS_AREAS}
+    progress_lock = asyncio.Lock()
+
+    async def on_progress(focus_area: str, update: dict) -> None:
+        async with progress_lock:
+            progress[focus_area] = update
+            await run_in_threadpool(
+                _update_job, session_factory, job_id, area_progress=json.dumps(progress)
+            )
+
+    fields = {}
+    run_token = current_run_id.set(job_id)
+    try:
+        await run_in_threadpool(
+            _update_job, session_factory, job_id, status="running", started_at=_now()
+        )
+        previous_trends = None
+        if incremental:
+            previous_trends = await run_in_threadpool(_load_latest_trends, session_factory)
+
+        start = time.perf_counter()
+        result = await grok_service.run_full_analysis_async(
+            on_progress=on_progress, use_cache=not force, previous_trends=previous_trends
+        )
+        fields["analysis_ms"] = int((time.perf_counter() - start) * 1000)
+        radar_date = result["radar_date"]
+        trends = result["trends"]
+        fields["radar_date"] = radar_date
+        reused = result.get("reused_count", 0)
+        fields["reused_count"] = reused
+        fields["reanalyzed_count"] = result.get("reanalyzed_count", len(trends) - reused)
+
+        if not trends:
+            fields.update(
+                status="warning",
+                trends_count=0,
+                message="Analysis completed but no trends discovered. Check API key configuration.",
+            )
+        else:
+            start = time.perf_counter()
+            count = await run_in_threadpool(_persist, session_factory, radar_date, trends)
+            message = f"Successfully analyzed and stored {count} trends."
+            if incremental:
+                message += (
+                    f" {fields['reused_count']} carried forward,"
+                    f" {fields['reanalyzed_count']} re-analyzed."
+                )
+            fields.update(
+                status="success",
+                trends_count=count,
+                persist_ms=int((time.perf_counter() - start) * 1000),
+                message=message,
+            )
+
+    except Exception as e:
+        logger.exception(f"Refresh job {job_id} failed")
+        fields.update(status="failed", message=f"Failed to refresh radar data: {str(e)}")
+    except BaseException:
+        # Cancelled, e.g. on shutdown. Finalize synchronously: a job left active
+        # under this live process would block every later refresh.
+        logger.warning(f"Refresh job {job_id} cancelled")
+        fields.update(status="interrupted", message="Refresh was cancelled before it finished.")
+        _update_job(
+            session_factory,
+            job_id,
+            area_progress=json.dumps(progress),
+            finished_at=_now(),
+            **fields,
+        )
+        raise
+    finally:
+        current_run_id.reset(run_token)
+
+    await run_in_threadpool(llm_telemetry.flush, session_factory)
+
+    async with progress_lock:
+        await run_in_threadpool(
+            _update_job,
+            session_factory,
+            job_id,
+            area_progress=json.dumps(progress),
+            finished_at=_now(),
+            **fields,
+        )
+
+    radar_events.publish(
+        "refresh",
+        {
+            "job_id": job_id,
+            "status": fields.get("status"),
+            "radar_date": fields.get("radar_date"),
+            "trends_count": fields.get("trends_count"),
+        },
+    )
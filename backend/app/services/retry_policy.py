@@ -0,0 +1,264 @@
+"""Retry, circuit breaker and hedging policy for LLM calls."""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, NamedTuple, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))  # seconds
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))
+# Consecutive upstream failures that open the breaker, and how long it stays open
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+# Send a duplicate request when the first has not answered after this long; 0 disables
+LLM_HEDGE_AFTER_MS = float(os.getenv("LLM_HEDGE_AFTER_MS", "0"))
+
+# HTTP statuses worth retrying; other 4xx mean the request itself is wrong
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+T = TypeVar("T")
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """Return the HTTP status carried by a LiteLLM/OpenAI exception, if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classify a failed call as 'rate_limited', 'transient' or 'fatal'.
+
+    Errors without an HTTP status (connection resets, timeouts, malformed
+    responses) are treated as transient, as the previous retry loop did.
+    """
+    status = error_status(error)
+    if status == 429:
+        return "rate_limited"
+    if status is None or status in RETRYABLE_STATUSES or status >= 500:
+        return "transient"
+    return "fatal"
+
+
+def _error_headers(error: BaseException):
+    # LiteLLM copies provider headers here; the openai response may be empty
+    for headers in (
+        getattr(error, "litellm_response_headers", None),
+        getattr(getattr(error, "response", None), "headers", None),
+        getattr(error, "headers", None),
+    ):
+        if headers:
+            yield headers
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Read a Retry-After (seconds or HTTP date) or retry-after-ms hint from an error."""
+    for headers in _error_headers(error):
+        try:
+            value = headers.get("retry-after-ms")
+            if value is not None:
+                return max(0.0, float(value) / 1000)
+            value = headers.get("retry-after")
+        except (AttributeError, ValueError):
+            continue
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            continue
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    return None
+
+
+class RetryDecision(NamedTuple):
+    """Whether to retry a failed attempt and how long to wait first."""
+
+    retry: bool
+    delay: float
+    reason: str
+
+
+class RetryPolicy:
+    """
+    Capped exponential backoff with full jitter.
+
+    The wait before retry n is uniform in [0, min(max_delay, base * 2**(n-1))],
+    so concurrent focus areas failing together do not retry in lockstep. A
+    Retry-After hint on a 429 is honored as the minimum wait; when it
+    exceeds max_delay the call gives up instead of sleeping that long.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = LLM_MAX_ATTEMPTS,
+        base_delay: float = LLM_RETRY_BASE_DELAY,
+        max_delay: float = LLM_RETRY_MAX_DELAY,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered wait after the given 1-based attempt."""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def decide(self, error: BaseException, attempt: int) -> RetryDecision:
+        """Decide what to do after the given 1-based attempt failed with error."""
+        kind = classify_error(error)
+        if kind == "fatal":
+            return RetryDecision(False, 0.0, f"fatal error (HTTP {error_status(error)})")
+        if attempt >= self.max_attempts:
+            return RetryDecision(False, 0.0, "attempts exhausted")
+        delay = self.backoff(attempt)
+        if kind == "rate_limited":
+            hint = retry_after_seconds(error)
+            if hint is not None:
+                if hint > self.max_delay:
+                    return RetryDecision(False, 0.0, f"Retry-After {hint:g}s exceeds max delay")
+                delay = max(delay, hint)
+        return RetryDecision(True, delay, kind)
+
+
+class CircuitBreaker:
+    """
+    Process-wide breaker shared by every focus area and refresh.
+
+    After failure_threshold consecutive transient failures the breaker opens
+    and calls fail fast for reset_seconds. Then one probe call is let
+    through (half-open): success closes the breaker, failure reopens it,
+    and a cancelled probe must be handed back with release_probe().
+    Rate limits and fatal errors say nothing about upstream health and do
+    not count. Thread-safe; used from the event loop and the threadpool.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at: Optional[float] = None
+            self._probing = False
+            self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Return whether a call may go out now; claims the probe when half-open."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release_probe(self) -> None:
+        """Give back a probe whose call ended without an outcome, e.g. when cancelled."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("LLM circuit closed after a successful probe")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self, error: BaseException) -> None:
+        if classify_error(error) != "transient":
+            with self._lock:
+                self._probing = False
+            return
+        with self._lock:
+            self._failures += 1
+            if self._probing or (
+                self._opened_at is None and self._failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    f"LLM circuit opened after {self._failures} consecutive failures: {error}"
+                )
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def snapshot(self) -> dict:
+        """Return state, consecutive failures and rejected calls for health output."""
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self._failures,
+                "rejected_calls": self.rejected,
+            }
+
+
+async def hedged(call: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+    """
+    Await call(), starting a second identical call if the first is slow.
+
+    The first successful result wins and the other call is cancelled; if
+    both fail the last error is raised. A hedge costs a duplicate request,
+    so hedge_after should sit near the normal p95 latency.
+    """
+    first = asyncio.ensure_future(call())
+    pending = {first}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return first.result()
+        logger.debug(f"Hedging LLM call after {hedge_after:.2f}s")
+        pending.add(asyncio.ensure_future(call()))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+retry_policy = RetryPolicy()
+llm_circuit_breaker = CircuitBreaker()
@@ -0,0 +1,92 @@
+"""Registry of canonical tool names shared across radars."""
+
+import re
+import unicodedata
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Tool, Trend
+
+# Separators that don't distinguish tools: "Lang Graph", "lang-graph", "lang_graph"
+_SEPARATORS = re.compile(r"[\s\-_.]+")
+
+
+def canonical_tool_name(name: str) -> str:
+    """
+    Return the registry key for a tool name.
+
+    Names are NFKC-normalized, case-folded and stripped of whitespace,
+    hyphens, underscores and dots, so "LangGraph" and "lang-graph" share a
+    key. Characters such as "+" and "#" are kept.
+    """
+    return _SEPARATORS.sub("", unicodedata.normalize("NFKC", name).casefold())
+
+
+def resolve_tool_ids(db: Session, radar_date: str, names: list[str]) -> list[Optional[int]]:
+    """
+    Return tool ids for names, registering unseen tools.
+
+    Looks up all canonical names in one query, inserts the missing ones and
+    widens first_seen/last_seen to include radar_date. Names made only of
+    separators have no canonical name and get None rather than sharing one
+    tool. Flushes but does not commit.
+    """
+    canonical = [canonical_tool_name(name) for name in names]
+    tools = {
+        tool.canonical_name: tool
+        for tool in db.query(Tool).filter(Tool.canonical_name.in_(set(canonical) - {""}))
+    }
+
+    for name, key in zip(names, canonical):
+        if not key:
+            continue
+        tool = tools.get(key)
+        if tool is None:
+            tool = Tool(
+                canonical_name=key, display_name=name, first_seen=radar_date, last_seen=radar_date
+            )
+            db.add(tool)
+            tools[key] = tool
+        else:
+            tool.first_seen = min(tool.first_seen, radar_date)
+            tool.last_seen = max(tool.last_seen, radar_date)
+
+    db.flush()
+    return [tools[key].id if key else None for key in canonical]
+
+
+def get_tool_timeline(db: Session, name: str) -> Optional[dict]:
+    """
+    Return every classification of a tool across radars, oldest first.
+
+    The tool is found through the unique canonical_name index and its trends
+    through the (tool_id, radar_date) index, so the cost does not grow with
+    the size of the trends table. Returns None for unknown tools.
+    """
+    tool = db.execute(
+        select(Tool).where(Tool.canonical_name == canonical_tool_name(name))
+    ).scalar_one_or_none()
+    if tool is None:
+        return None
+
+    rows = db.execute(
+        select(
+            Trend.radar_date,
+            Trend.focus_area,
+            Trend.tool_name,
+            Trend.classification,
+            Trend.confidence_score,
+            Trend.architectural_verdict,
+        )
+        .where(Trend.tool_id == tool.id)
+        .order_by(Trend.radar_date)
+    )
+    return {
+        "tool_name": tool.display_name,
+        "canonical_name": tool.canonical_name,
+        "first_seen": tool.first_seen,
+        "last_seen": tool.last_seen,
+        "timeline": [row._asdict() for row in rows],
+    }
@@ -0,0 +1,101 @@
+"""Full-text search over stored trends through the trends_fts index."""
+
+import html
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_TOKENS = 12
+
+# FTS5 marks hits with these; the stored text is escaped before they become tags
+_HIT_START = "\x02"
+_HIT_END = "\x03"
+
+# Column weights for bm25: tool_name, technical_insight, signal_evidence, noise_indicators
+_BM25_WEIGHTS = "4.0, 2.0, 1.0, 1.0"
+
+_TERM = re.compile(r'"[^"]*"|\S+')
+
+
+def build_match_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every term becomes a quoted phrase so punctuation such as "cold-start"
+    or "C++" can't be read as query syntax; a trailing * keeps its prefix
+    meaning and "quoted phrases" stay phrases. Terms are ANDed.
+    """
+    phrases = []
+    for term in _TERM.findall(q):
+        prefix = term.endswith("*") and not term.startswith('"')
+        body = term.strip('"').rstrip("*") if prefix else term.strip('"')
+        if not body.strip():
+            continue
+        phrases.append('"' + body.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(phrases)
+
+
+def highlight_snippet(snippet: str) -> str:
+    """HTML-escape a raw FTS5 snippet and turn its hit markers into <mark> tags."""
+    return html.escape(snippet).replace(_HIT_START, SNIPPET_START).replace(_HIT_END, SNIPPET_END)
+
+
+def search_trends(
+    db: Session,
+    q: str,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    focus_area: Optional[str] = None,
+    classification: Optional[str] = None,
+    limit: int = 20,
+) -> list[dict]:
+    """
+    Return trends matching q, best bm25 rank first.
+
+    Each result carries an HTML-escaped snippet of the best matching column
+    with hits wrapped in <mark> tags. Date, focus area and classification filters
+    apply to the joined trends row.
+    """
+    match = build_match_query(q)
+    if not match:
+        return []
+
+    filters = []
+    params = {"match": match, "limit": limit, "hit_start": _HIT_START, "hit_end": _HIT_END}
+    if from_date:
+        filters.append("t.radar_date >= :from_date")
+        params["from_date"] = from_date
+    if to_date:
+        filters.append("t.radar_date <= :to_date")
+        params["to_date"] = to_date
+    if focus_area:
+        filters.append("t.focus_area = :focus_area")
+        params["focus_area"] = focus_area
+    if classification:
+        filters.append("t.classification = :classification")
+        params["classification"] = classification
+
+    statement = text(
+        f"""
+        SELECT t.radar_date, t.focus_area, t.tool_name, t.classification, t.confidence_score,
+               snippet(trends_fts, -1, :hit_start, :hit_end, '…', {SNIPPET_TOKENS})
+                   AS snippet,
+               bm25(trends_fts, {_BM25_WEIGHTS}) AS rank
+        FROM trends_fts
+        JOIN trends AS t ON t.id = trends_fts.rowid
+        WHERE trends_fts MATCH :match
+        {"".join(" AND " + condition for condition in filters)}
+        ORDER BY rank
+        LIMIT :limit
+        """
+    )
+    results = []
+    for row in db.execute(statement, params):
+        result = row._asdict()
+        result["snippet"] = highlight_snippet(result["snippet"] or "")
+        results.append(result)
+    return results
@@ -0,0 +1,65 @@
+"""
+Load test GET /api/radar in sync (threadpool) and async (aiosqlite) DB modes.
+
+Starts uvicorn once per mode against the same synthetic radar.db and
+reports requests per second and tail latency. The response cache is
+disabled so every request reaches the database.
+
+Usage (from backend/):
+    python -m benchmarks.bench_db_modes --requests 3000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import free_port, hammer, seed_database, start_server
+
+BACKEND_DIR = str(Path(__file__).resolve().parent.parent)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--trends", type=int, default=30, help="trends per radar")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "radar.db"
+        radar_dates = seed_database(path, args.weeks, args.trends)
+
+        def mixed(i: int):
+            # Mix latest and by-date reads
+            return None if i % 2 == 0 else {"date_param": random.choice(radar_dates)}
+
+        for mode in ("sync", "async"):
+            port = free_port()
+            env = {
+                **os.environ,
+                "RADAR_DATABASE_URL": f"sqlite:///{path}",
+                "RADAR_DB_MODE": mode,
+                "RADAR_CACHE_TTL_SECONDS": "0",
+            }
+            base_url = f"http://127.0.0.1:{port}"
+            server = start_server(env, port, BACKEND_DIR)
+            try:
+                asyncio.run(hammer(base_url, "/api/radar", 200, 8, mixed))  # warm-up
+                results[mode] = asyncio.run(
+                    hammer(base_url, "/api/radar", args.requests, args.concurrency, mixed)
+                )
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(json.dumps({"requests": args.requests, "concurrency": args.concurrency, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare the row-by-row radar read path with stored snapshot bytes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_radar_snapshot --trends 300 --iterations 500
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.radar import RadarResponse, TrendResponse
+from app.models import Trend
+from app.services.radar_store import get_radar_snapshot
+
+from benchmarks.common import seed_database, summarize
+
+
+def row_path(db) -> bytes:
+    """The pre-snapshot read path: ordered lookup, ORM rows, Pydantic, JSON encode."""
+    latest = db.query(Trend.radar_date).order_by(Trend.radar_date.desc()).first()
+    query_date = latest[0]
+    trends = db.query(Trend).filter(Trend.radar_date == query_date).all()
+    response = RadarResponse(
+        radar_date=query_date,
+        trends=[
+            TrendResponse(
+                focus_area=t.focus_area,
+                tool_name=t.tool_name,
+                classification=t.classification,
+                confidence_score=t.confidence_score,
+                technical_insight=t.technical_insight,
+                signal_evidence=json.loads(t.signal_evidence) if t.signal_evidence else [],
+                noise_indicators=json.loads(t.noise_indicators) if t.noise_indicators else [],
+                architectural_verdict=t.architectural_verdict,
+                timestamp=t.timestamp,
+            )
+            for t in trends
+        ],
+    )
+    # FastAPI re-validates through response_model and JSON-encodes the result
+    validated = RadarResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def snapshot_path(db) -> bytes:
+    """The snapshot read path: one indexed row read returning stored bytes."""
+    return get_radar_snapshot(db)
+
+
+def measure(session_factory, fn, iterations: int) -> dict:
+    """Time fn with a fresh session per call, as get_db provides per request."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        with session_factory() as db:
+            fn(db)
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trends", type=int, default=300, help="trends in the latest radar")
+    parser.add_argument("--weeks", type=int, default=12, help="older radars stored alongside")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        seed_database(path, args.weeks + 1, args.trends)
+        engine = create_engine(f"sqlite:///{path}")
+        session_factory = sessionmaker(bind=engine)
+
+        with session_factory() as db:
+            rows, snapshot = json.loads(row_path(db)), json.loads(snapshot_path(db))
+            # Row order follows the composite index; compare content, not order
+            assert rows["radar_date"] == snapshot["radar_date"]
+            assert sorted(rows["trends"], key=lambda t: t["tool_name"]) == sorted(
+                snapshot["trends"], key=lambda t: t["tool_name"]
+            )
+
+        rows = measure(session_factory, row_path, args.iterations)
+        snapshot = measure(session_factory, snapshot_path, args.iterations)
+        engine.dispose()
+
+    print(
+        json.dumps(
+            {
+                "trends": args.trends,
+                "iterations": args.iterations,
+                "row_path": rows,
+                "snapshot_path": snapshot,
+                "p95_speedup": round(rows["p95_ms"] / snapshot["p95_ms"], 1),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Measure the refresh analysis step against the bundled LLM stub.
+
+Serves app.llm_stub in-process with the given latency and fault settings,
+points grok_service at it and runs run_full_analysis_async repeatedly.
+Reports wall time per refresh, trends parsed, LLM call outcomes and
+connection reuse of the pooled LLM client, so concurrency, retry, parsing
+and pooling changes can be compared without an xAI key. --keepalive 0
+approximates unpooled calls: every request opens a new connection.
+--batched sends one structured-output request for all focus areas;
+--compare runs per-area and batched mode back to back and reports the
+refresh latency and prompt/completion tokens of each. LiteLLM is imported
+and each mode gets --warmup-runs untimed refreshes before timing starts. With --truncate-rate,
+failed_area_rate and tokens show what salvaging partial responses saves;
+--no-follow-up keeps the salvaged trends without re-requesting lost ones.
+
+Usage (from backend/):
+    python -m benchmarks.bench_refresh --runs 10 --latency-ms 800 \\
+        --latency-dist lognormal --error-rate-429 0.1 --truncate-rate 0.05 --streaming
+    python -m benchmarks.bench_refresh --runs 10 --latency-ms 800 --compare
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+
+import uvicorn
+
+from app.lazy_imports import litellm
+from app.llm_stub import StubConfig, create_app
+from app.services import grok_service, llm_http as llm_http_module
+from app.services.llm_cache import llm_cache
+from app.services.llm_http import llm_http
+from app.services.llm_telemetry import llm_telemetry
+
+from benchmarks.common import free_port, summarize
+
+
+def serve_stub(app) -> tuple[uvicorn.Server, threading.Thread, str]:
+    """Run the stub app on a free port in a background thread."""
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("LLM stub did not start within 10s")
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+async def run_refreshes(
+    runs: int,
+    concurrency: int,
+    streaming: bool,
+    warmup: int,
+    batched: bool = False,
+    warmup_runs: int = 0,
+    stub=None,
+) -> dict:
+    samples = []
+    trends = []
+    empty_areas = Counter()
+
+    async def refresh(on_progress=None) -> dict:
+        return await grok_service.run_full_analysis_async(
+            max_concurrency=concurrency,
+            on_progress=on_progress,
+            use_cache=False,
+            streaming=streaming,
+            batched=batched,
+        )
+
+    async def on_progress(focus_area: str, update: dict) -> None:
+        # An area counts as failed when it ends with no trends at all
+        if update["status"] != "running" and not update.get("trends_count"):
+            empty_areas[update["status"]] += 1
+
+    llm_http.open()
+    try:
+        await llm_http.warm_up(grok_service.LITELLM_BASE_URL, warmup)
+        # Untimed refreshes so the first timed one doesn't pay for first-use setup
+        for _ in range(warmup_runs):
+            await refresh()
+        llm_telemetry.discard()
+        if stub is not None:
+            stub.reset()
+        llm_http.stats.reset()
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = await refresh(on_progress)
+            samples.append((time.perf_counter() - start) * 1000)
+            trends.append(len(result["trends"]))
+    finally:
+        await llm_http.close()
+    return {
+        "refresh": summarize(samples),
+        "trends_per_refresh": {"min": min(trends), "max": max(trends), "total": sum(trends)},
+        "failed_area_rate": round(
+            sum(empty_areas.values()) / (runs * len(grok_service.FOCUS_AREAS)), 3
+        ),
+    }
+
+
+def measure_mode(args, stub, batched: bool) -> dict:
+    """Run the refreshes in one mode and collect its LLM call and token totals."""
+    results = asyncio.run(
+        run_refreshes(
+            args.runs,
+            args.concurrency,
+            args.streaming,
+            args.warmup,
+            batched,
+            warmup_runs=args.warmup_runs,
+            stub=stub,
+        )
+    )
+    calls = llm_telemetry.pending()
+    prompt_tokens = sum(call["prompt_tokens"] or 0 for call in calls)
+    completion_tokens = sum(call["completion_tokens"] or 0 for call in calls)
+    return {
+        **results,
+        "llm_calls": dict(Counter(call["outcome"] for call in calls)),
+        "llm_latency": summarize([call["latency_ms"] for call in calls]) if calls else None,
+        "tokens": {
+            "prompt": prompt_tokens,
+            "completion": completion_tokens,
+            "prompt_per_refresh": round(prompt_tokens / args.runs, 1),
+            "completion_per_refresh": round(completion_tokens / args.runs, 1),
+        },
+        "llm_http": llm_http.stats.snapshot(),
+        "stub_responses": dict(stub.stats),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=grok_service.ANALYSIS_CONCURRENCY)
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument(
+        "--keepalive",
+        type=int,
+        default=llm_http_module.LLM_HTTP_MAX_KEEPALIVE,
+        help="pooled keep-alive connections; 0 opens a connection per call",
+    )
+    parser.add_argument("--warmup", type=int, default=0, help="connections opened before timing")
+    parser.add_argument(
+        "--warmup-runs", type=int, default=1, help="untimed refreshes per mode before timing"
+    )
+    parser.add_argument("--batched", action="store_true", help="one request for all focus areas")
+    parser.add_argument("--compare", action="store_true", help="run per-area and batched modes")
+    parser.add_argument(
+        "--no-follow-up",
+        action="store_true",
+        help="do not re-request tools lost to truncated or malformed responses",
+    )
+    for name, field in StubConfig.model_fields.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, help=field.description)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        **{
+            name: getattr(args, name)
+            for name in StubConfig.model_fields
+            if getattr(args, name) is not None
+        }
+    )
+    llm_http_module.LLM_HTTP_MAX_KEEPALIVE = args.keepalive
+    grok_service.LLM_SALVAGE_FOLLOW_UP = not args.no_follow_up
+    llm_cache.enabled = False
+    llm_telemetry.discard()
+    # Pay the LiteLLM import before timing, not in the first mode's first refresh
+    litellm.load()
+    stub_app = create_app(config)
+    server, thread, base_url = serve_stub(stub_app)
+    grok_service.LITELLM_BASE_URL = base_url
+    stub = stub_app.state.stub
+    try:
+        if args.compare:
+            modes = {
+                "per_area": measure_mode(args, stub, batched=False),
+                "batched": measure_mode(args, stub, batched=True),
+            }
+        else:
+            results = measure_mode(args, stub, batched=args.batched)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    report = {
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "streaming": args.streaming,
+        "keepalive": args.keepalive,
+        "warmup": args.warmup,
+        "follow_up": not args.no_follow_up,
+        "stub": config.model_dump(),
+    }
+    if args.compare:
+        per_area, batched = modes["per_area"], modes["batched"]
+        report["modes"] = modes
+        report["batched_vs_per_area"] = {
+            "refresh_p50_ratio": round(
+                batched["refresh"]["p50_ms"] / per_area["refresh"]["p50_ms"], 3
+            ),
+            "prompt_tokens_ratio": round(
+                batched["tokens"]["prompt"] / max(1, per_area["tokens"]["prompt"]), 3
+            ),
+            "completion_tokens_ratio": round(
+                batched["tokens"]["completion"] / max(1, per_area["tokens"]["completion"]), 3
+            ),
+        }
+    else:
+        report.update(batched=args.batched, **results)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
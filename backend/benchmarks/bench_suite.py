@@ -0,0 +1,242 @@
+"""
+Benchmark the radar read and refresh paths at a configurable data size.
+
+Seeds a synthetic radar.db (weeks x areas x trends per area), then measures:
+  read_latest / read_by_date  GET /api/radar throughput and p50/p95/p99 under uvicorn
+  persist                     save_radar time for one refresh's trends
+  read_during_refresh         GET /api/radar latency while refreshes hold the write lock
+
+The response cache is disabled so every read reaches the database. Results
+are written as JSON; pass --baseline with an earlier results file to get
+per-metric changes and a list of regressions.
+
+Usage (from backend/):
+    python -m benchmarks.bench_suite --weeks 52 --areas 3 --trends-per-area 30 \\
+        --output results.json --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import configure_sqlite
+from app.services.radar_store import save_radar
+
+from benchmarks.common import (
+    compare_to_baseline,
+    focus_areas,
+    free_port,
+    hammer,
+    make_trends,
+    seed_database,
+    start_server,
+    summarize,
+)
+
+BACKEND_DIR = str(Path(__file__).resolve().parent.parent)
+
+
+def _writer(path: Path):
+    """Session factory configured like the app's serialized writer engine."""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    configure_sqlite(engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _future_dates(start: int = 1):
+    """Radar dates after the seeded ones, so each refresh writes a new radar."""
+    day = start
+    while True:
+        yield (date.today() + timedelta(days=day)).isoformat()
+        day += 1
+
+
+def bench_persist(path: Path, runs: int, trends_per_radar: int, areas: tuple) -> dict:
+    """Time save_radar for runs refreshes on a copy of the seeded database."""
+    copy = path.with_name("persist.db")
+    shutil.copy(path, copy)
+    engine, session_factory = _writer(copy)
+    samples = []
+    dates = _future_dates()
+    for _ in range(runs):
+        radar_date = next(dates)
+        trends = make_trends(trends_per_radar, radar_date, areas)
+        start = time.perf_counter()
+        with session_factory() as db:
+            save_radar(db, radar_date, trends)
+        samples.append((time.perf_counter() - start) * 1000)
+    engine.dispose()
+    return summarize(samples)
+
+
+def bench_reads(base_url: str, radar_dates: list[str], requests: int, concurrency: int) -> dict:
+    """Throughput and latency of latest and by-date radar reads."""
+    by_date = lambda i: {"date_param": random.choice(radar_dates)}  # noqa: E731
+    asyncio.run(hammer(base_url, "/api/radar", 200, 8))  # warm-up
+    return {
+        "read_latest": asyncio.run(hammer(base_url, "/api/radar", requests, concurrency)),
+        "read_by_date": asyncio.run(
+            hammer(base_url, "/api/radar", requests, concurrency, by_date)
+        ),
+    }
+
+
+def bench_read_during_refresh(
+    base_url: str,
+    path: Path,
+    requests: int,
+    concurrency: int,
+    trends_per_radar: int,
+    areas: tuple,
+) -> dict:
+    """
+    Read latency while another connection keeps persisting refreshes.
+
+    A writer thread runs save_radar back to back, so the write lock is held
+    for most of the read run; reads should only slow down, never fail. A
+    writer failure stops the writer and is reported as writer_errors.
+    """
+    engine, session_factory = _writer(path)
+    stop = threading.Event()
+    persisted = []
+    writer_errors = []
+
+    def refresh_loop():
+        for radar_date in _future_dates(start=1000):
+            if stop.is_set():
+                break
+            trends = make_trends(trends_per_radar, radar_date, areas)
+            start = time.perf_counter()
+            try:
+                with session_factory() as db:
+                    save_radar(db, radar_date, trends)
+            except Exception as e:
+                writer_errors.append(f"{type(e).__name__}: {e}")
+                print(f"warning: refresh writer failed: {e}", file=sys.stderr)
+                break
+            persisted.append((time.perf_counter() - start) * 1000)
+
+    writer = threading.Thread(target=refresh_loop, daemon=True)
+    writer.start()
+    try:
+        reads = asyncio.run(hammer(base_url, "/api/radar", requests, concurrency))
+    finally:
+        stop.set()
+        writer.join()
+        engine.dispose()
+    return {
+        **reads,
+        "refreshes": len(persisted),
+        # No refresh finished while the reads ran, e.g. when the writer failed
+        "persist_p50_ms": summarize(persisted)["p50_ms"] if persisted else None,
+        "writer_errors": len(writer_errors),
+        "writer_error": writer_errors[0] if writer_errors else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=52, help="weekly radars to seed")
+    parser.add_argument("--areas", type=int, default=3, help="focus areas per radar")
+    parser.add_argument("--trends-per-area", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per read scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--persist-runs", type=int, default=20)
+    parser.add_argument("--db-mode", choices=("sync", "async"), default="sync")
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10, help="allowed fractional slowdown vs baseline"
+    )
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="exit 1 when a metric regressed"
+    )
+    args = parser.parse_args()
+
+    areas = focus_areas(args.areas)
+    trends_per_radar = args.areas * args.trends_per_area
+    config = {
+        "weeks": args.weeks,
+        "areas": args.areas,
+        "trends_per_area": args.trends_per_area,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "persist_runs": args.persist_runs,
+        "db_mode": args.db_mode,
+    }
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "radar.db"
+        start = time.perf_counter()
+        radar_dates = seed_database(path, args.weeks, trends_per_radar, areas)
+        seed_seconds = round(time.perf_counter() - start, 2)
+
+        results["persist"] = bench_persist(path, args.persist_runs, trends_per_radar, areas)
+
+        port = free_port()
+        env = {
+            **os.environ,
+            "RADAR_DATABASE_URL": f"sqlite:///{path}",
+            "RADAR_DB_MODE": args.db_mode,
+            "RADAR_CACHE_TTL_SECONDS": "0",
+        }
+        server = start_server(env, port, BACKEND_DIR)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            results.update(bench_reads(base_url, radar_dates, args.requests, args.concurrency))
+            results["read_during_refresh"] = bench_read_during_refresh(
+                base_url, path, args.requests, args.concurrency, trends_per_radar, areas
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": config,
+        "seed_seconds": seed_seconds,
+        "results": results,
+    }
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("config") != config:
+            print("warning: baseline was run with a different config", file=sys.stderr)
+        report["comparison"] = compare_to_baseline(
+            results, baseline.get("results", {}), args.tolerance
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    regressions = report.get("comparison", {}).get("regressions", [])
+    if regressions:
+        print(f"regressed: {', '.join(regressions)}", file=sys.stderr)
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
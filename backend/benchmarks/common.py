@@ -0,0 +1,171 @@
+"""Shared helpers for the benchmark scripts."""
+
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.migrations import migrate
+from app.models import Base
+from app.services.radar_store import save_radar
+
+FOCUS_AREAS = ("voice_ai_ux", "agent_orchestration", "durable_runtime")
+
+
+def focus_areas(count: int) -> tuple[str, ...]:
+    """Return count focus area names, the real ones first."""
+    return FOCUS_AREAS[:count] + tuple(f"area_{i}" for i in range(len(FOCUS_AREAS), count))
+
+
+def make_trends(count: int, radar_date: str, areas: tuple[str, ...] = FOCUS_AREAS) -> list[dict]:
+    """Build synthetic trends shaped like Grok output, spread over areas."""
+    return [
+        {
+            "focus_area": areas[i % len(areas)],
+            "tool_name": f"Tool {i}",
+            "classification": "signal" if i % 2 else "noise",
+            "confidence_score": 1 + i % 100,
+            "technical_insight": "Streaming architecture with published p95 latency numbers. " * 4,
+            "signal_evidence": ["Published benchmarks", "Production case studies", "GitHub activity"],
+            "noise_indicators": ["Marketing language"] if i % 2 == 0 else [],
+            "architectural_verdict": bool(i % 2),
+            "timestamp": f"{radar_date}T08:00:00+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def seed_database(
+    path, weeks: int, trends_per_radar: int, areas: tuple[str, ...] = FOCUS_AREAS
+) -> list[str]:
+    """Create a radar.db at path with one radar per week; returns the radar dates."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    radar_dates = [
+        (date.today() - timedelta(weeks=week)).isoformat() for week in range(weeks - 1, -1, -1)
+    ]
+    with session_factory() as db:
+        for radar_date in radar_dates:
+            save_radar(db, radar_date, make_trends(trends_per_radar, radar_date, areas))
+    engine.dispose()
+    return radar_dates
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    """Summarize latency samples in milliseconds."""
+    samples = sorted(samples_ms)
+
+    def pct(p: float) -> float:
+        return round(samples[min(len(samples) - 1, int(len(samples) * p))], 3)
+
+    return {
+        "count": len(samples),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+async def hammer(
+    base_url: str,
+    path: str,
+    total: int,
+    concurrency: int,
+    params_for: Callable[[int], Optional[dict]] = lambda i: None,
+) -> dict:
+    """Issue total GETs with at most concurrency in flight; return throughput and latency."""
+    samples = []
+    errors = 0
+    queue = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker():
+            nonlocal errors
+            for i in queue:
+                start = time.perf_counter()
+                response = await client.get(path, params=params_for(i))
+                samples.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {"rps": round(total / elapsed, 1), "errors": errors, **summarize(samples)}
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = 0.10) -> dict:
+    """
+    Compare numeric benchmark results with a baseline run of the same suite.
+
+    Walks both dicts in parallel; *_ms values regress when they grow and
+    rps when it drops by more than tolerance (a fraction), and any new
+    request or writer errors count as a regression; missing (None) values
+    are skipped. Returns
+    {"changes": {dotted.key: {...}}, "regressions": [dotted.key, ...]}.
+    """
+    changes = {}
+    regressions = []
+
+    def walk(current: dict, previous: dict, prefix: str) -> None:
+        for key, value in current.items():
+            name = f"{prefix}{key}"
+            old = previous.get(key) if isinstance(previous, dict) else None
+            if isinstance(value, dict):
+                walk(value, old or {}, f"{name}.")
+                continue
+            if key.endswith("errors") and value > (old or 0):
+                regressions.append(name)
+                continue
+            lower_is_better = key.endswith("_ms")
+            if value is None or isinstance(value, bool) or not old:
+                continue
+            if not (lower_is_better or key == "rps"):
+                continue
+            change = (value - old) / old
+            changes[name] = {"baseline": old, "current": value, "change_pct": round(change * 100, 1)}
+            if (change > tolerance) if lower_is_better else (change < -tolerance):
+                regressions.append(name)
+
+    walk(results, baseline, "")
+    return {"changes": changes, "regressions": regressions}
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env: dict, port: int, cwd: str) -> subprocess.Popen:
+    """Start uvicorn serving app.main:app and wait until it answers."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=cwd,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 30s")
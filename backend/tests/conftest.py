@@ -0,0 +1,105 @@
+"""Shared pytest fixtures."""
+
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import get_db
+from app.llm_stub import StubConfig, create_app
+from app.main import app
+from app.models import Base
+from app.services.llm_cache import llm_cache
+from app.services.llm_telemetry import llm_telemetry
+from app.services.radar_cache import radar_cache
+from app.services.retry_policy import llm_circuit_breaker
+
+
+@pytest.fixture(autouse=True)
+def disable_llm_cache(monkeypatch):
+    """Keep cached completions from leaking between tests."""
+    monkeypatch.setattr(llm_cache, "enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def discard_llm_telemetry():
+    """Start every test with an empty LLM call buffer."""
+    llm_telemetry.discard()
+    yield
+    llm_telemetry.discard()
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_circuit_breaker():
+    """Keep failures in one test from opening the breaker for the next."""
+    llm_circuit_breaker.reset()
+    yield
+    llm_circuit_breaker.reset()
+
+
+def make_trend(
+    tool_name: str, focus_area: str = "voice_ai_ux", classification: str = "signal", **fields
+) -> dict:
+    """A valid analyzed trend for save_radar; keyword arguments override its fields."""
+    trend = {
+        "focus_area": focus_area,
+        "tool_name": tool_name,
+        "classification": classification,
+        "confidence_score": 80,
+        "technical_insight": "Insight",
+        "signal_evidence": [],
+        "noise_indicators": [],
+        "architectural_verdict": classification == "signal",
+        "timestamp": "2026-02-01T12:00:00Z",
+    }
+    trend.update(fields)
+    return trend
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory database wired into the app's read dependency."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    radar_cache.invalidate()
+    yield Session
+    radar_cache.invalidate()
+    if previous is not None:
+        app.dependency_overrides[get_db] = previous
+    else:
+        app.dependency_overrides.pop(get_db, None)
+    engine.dispose()
+
+
+@pytest.fixture
+def stub_url():
+    """A stub served by uvicorn on a free port, for calls through LiteLLM."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(StubConfig(stream_chunk_chars=16)), port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
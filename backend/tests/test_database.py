@@ -0,0 +1,57 @@
+"""Tests for the SQLite concurrency profile."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.database import SQLITE_BUSY_TIMEOUT_MS, configure_sqlite
+
+
+def test_writer_enables_wal_profile(tmp_path):
+    """Test writer connections get WAL journaling and tuned pragmas."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'radar.db'}")
+    configure_sqlite(engine)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == SQLITE_BUSY_TIMEOUT_MS
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 0
+
+
+def test_reader_is_read_only(tmp_path):
+    """Test reader connections refuse writes but see committed data."""
+    url = f"sqlite:///{tmp_path / 'radar.db'}"
+    writer = create_engine(url)
+    configure_sqlite(writer)
+    reader = create_engine(url)
+    configure_sqlite(reader, read_only=True)
+
+    with writer.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("SELECT x FROM t").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("INSERT INTO t VALUES (2)")
+
+
+def test_reader_not_blocked_by_open_write_transaction(tmp_path):
+    """Test WAL readers proceed while a refresh holds the write lock."""
+    url = f"sqlite:///{tmp_path / 'radar.db'}"
+    writer = create_engine(url)
+    configure_sqlite(writer)
+    reader = create_engine(url)
+    configure_sqlite(reader, read_only=True)
+
+    with writer.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+
+    with writer.connect() as write_conn:
+        write_conn.exec_driver_sql("BEGIN IMMEDIATE")
+        write_conn.exec_driver_sql("DELETE FROM t")
+        with reader.connect() as read_conn:
+            assert read_conn.exec_driver_sql("SELECT COUNT(*) FROM t").scalar() == 1
+        write_conn.exec_driver_sql("ROLLBACK")
@@ -0,0 +1,109 @@
+"""Tests for evidence rows derived from trends and the evidence endpoints."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.models import Trend, TrendEvidence
+from app.services.evidence import find_trends_by_evidence
+from app.services.radar_store import save_radar
+from tests.conftest import make_trend
+
+
+def _seed(Session):
+    with Session() as db:
+        save_radar(
+            db,
+            "2026-01-30",
+            [
+                make_trend("Temporal", signal_evidence=["Published benchmarks", "Open source"]),
+                make_trend(
+                    "Vapor",
+                    classification="noise",
+                    noise_indicators=["No benchmarks", "Waitlist only"],
+                ),
+            ],
+        )
+        save_radar(
+            db,
+            "2026-02-06",
+            [
+                make_trend("Temporal", signal_evidence=["Published benchmarks"]),
+                make_trend("Restate", signal_evidence=["Published Benchmarks v2"]),
+            ],
+        )
+
+
+def test_evidence_rows_follow_trend_writes(session_factory):
+    """Test evidence rows are created, replaced and removed with their trends."""
+    _seed(session_factory)
+
+    with session_factory() as db:
+        rows = db.query(TrendEvidence.kind, TrendEvidence.position, TrendEvidence.text).all()
+        assert len(rows) == 6
+        assert ("noise", 1, "Waitlist only") in rows
+
+        save_radar(db, "2026-01-30", [])
+        assert db.query(TrendEvidence).count() == 2
+
+        trend = db.query(Trend).filter(Trend.tool_name == "Restate").one()
+        trend.signal_evidence = '["Rewritten"]'
+        db.commit()
+        texts = {e.text for e in db.query(TrendEvidence).filter_by(trend_id=trend.id)}
+        assert texts == {"Rewritten"}
+
+
+def test_find_signals_citing_benchmarks(session_factory):
+    """Test evidence text search runs in SQL with kind and date filters."""
+    _seed(session_factory)
+    client = TestClient(app)
+
+    response = client.get("/api/evidence?contains=benchmarks&kind=signal&classification=signal")
+
+    assert response.status_code == 200
+    assert [(m["radar_date"], m["tool_name"], m["evidence"]) for m in response.json()] == [
+        ("2026-02-06", "Temporal", "Published benchmarks"),
+        ("2026-02-06", "Restate", "Published Benchmarks v2"),
+        ("2026-01-30", "Temporal", "Published benchmarks"),
+    ]
+
+    response = client.get("/api/evidence?contains=benchmarks&from=2026-01-01&to=2026-01-31")
+    assert {m["tool_name"] for m in response.json()} == {"Temporal", "Vapor"}
+
+
+def test_evidence_search_driven_by_fts(session_factory):
+    """Test a contains lookup starts from the full-text index, not an evidence scan."""
+    _seed(session_factory)
+    statements = []
+
+    with session_factory() as db:
+        engine = db.get_bind()
+
+        def record(conn, cursor, sql, params, context, executemany):
+            statements.append((sql, params))
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            matches = find_trends_by_evidence(db, "bench", kind="signal")
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        sql, params = statements[-1]
+        plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+
+    assert {m["tool_name"] for m in matches} == {"Temporal", "Restate"}
+    details = [row[-1] for row in plan]
+    assert any("trends_fts VIRTUAL TABLE" in detail for detail in details)
+    assert not any(detail in ("SCAN trends", "SCAN trend_evidence") for detail in details)
+    assert "ix_trend_evidence_kind_text" not in " ".join(details)
+
+
+def test_top_evidence(session_factory):
+    """Test citation counts aggregate across radars."""
+    _seed(session_factory)
+
+    response = TestClient(app).get("/api/evidence/top?kind=signal&limit=2")
+
+    assert response.json() == [
+        {"evidence": "Published benchmarks", "kind": "signal", "citations": 2, "tools": 1},
+        {"evidence": "Open source", "kind": "signal", "citations": 1, "tools": 1},
+    ]
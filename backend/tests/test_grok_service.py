@@ -1,18 +1,46 @@
 """Tests for Grok service."""
 
+import asyncio
+import json
+import time
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
+from app.services import grok_service
 from app.services.grok_service import (
     analyze_focus_area,
+    analyze_focus_area_async,
     run_full_analysis,
+    run_full_analysis_async,
     check_api_connection,
     validate_trend,
     call_grok_with_retry,
+    call_grok_with_retry_async,
+    stream_focus_area_async,
+    build_discovery_prompt,
+    build_batch_prompt,
+    parse_trends,
+    split_batch_response,
+    CLASSIFICATION_CRITERIA,
     FOCUS_AREAS,
 )
 
 
+def _stream_of(*pieces, error=None):
+    """Build an async iterator of streamed completion chunks."""
+
+    async def stream():
+        for piece in pieces:
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = piece
+            yield chunk
+        if error is not None:
+            raise error
+
+    return stream()
+
+
 class TestFocusAreas:
     """Test focus area configuration."""
 
@@ -36,7 +64,7 @@ class TestAnalyzeFocusArea:
         with pytest.raises(ValueError, match="Unknown focus area"):
             analyze_focus_area("invalid_area")
 
-    @patch("app.services.grok_service.litellm.completion")
+    @patch("app.services.grok_service.litellm.acompletion")
     def test_successful_analysis(self, mock_completion):
         """Test successful API response parsing."""
         mock_response = MagicMock()
@@ -61,7 +89,7 @@ class TestAnalyzeFocusArea:
         assert result[0]["focus_area"] == "voice_ai_ux"
         assert "timestamp" in result[0]
 
-    @patch("app.services.grok_service.litellm.completion")
+    @patch("app.services.grok_service.litellm.acompletion")
     def test_json_extraction_from_text(self, mock_completion):
         """Test JSON extraction when response has surrounding text."""
         mock_response = MagicMock()
@@ -76,7 +104,7 @@ class TestAnalyzeFocusArea:
         assert len(result) == 1
         assert result[0]["tool_name"] == "Tool1"
 
-    @patch("app.services.grok_service.litellm.completion")
+    @patch("app.services.grok_service.litellm.acompletion")
     def test_invalid_json_returns_none(self, mock_completion):
         """Test that invalid JSON returns None."""
         mock_response = MagicMock()
@@ -87,7 +115,7 @@ class TestAnalyzeFocusArea:
 
         assert result is None
 
-    @patch("app.services.grok_service.litellm.completion")
+    @patch("app.services.grok_service.litellm.acompletion")
     def test_api_error_returns_none(self, mock_completion):
         """Test that API errors return None."""
         mock_completion.side_effect = Exception("API Error")
@@ -100,7 +128,7 @@ class TestAnalyzeFocusArea:
 class TestRunFullAnalysis:
     """Test full analysis across all focus areas."""
 
-    @patch("app.services.grok_service.analyze_focus_area")
+    @patch("app.services.grok_service.analyze_focus_area_async")
     def test_aggregates_all_focus_areas(self, mock_analyze):
         """Test that full analysis aggregates results from all areas."""
         mock_analyze.side_effect = [
@@ -115,7 +143,7 @@ class TestRunFullAnalysis:
         assert "trends" in result
         assert len(result["trends"]) == 3
 
-    @patch("app.services.grok_service.analyze_focus_area")
+    @patch("app.services.grok_service.analyze_focus_area_async")
     def test_handles_partial_failures(self, mock_analyze):
         """Test that partial failures don't break full analysis."""
         mock_analyze.side_effect = [
@@ -128,7 +156,7 @@ class TestRunFullAnalysis:
 
         assert len(result["trends"]) == 2
 
-    @patch("app.services.grok_service.analyze_focus_area")
+    @patch("app.services.grok_service.analyze_focus_area_async")
     def test_returns_empty_trends_on_total_failure(self, mock_analyze):
         """Test that total failure returns empty trends list."""
         mock_analyze.return_value = None
@@ -139,6 +167,534 @@ class TestRunFullAnalysis:
         assert "radar_date" in result
 
 
+class TestRunFullAnalysisAsync:
+    """Test concurrent analysis across all focus areas."""
+
+    @patch("app.services.grok_service.analyze_focus_area_async")
+    def test_aggregates_all_focus_areas(self, mock_analyze):
+        """Test that concurrent analysis aggregates results in focus area order."""
+
+        async def fake_analyze(focus_area, **kwargs):
+            return [{"tool_name": f"{focus_area}-tool", "focus_area": focus_area}]
+
+        mock_analyze.side_effect = fake_analyze
+
+        result = asyncio.run(run_full_analysis_async())
+
+        assert "radar_date" in result
+        assert [t["focus_area"] for t in result["trends"]] == list(FOCUS_AREAS)
+
+    @patch("app.services.grok_service.analyze_focus_area_async")
+    def test_handles_partial_failures(self, mock_analyze):
+        """Test that failed or raising areas don't break the fan-out."""
+
+        async def fake_analyze(focus_area, **kwargs):
+            if focus_area == "agent_orchestration":
+                return None
+            if focus_area == "durable_runtime":
+                raise RuntimeError("boom")
+            return [{"tool_name": "VoiceTool", "focus_area": focus_area}]
+
+        mock_analyze.side_effect = fake_analyze
+
+        result = asyncio.run(run_full_analysis_async())
+
+        assert len(result["trends"]) == 1
+        assert result["trends"][0]["tool_name"] == "VoiceTool"
+
+    @patch("app.services.grok_service.analyze_focus_area_async")
+    def test_wall_clock_close_to_slowest_area(self, mock_analyze):
+        """Test that areas run concurrently rather than back to back."""
+
+        async def fake_analyze(focus_area, **kwargs):
+            await asyncio.sleep(0.2)
+            return []
+
+        mock_analyze.side_effect = fake_analyze
+
+        start = time.perf_counter()
+        asyncio.run(run_full_analysis_async())
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.2 * len(FOCUS_AREAS) * 0.75, f"Fan-out took {elapsed:.3f}s"
+
+    @patch("app.services.grok_service.analyze_focus_area_async")
+    def test_respects_concurrency_limit(self, mock_analyze):
+        """Test that no more than max_concurrency areas are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_analyze(focus_area, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+
+        mock_analyze.side_effect = fake_analyze
+
+        asyncio.run(run_full_analysis_async(max_concurrency=1))
+
+        assert peak == 1
+        assert mock_analyze.call_count == len(FOCUS_AREAS)
+
+
+    @patch("app.services.grok_service.analyze_focus_area_async")
+    def test_reports_progress_per_area(self, mock_analyze):
+        """Test that on_progress sees each area start and finish."""
+        updates = []
+
+        async def fake_analyze(focus_area, **kwargs):
+            return None if focus_area == "voice_ai_ux" else []
+
+        async def on_progress(focus_area, update):
+            updates.append((focus_area, update["status"]))
+
+        mock_analyze.side_effect = fake_analyze
+
+        asyncio.run(run_full_analysis_async(on_progress=on_progress))
+
+        assert ("voice_ai_ux", "failed") in updates
+        assert ("durable_runtime", "done") in updates
+        assert sum(1 for _, status in updates if status == "running") == len(FOCUS_AREAS)
+
+
+class TestAnalyzeFocusAreaAsync:
+    """Test async single focus area analysis."""
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_successful_analysis(self, mock_acompletion):
+        """Test async API response parsing."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = """[
+            {"tool_name": "AsyncTool", "classification": "signal", "confidence_score": 80,
+             "technical_insight": "Streams", "architectural_verdict": true}
+        ]"""
+        mock_acompletion.return_value = mock_response
+
+        result = asyncio.run(analyze_focus_area_async("durable_runtime"))
+
+        assert result[0]["tool_name"] == "AsyncTool"
+        assert result[0]["focus_area"] == "durable_runtime"
+        assert result[0]["signal_evidence"] == []
+
+    def test_invalid_focus_area_raises_error(self):
+        """Test that invalid focus area raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown focus area"):
+            asyncio.run(analyze_focus_area_async("invalid_area"))
+
+
+class TestStreamFocusAreaAsync:
+    """Test streamed single focus area analysis."""
+
+    TREND_A = (
+        '{"tool_name": "ToolA", "classification": "signal", "confidence_score": 90, '
+        '"technical_insight": "Fast", "architectural_verdict": true}'
+    )
+    TREND_B = (
+        '{"tool_name": "ToolB", "classification": "noise", "confidence_score": 70, '
+        '"technical_insight": "Hype", "architectural_verdict": false}'
+    )
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_trends_emitted_before_stream_ends(self, mock_acompletion):
+        """Test each trend reaches on_trend as soon as its object closes."""
+        events = []
+
+        async def pieces():
+            for piece in ["Results: [", self.TREND_A[:20], self.TREND_A[20:] + ",", " "]:
+                chunk = MagicMock()
+                chunk.choices[0].delta.content = piece
+                events.append("chunk")
+                yield chunk
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = self.TREND_B + "]"
+            events.append("chunk")
+            yield chunk
+
+        async def on_trend(trend):
+            events.append(trend["tool_name"])
+
+        mock_acompletion.return_value = pieces()
+
+        result = asyncio.run(stream_focus_area_async("durable_runtime", on_trend=on_trend))
+
+        assert [t["tool_name"] for t in result] == ["ToolA", "ToolB"]
+        assert events == ["chunk", "chunk", "chunk", "ToolA", "chunk", "chunk", "ToolB"]
+        assert result[0]["focus_area"] == "durable_runtime"
+        assert mock_acompletion.call_args.kwargs["stream"] is True
+        assert mock_acompletion.call_args.kwargs["stream_options"] == {"include_usage": True}
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_invalid_streamed_trend_skipped(self, mock_acompletion):
+        """Test invalid elements are dropped without stopping the stream."""
+        mock_acompletion.return_value = _stream_of(
+            '[{"tool_name": "Bad"}, ', self.TREND_A, "]"
+        )
+
+        result = asyncio.run(stream_focus_area_async("durable_runtime"))
+
+        assert [t["tool_name"] for t in result] == ["ToolA"]
+
+    @patch("app.services.grok_service.asyncio.sleep", return_value=None)
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_retry_before_first_trend(self, mock_acompletion, mock_sleep):
+        """Test a stream that fails before emitting anything is retried."""
+        mock_acompletion.side_effect = [
+            _stream_of("[", error=Exception("connection reset")),
+            _stream_of("[" + self.TREND_A + "]"),
+        ]
+
+        result = asyncio.run(stream_focus_area_async("durable_runtime"))
+
+        assert [t["tool_name"] for t in result] == ["ToolA"]
+        assert mock_acompletion.call_count == 2
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_partial_stream_keeps_emitted_trends(self, mock_acompletion):
+        """Test a stream failing after a trend keeps it and only follows up for the rest."""
+        follow_up = MagicMock()
+        follow_up.choices[0].message.content = "[" + self.TREND_A + ", " + self.TREND_B + "]"
+        mock_acompletion.side_effect = [
+            _stream_of("[" + self.TREND_A + ", {", error=Exception("connection reset")),
+            follow_up,
+        ]
+
+        result = asyncio.run(stream_focus_area_async("durable_runtime"))
+
+        assert [t["tool_name"] for t in result] == ["ToolA", "ToolB"]
+        assert mock_acompletion.call_count == 2
+        assert "stream" not in mock_acompletion.call_args.kwargs
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_no_array_returns_none(self, mock_acompletion):
+        """Test a response without a JSON array is a failed analysis."""
+        mock_acompletion.return_value = _stream_of("No tools found.")
+
+        assert asyncio.run(stream_focus_area_async("durable_runtime")) is None
+
+    @patch("app.services.grok_service.stream_focus_area_async")
+    def test_full_analysis_streaming_progress(self, mock_stream):
+        """Test streamed runs report trend counts while areas are running."""
+        updates = []
+
+        async def fake_stream(focus_area, on_trend=None, **kwargs):
+            trend = {"tool_name": f"{focus_area}_tool"}
+            await on_trend(trend)
+            return [trend]
+
+        async def on_progress(focus_area, update):
+            updates.append((focus_area, update))
+
+        mock_stream.side_effect = fake_stream
+
+        result = asyncio.run(run_full_analysis_async(on_progress=on_progress, streaming=True))
+
+        assert len(result["trends"]) == len(FOCUS_AREAS)
+        running = [u for area, u in updates if area == "voice_ai_ux" and u["status"] == "running"]
+        assert running[-1]["trends_count"] == 1
+        assert "first_trend_ms" in running[-1]
+        done = [u for area, u in updates if area == "voice_ai_ux" and u["status"] == "done"]
+        assert done[0]["first_trend_ms"] == running[-1]["first_trend_ms"]
+
+
+class TestIncrementalAnalysis:
+    """Test carrying unchanged tools forward from the previous radar."""
+
+    PREVIOUS = [
+        {
+            "focus_area": "agent_orchestration",
+            "tool_name": "LangGraph",
+            "classification": "signal",
+            "confidence_score": 88,
+            "technical_insight": "Checkpointed graphs",
+            "signal_evidence": ["Durable state"],
+            "noise_indicators": [],
+            "architectural_verdict": True,
+            "timestamp": "2026-01-30T08:00:00Z",
+        }
+    ]
+
+    def test_prompt_lists_previous_tools(self):
+        """Test the incremental prompt names previous tools and the short form."""
+        prompt = build_discovery_prompt("agent_orchestration", self.PREVIOUS)
+
+        assert "- LangGraph: signal (88)" in prompt
+        assert '"unchanged": true' in prompt
+        assert "INCREMENTAL" not in build_discovery_prompt("agent_orchestration")
+
+    def test_unchanged_entries_carried_forward(self):
+        """Test unchanged entries resolve to the previous trend by canonical name."""
+        content = """[
+            {"tool_name": "langgraph", "unchanged": true},
+            {"tool_name": "Ghost", "unchanged": true},
+            {"tool_name": "CrewAI", "classification": "noise", "confidence_score": 60,
+             "technical_insight": "Demos", "architectural_verdict": false}
+        ]"""
+
+        trends = parse_trends("agent_orchestration", content, self.PREVIOUS)
+
+        assert [t["tool_name"] for t in trends] == ["LangGraph", "CrewAI"]
+        assert trends[0]["carried_forward"] is True
+        assert trends[0]["signal_evidence"] == ["Durable state"]
+        assert trends[0]["timestamp"] != self.PREVIOUS[0]["timestamp"]
+        assert "carried_forward" not in trends[1]
+
+    @patch("app.services.grok_service.analyze_focus_area_async")
+    def test_full_analysis_reports_reuse(self, mock_analyze):
+        """Test previous trends are routed per area and reuse is counted."""
+        seen = {}
+
+        async def fake_analyze(focus_area, previous=None, **kwargs):
+            seen[focus_area] = previous
+            if focus_area == "agent_orchestration":
+                return [dict(previous[0], carried_forward=True), {"tool_name": "New"}]
+            return [{"tool_name": f"{focus_area}_tool"}]
+
+        mock_analyze.side_effect = fake_analyze
+
+        result = asyncio.run(run_full_analysis_async(previous_trends=self.PREVIOUS))
+
+        assert seen["agent_orchestration"] == self.PREVIOUS
+        assert seen["voice_ai_ux"] is None
+        assert result["reused_count"] == 1
+        assert result["reanalyzed_count"] == len(FOCUS_AREAS)
+
+
+class TestSalvageFollowUp:
+    """Test recovering partial responses and asking only for lost tools."""
+
+    @staticmethod
+    def _response(content):
+        response = MagicMock()
+        response.choices[0].message.content = content
+        return response
+
+    @staticmethod
+    def _trend(name):
+        return {
+            "tool_name": name,
+            "classification": "signal",
+            "confidence_score": 75,
+            "technical_insight": "Benchmarks",
+            "architectural_verdict": True,
+        }
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_truncated_response_followed_up(self, mock_completion):
+        """Test complete trends are kept and one follow-up asks for the lost one."""
+        truncated = json.dumps([self._trend("Kept")])[:-1] + ', {"tool_name": "Lost", "classif'
+        mock_completion.side_effect = [
+            self._response(truncated),
+            self._response(json.dumps([self._trend("kept"), self._trend("Lost")])),
+        ]
+
+        result = analyze_focus_area("durable_runtime")
+
+        assert [t["tool_name"] for t in result] == ["Kept", "Lost"]
+        follow_up = mock_completion.call_args_list[1].kwargs["messages"][0]["content"]
+        assert "do NOT repeat these: Kept" in follow_up
+        assert "The lost entries were for: Lost" in follow_up
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_failed_follow_up_keeps_salvaged_trends(self, mock_acompletion):
+        """Test the area keeps what was salvaged when the follow-up fails."""
+        bad_request = Exception("Bad Request")
+        bad_request.status_code = 400
+        mock_acompletion.side_effect = [
+            self._response('{"tools": [' + json.dumps(self._trend("Kept")) + ', {"tool'),
+            bad_request,
+        ]
+
+        result = asyncio.run(analyze_focus_area_async("voice_ai_ux"))
+
+        assert [t["tool_name"] for t in result] == ["Kept"]
+        assert mock_acompletion.call_count == 2
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_well_formed_response_not_followed_up(self, mock_completion):
+        """Test repairs alone (fences, trailing commas) cost no extra request."""
+        content = "```json\n" + json.dumps([self._trend("A")])[:-1] + ",]\n```"
+        mock_completion.return_value = self._response(content)
+
+        result = analyze_focus_area("agent_orchestration")
+
+        assert [t["tool_name"] for t in result] == ["A"]
+        assert mock_completion.call_count == 1
+
+    @patch.object(grok_service, "LLM_SALVAGE_FOLLOW_UP", False)
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_follow_up_can_be_disabled(self, mock_completion):
+        """Test LLM_SALVAGE_FOLLOW_UP=false keeps salvaged trends without asking again."""
+        mock_completion.return_value = self._response(
+            "[" + json.dumps(self._trend("A")) + ', {"tool_name": "B"'
+        )
+
+        assert [t["tool_name"] for t in analyze_focus_area("agent_orchestration")] == ["A"]
+        assert mock_completion.call_count == 1
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_truncated_stream_followed_up(self, mock_acompletion):
+        """Test a cut-off stream emits its complete trends, then the follow-up's."""
+        first = json.dumps(self._trend("Streamed"))
+        mock_acompletion.side_effect = [
+            _stream_of("[", first, ', {"tool_name": "Lost", "conf'),
+            self._response(json.dumps([self._trend("Lost")])),
+        ]
+        emitted = []
+
+        async def on_trend(trend):
+            emitted.append(trend["tool_name"])
+
+        result = asyncio.run(stream_focus_area_async("voice_ai_ux", on_trend=on_trend))
+
+        assert emitted == ["Streamed", "Lost"]
+        assert [t["tool_name"] for t in result] == emitted
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_unclosed_stream_not_cached(self, mock_acompletion):
+        """Test a stream ending between elements is followed up instead of cached."""
+        first = json.dumps(self._trend("Streamed"))
+        mock_acompletion.side_effect = [
+            _stream_of("[", first, ", "),
+            self._response(json.dumps([self._trend("More")])),
+        ]
+
+        with patch.object(grok_service.llm_cache, "put_async", new_callable=AsyncMock) as put:
+            result = asyncio.run(stream_focus_area_async("voice_ai_ux"))
+
+        assert [t["tool_name"] for t in result] == ["Streamed", "More"]
+        assert mock_acompletion.call_count == 2
+        assert all(not c.args[3].startswith("[" + first) for c in put.call_args_list)
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_unclosed_empty_stream_fails(self, mock_acompletion):
+        """Test an array that never closed and recovered nothing is a failed analysis."""
+        bad_request = Exception("Bad Request")
+        bad_request.status_code = 400
+        mock_acompletion.side_effect = [_stream_of("["), bad_request]
+
+        assert asyncio.run(stream_focus_area_async("voice_ai_ux")) is None
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_cached_truncated_stream_followed_up(self, mock_acompletion):
+        """Test a salvaged cache hit asks for its lost tools like a live stream."""
+        cached = "[" + json.dumps(self._trend("Cached")) + ', {"tool_name": "Lost", "conf'
+        mock_acompletion.return_value = self._response(json.dumps([self._trend("Lost")]))
+        emitted = []
+
+        async def on_trend(trend):
+            emitted.append(trend["tool_name"])
+
+        with patch.object(grok_service.llm_cache, "get_async", side_effect=[cached, None]):
+            result = asyncio.run(stream_focus_area_async("voice_ai_ux", on_trend=on_trend))
+
+        assert emitted == ["Cached", "Lost"]
+        assert [t["tool_name"] for t in result] == emitted
+        assert mock_acompletion.call_count == 1
+
+
+class TestBatchedAnalysis:
+    """Test the single-request analysis of all focus areas."""
+
+    TREND = {
+        "tool_name": "Tool",
+        "classification": "signal",
+        "confidence_score": 70,
+        "technical_insight": "Benchmarks",
+        "architectural_verdict": True,
+    }
+
+    def test_prompt_shares_criteria_across_areas(self):
+        """Test the boilerplate appears once and every area gets a section."""
+        areas = list(FOCUS_AREAS)
+        prompt = build_batch_prompt(areas)
+
+        assert prompt.count(CLASSIFICATION_CRITERIA) == 1
+        for area, config in FOCUS_AREAS.items():
+            assert f"### {area} ({config['name']})" in prompt
+        assert len(prompt) < sum(len(build_discovery_prompt(area)) for area in areas)
+
+    def test_split_keeps_delivered_areas(self):
+        """Test each area's array is validated and missing areas map to None."""
+        content = json.dumps(
+            {"voice_ai_ux": [self.TREND, {"tool_name": "Bad"}], "agent_orchestration": []}
+        )
+
+        result = split_batch_response(content, list(FOCUS_AREAS))
+
+        assert [t["tool_name"] for t in result["voice_ai_ux"]] == ["Tool"]
+        assert result["voice_ai_ux"][0]["focus_area"] == "voice_ai_ux"
+        assert result["agent_orchestration"] == []
+        assert result["durable_runtime"] is None
+
+    def test_split_unparseable_response(self):
+        """Test a broken object fails every area."""
+        assert split_batch_response('{"voice_ai_ux": [', ["voice_ai_ux"]) == {"voice_ai_ux": None}
+
+    def test_split_salvages_each_area(self):
+        """Test trailing commas are repaired and a truncated object keeps earlier areas."""
+        trend = json.dumps(self.TREND)
+        content = (
+            '```json\n{"voice_ai_ux": [' + trend + ",],\n"
+            '"agent_orchestration": [' + trend + ', {"tool_name": "Cut'
+        )
+
+        result = split_batch_response(
+            content, ["voice_ai_ux", "agent_orchestration", "durable_runtime"]
+        )
+
+        assert [t["tool_name"] for t in result["voice_ai_ux"]] == ["Tool"]
+        assert [t["tool_name"] for t in result["agent_orchestration"]] == ["Tool"]
+        assert result["durable_runtime"] is None
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_one_structured_request(self, mock_acompletion):
+        """Test batched mode sends one request with a schema keyed by area."""
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps(
+            {area: [dict(self.TREND, tool_name=f"{area}_tool")] for area in FOCUS_AREAS}
+        )
+        mock_acompletion.return_value = response
+
+        result = asyncio.run(run_full_analysis_async(batched=True))
+
+        assert mock_acompletion.call_count == 1
+        schema = mock_acompletion.call_args.kwargs["response_format"]["json_schema"]["schema"]
+        assert schema["required"] == list(FOCUS_AREAS)
+        assert [t["tool_name"] for t in result["trends"]] == [f"{a}_tool" for a in FOCUS_AREAS]
+
+    @patch("app.services.grok_service.analyze_focus_area_async")
+    @patch("app.services.grok_service.analyze_batch_async")
+    def test_missing_areas_fall_back(self, mock_batch, mock_analyze):
+        """Test areas the batch did not deliver are analyzed one by one."""
+        updates = []
+
+        async def fake_batch(areas, **kwargs):
+            return {area: [{"tool_name": f"{area}_batch"}] for area in areas[:1]}
+
+        async def fake_analyze(focus_area, **kwargs):
+            return [{"tool_name": f"{focus_area}_single"}]
+
+        async def on_progress(focus_area, update):
+            updates.append((focus_area, update["status"]))
+
+        mock_batch.side_effect = fake_batch
+        mock_analyze.side_effect = fake_analyze
+
+        result = asyncio.run(run_full_analysis_async(batched=True, on_progress=on_progress))
+
+        areas = list(FOCUS_AREAS)
+        assert [call.args[0] for call in mock_analyze.call_args_list] == areas[1:]
+        assert [t["tool_name"] for t in result["trends"]] == [
+            f"{areas[0]}_batch",
+            *(f"{area}_single" for area in areas[1:]),
+        ]
+        assert (areas[0], "done") in updates
+        assert all((area, "done") in updates for area in areas)
+
+
 class TestValidateTrend:
     """Test trend validation function."""
 
@@ -208,11 +764,23 @@ class TestValidateTrend:
         }
         assert validate_trend(trend) is False
 
+    def test_separator_only_tool_name(self):
+        """Test a tool name with no canonical registry key fails validation."""
+        trend = {
+            "tool_name": " - _ ",
+            "classification": "signal",
+            "confidence_score": 85,
+            "technical_insight": "Test",
+            "architectural_verdict": True,
+        }
+        assert validate_trend(trend) is False
+        assert validate_trend({**trend, "tool_name": 42}) is False
+
 
 class TestCallGrokWithRetry:
     """Test retry logic for Grok API calls."""
 
-    @patch("app.services.grok_service.litellm.completion")
+    @patch("app.services.grok_service.litellm.acompletion")
     def test_successful_first_attempt(self, mock_completion):
         """Test successful response on first attempt."""
         mock_response = MagicMock()
@@ -224,8 +792,8 @@ class TestCallGrokWithRetry:
         assert result == "Test response"
         assert mock_completion.call_count == 1
 
-    @patch("app.services.grok_service.time.sleep")
-    @patch("app.services.grok_service.litellm.completion")
+    @patch("app.services.grok_service.asyncio.sleep")
+    @patch("app.services.grok_service.litellm.acompletion")
     def test_retry_on_failure(self, mock_completion, mock_sleep):
         """Test retry behavior on API failure."""
         mock_response = MagicMock()
@@ -242,8 +810,8 @@ class TestCallGrokWithRetry:
         assert mock_completion.call_count == 3
         assert mock_sleep.call_count == 2
 
-    @patch("app.services.grok_service.time.sleep")
-    @patch("app.services.grok_service.litellm.completion")
+    @patch("app.services.grok_service.asyncio.sleep")
+    @patch("app.services.grok_service.litellm.acompletion")
     def test_all_retries_exhausted(self, mock_completion, mock_sleep):
         """Test returns None when all retries are exhausted."""
         mock_completion.side_effect = Exception("Always fails")
@@ -254,6 +822,35 @@ class TestCallGrokWithRetry:
         assert mock_completion.call_count == 3
 
 
+class TestCallGrokWithRetryAsync:
+    """Test async retry logic for Grok API calls."""
+
+    @patch("app.services.grok_service.asyncio.sleep")
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_retry_on_failure(self, mock_acompletion, mock_sleep):
+        """Test async retry sleeps without blocking and then succeeds."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "Success"
+        mock_acompletion.side_effect = [Exception("First failure"), mock_response]
+
+        result = asyncio.run(call_grok_with_retry_async("Test prompt"))
+
+        assert result == "Success"
+        assert mock_acompletion.call_count == 2
+        mock_sleep.assert_awaited_once()
+
+    @patch("app.services.grok_service.asyncio.sleep")
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_all_retries_exhausted(self, mock_acompletion, mock_sleep):
+        """Test returns None when all async retries are exhausted."""
+        mock_acompletion.side_effect = Exception("Always fails")
+
+        result = asyncio.run(call_grok_with_retry_async("Test prompt"))
+
+        assert result is None
+        assert mock_acompletion.call_count == 3
+
+
 class TestCheckApiConnection:
     """Test API connection check function."""
 
@@ -0,0 +1,74 @@
+"""Tests for salvaging trend arrays from imperfect LLM output."""
+
+from app.services.json_salvage import salvage_json_array, salvage_keyed_arrays
+
+
+def test_valid_array_with_surrounding_text():
+    """Test text around a valid array needs no repair."""
+    result = salvage_json_array('Results:\n[{"tool_name": "A"}]\nHope this helps!')
+
+    assert result.elements == [{"tool_name": "A"}]
+    assert result.complete
+    assert result.repairs == [] and result.dropped == []
+
+
+def test_fence_and_trailing_commas():
+    """Test a fenced array with trailing commas parses whole."""
+    result = salvage_json_array('```json\n[{"tool_name": "A", "tags": ["x",],},]\n```')
+
+    assert result.elements == [{"tool_name": "A", "tags": ["x"]}]
+    assert result.repairs == ["markdown fence", "3 trailing comma(s)"]
+
+
+def test_tools_wrapper():
+    """Test an array wrapped in {"tools": [...]} is unwrapped."""
+    result = salvage_json_array('{"summary": "two", "tools": [{"tool_name": "A"}]}')
+
+    assert result.elements == [{"tool_name": "A"}]
+    assert result.repairs == ['{"tools": [...]} wrapper']
+
+
+def test_truncated_final_element():
+    """Test complete elements survive a cut-off response and the lost tool is named."""
+    result = salvage_json_array(
+        '```json\n{"tools": [{"tool_name": "A", "notes": "[x]"}, {"tool_name": "B", "confid'
+    )
+
+    assert result.elements == [{"tool_name": "A", "notes": "[x]"}]
+    assert not result.complete
+    assert result.dropped == ["truncated final element"]
+    assert result.dropped_names == ["B"]
+
+
+def test_undecodable_element_is_skipped():
+    """Test one malformed element does not lose its neighbours."""
+    result = salvage_json_array(
+        '[{"tool_name": "A"}, {"tool_name": "B" "score": 1}, {"tool_name": "C"}]'
+    )
+
+    assert [e["tool_name"] for e in result.elements] == ["A", "C"]
+    assert result.complete
+    assert len(result.dropped) == 1
+    assert result.dropped_names == ["B"]
+
+
+def test_no_array():
+    """Test plain prose reports that nothing was found."""
+    result = salvage_json_array("I could not find any tools this week.")
+
+    assert not result.found
+    assert result.elements == []
+
+
+def test_keyed_arrays_from_truncated_object():
+    """Test each key keeps its own closed elements when the object is cut off."""
+    result = salvage_keyed_arrays(
+        '{"a": [{"tool_name": "A"},], "b": [{"tool_name": "B"}, {"tool_name": "C", "x',
+        ["a", "b", "c"],
+    )
+
+    assert result["a"].elements == [{"tool_name": "A"}]
+    assert result["a"].complete
+    assert result["b"].elements == [{"tool_name": "B"}]
+    assert result["b"].dropped_names == ["C"]
+    assert "c" not in result
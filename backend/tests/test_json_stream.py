@@ -0,0 +1,97 @@
+"""Tests for the incremental JSON array parser."""
+
+from app.services.json_stream import JsonArrayStreamParser
+
+
+def feed_all(parser, chunks):
+    """Feed chunks in order and collect every completed element."""
+    elements = []
+    for chunk in chunks:
+        elements.extend(parser.feed(chunk))
+    return elements
+
+
+def test_skips_preamble_and_parses_elements():
+    """Test text before the array is ignored."""
+    parser = JsonArrayStreamParser()
+
+    elements = feed_all(parser, ['Here you go:\n[{"a": 1}, {"b": 2}]'])
+
+    assert elements == [{"a": 1}, {"b": 2}]
+    assert parser.done
+
+
+def test_element_split_across_every_character():
+    """Test elements are reassembled from single-character chunks."""
+    text = '[{"name": "x", "tags": ["a", "b"]}, {"name": "y"}]'
+    parser = JsonArrayStreamParser()
+
+    elements = feed_all(parser, list(text))
+
+    assert elements == [{"name": "x", "tags": ["a", "b"]}, {"name": "y"}]
+
+
+def test_elements_returned_when_they_close():
+    """Test feed returns an element in the chunk that closes it."""
+    parser = JsonArrayStreamParser()
+
+    assert parser.feed('[{"a": ') == []
+    assert parser.feed("1},") == [{"a": 1}]
+    assert parser.feed(' {"b"') == []
+    assert parser.feed(": 2}]") == [{"b": 2}]
+
+
+def test_brackets_and_escapes_inside_strings():
+    """Test brackets and escaped quotes in strings don't change nesting."""
+    text = '[{"text": "a ] b } c [ \\" {"}, {"path": "C:\\\\"}]'
+    parser = JsonArrayStreamParser()
+
+    elements = feed_all(parser, [text[:12], text[12:27], text[27:]])
+
+    assert elements == [{"text": 'a ] b } c [ " {'}, {"path": "C:\\"}]
+
+
+def test_undecodable_element_skipped():
+    """Test a malformed element is counted and skipped."""
+    parser = JsonArrayStreamParser()
+
+    elements = feed_all(parser, ['[{"a": tru}, {"b": 2}]'])
+
+    assert elements == [{"b": 2}]
+    assert parser.decode_errors == 1
+    assert parser.elements_seen == 2
+
+
+def test_text_after_array_ignored():
+    """Test nothing is parsed once the array has closed."""
+    parser = JsonArrayStreamParser()
+
+    elements = feed_all(parser, ['[{"a": 1}] trailing [{"b": 2}]', '[{"c": 3}]'])
+
+    assert elements == [{"a": 1}]
+
+
+def test_no_array_never_starts():
+    """Test plain text leaves the parser unstarted."""
+    parser = JsonArrayStreamParser()
+
+    assert feed_all(parser, ["No tools ", "found."]) == []
+    assert not parser.started
+
+
+def test_trailing_commas_are_tolerated():
+    """Test elements with trailing commas still decode; commas in strings are kept."""
+    parser = JsonArrayStreamParser()
+
+    elements = feed_all(parser, ['[{"a": "x,}", "b": [1, 2,],}, {"c": 3}]'])
+
+    assert elements == [{"a": "x,}", "b": [1, 2]}, {"c": 3}]
+    assert parser.decode_errors == 0
+
+
+def test_partial_holds_open_element():
+    """Test the element cut off at the end of the text is exposed."""
+    parser = JsonArrayStreamParser()
+
+    assert feed_all(parser, ['[{"a": 1}, {"b": ', "2"]) == [{"a": 1}]
+    assert parser.partial == '{"b": 2'
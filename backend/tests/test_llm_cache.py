@@ -0,0 +1,147 @@
+"""Tests for the on-disk LLM completion cache."""
+
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import grok_service
+from app.services.llm_cache import LLMCache, cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """An enabled cache in a temporary directory."""
+    return LLMCache(directory=str(tmp_path), ttl_seconds=60, max_bytes=10_000, enabled=True)
+
+
+def test_round_trip_counts_hits_and_misses(cache):
+    """Test stored completions are returned and counted."""
+    assert cache.get("openai/grok-3", "prompt", 0.7) is None
+    cache.put("openai/grok-3", "prompt", 0.7, "[]")
+
+    assert cache.get("openai/grok-3", "prompt", 0.7) == "[]"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_covers_model_prompt_and_temperature():
+    """Test any change to model, prompt or temperature changes the key."""
+    base = cache_key("openai/grok-3", "prompt", 0.7)
+    assert cache_key("openai/grok-4", "prompt", 0.7) != base
+    assert cache_key("openai/grok-3", "prompt!", 0.7) != base
+    assert cache_key("openai/grok-3", "prompt", 0.2) != base
+
+
+def test_expired_entries_miss(cache):
+    """Test entries older than the TTL are dropped."""
+    cache.put("m", "prompt", 0.7, "old")
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+
+    assert cache.get("m", "prompt", 0.7) is None
+
+
+def test_size_eviction_drops_least_recently_used(cache):
+    """Test the oldest entries are evicted once max_bytes is exceeded."""
+    cache.max_bytes = 1500
+    cache.put("m", "first", 0.7, "x" * 500)
+    first = cache._path(cache_key("m", "first", 0.7))
+    os.utime(first, (time.time() - 100, time.time() - 100))
+    cache.put("m", "second", 0.7, "x" * 500)
+    cache.put("m", "third", 0.7, "x" * 500)
+
+    assert cache.get("m", "first", 0.7) is None
+    assert cache.get("m", "third", 0.7) == "x" * 500
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_disabled_cache_is_a_no_op(tmp_path):
+    """Test a disabled cache neither stores nor counts."""
+    cache = LLMCache(directory=str(tmp_path), enabled=False)
+    cache.put("m", "prompt", 0.7, "content")
+
+    assert cache.get("m", "prompt", 0.7) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@patch("app.services.grok_service.litellm.acompletion")
+def test_call_grok_uses_cache(mock_completion, cache, monkeypatch):
+    """Test a repeated prompt is served from cache and force bypasses it."""
+    monkeypatch.setattr(grok_service, "llm_cache", cache)
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = "fresh"
+    mock_completion.return_value = mock_response
+
+    assert grok_service.call_grok_with_retry("prompt") == "fresh"
+    assert grok_service.call_grok_with_retry("prompt") == "fresh"
+    assert mock_completion.call_count == 1
+
+    grok_service.call_grok_with_retry("prompt", use_cache=False)
+    assert mock_completion.call_count == 2
+
+
+def test_directory_scanned_only_when_over_budget(cache, monkeypatch):
+    """Test puts under max_bytes track the size instead of rescanning the directory."""
+    cache.put("m", "first", 0.7, "x" * 100)
+    scans = []
+    original_scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or original_scan())
+
+    for i in range(5):
+        cache.put("m", f"prompt {i}", 0.7, "x" * 100)
+    assert scans == []
+
+    cache.put("m", "large", 0.7, "x" * 10_000)
+    assert scans == [1]
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_put_async_stores_entry(cache):
+    """Test the async put writes the same entry from a worker thread."""
+    asyncio.run(cache.put_async("m", "prompt", 0.7, "[]"))
+
+    assert cache.get("m", "prompt", 0.7) == "[]"
+
+
+def test_get_async_reads_entry(cache):
+    """Test the async get serves the same entry from a worker thread."""
+    cache.put("m", "prompt", 0.7, "[]")
+
+    assert asyncio.run(cache.get_async("m", "prompt", 0.7)) == "[]"
+    assert cache.stats()["hits"] == 1
+
+
+def test_hit_survives_failed_touch(cache):
+    """Test an entry removed between the read and the LRU touch is still a hit."""
+    cache.put("m", "prompt", 0.7, "[]")
+
+    with patch("app.services.llm_cache.os.utime", side_effect=FileNotFoundError):
+        assert cache.get("m", "prompt", 0.7) == "[]"
+
+
+@patch("app.services.grok_service.litellm.acompletion")
+def test_responses_without_array_not_cached(mock_acompletion, cache, monkeypatch):
+    """Test a refusal is not replayed from cache on the next refresh."""
+    monkeypatch.setattr(grok_service, "llm_cache", cache)
+    refusal, trends = MagicMock(), MagicMock()
+    refusal.choices[0].message.content = "I can't help with that right now."
+    trends.choices[0].message.content = (
+        '[{"tool_name": "T", "classification": "signal", "confidence_score": 70, '
+        '"technical_insight": "x", "architectural_verdict": true}]'
+    )
+    mock_acompletion.side_effect = [refusal, trends]
+
+    async def analyze_twice():
+        return (
+            await grok_service.analyze_focus_area_async("voice_ai_ux"),
+            await grok_service.analyze_focus_area_async("voice_ai_ux"),
+        )
+
+    first, second = asyncio.run(analyze_twice())
+
+    assert first is None
+    assert [t["tool_name"] for t in second] == ["T"]
+    assert mock_acompletion.call_count == 2
@@ -0,0 +1,71 @@
+"""Tests for the pooled LiteLLM HTTP clients."""
+
+import asyncio
+from unittest.mock import patch
+
+import litellm
+import pytest
+
+from app.services import grok_service
+from app.services.llm_http import LLMHttpPool
+
+
+@pytest.fixture
+def pool():
+    """An open pool installed as litellm's sessions, closed afterwards."""
+    pool = LLMHttpPool()
+    pool.open()
+    yield pool
+    asyncio.run(pool.close())
+
+
+def test_open_installs_and_close_restores_sessions():
+    """Test litellm uses the pool's clients only while it is open."""
+    pool = LLMHttpPool()
+    pool.open()
+    assert litellm.client_session is pool.client
+    assert litellm.aclient_session is pool.aclient
+
+    asyncio.run(pool.close())
+
+    assert litellm.client_session is None
+    assert litellm.aclient_session is None
+
+
+def test_sync_calls_reuse_one_connection(pool, stub_url):
+    """Test repeated health probes pay connect time once."""
+    with patch.object(grok_service, "LITELLM_BASE_URL", stub_url):
+        for _ in range(3):
+            assert grok_service.check_api_connection()["status"] == "ok"
+
+    stats = pool.stats.snapshot()
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 2
+    assert stats["connect_p50_ms"] is not None
+
+
+def test_warm_up_opens_connections_used_by_calls(pool, stub_url):
+    """Test warmed connections serve the concurrent focus area calls."""
+
+    async def refresh():
+        warmed = await pool.warm_up(stub_url, connections=3)
+        pool.stats.reset()
+        with patch.object(grok_service, "LITELLM_BASE_URL", stub_url):
+            result = await grok_service.run_full_analysis_async()
+        # Async connections belong to this loop, as they do to the server's
+        await pool.close()
+        return warmed, result
+
+    warmed, result = asyncio.run(refresh())
+
+    assert warmed == 3
+    assert len(result["trends"]) == 6
+    stats = pool.stats.snapshot()
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 0
+
+
+def test_warm_up_failure_does_not_raise(pool):
+    """Test an unreachable proxy only logs at startup."""
+    assert asyncio.run(pool.warm_up("http://127.0.0.1:9", connections=2)) == 0
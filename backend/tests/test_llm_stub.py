@@ -0,0 +1,145 @@
+"""Tests for the OpenAI-compatible LLM stub server."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.llm_stub import StubConfig, create_app
+from app.services import grok_service
+from app.services.json_stream import JsonArrayStreamParser
+
+
+def _completion(client, focus_area="voice_ai_ux", **body):
+    prompt = grok_service.build_discovery_prompt(focus_area)
+    return client.post(
+        "/chat/completions",
+        json={"model": "grok-3", "messages": [{"role": "user", "content": prompt}], **body},
+    )
+
+
+def test_returns_canned_trends_for_prompted_area():
+    """The focus area is read from the discovery prompt."""
+    client = TestClient(create_app(StubConfig()))
+
+    response = _completion(client, "durable_runtime")
+
+    assert response.status_code == 200
+    body = response.json()
+    trends = grok_service.parse_trends("durable_runtime", body["choices"][0]["message"]["content"])
+    assert [t["tool_name"] for t in trends] == ["Temporal", "InstantFlow"]
+    assert body["usage"]["completion_tokens"] > 0
+
+
+def test_injects_rate_limits_with_retry_after():
+    """429s carry the configured Retry-After and are counted."""
+    client = TestClient(create_app(StubConfig(error_rate_429=1, retry_after_seconds=2.5)))
+
+    response = _completion(client)
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2.5"
+    assert client.get("/stub/stats").json() == {"requests": 1, "429": 1}
+
+
+def test_faults_are_reproducible_with_a_seed():
+    """The same seed yields the same sequence of outcomes."""
+
+    def outcomes():
+        client = TestClient(create_app(StubConfig(error_rate_500=0.5, seed=7)))
+        return [_completion(client).status_code for _ in range(20)]
+
+    first = outcomes()
+    assert first == outcomes()
+    assert {200, 500} <= set(first)
+
+
+def test_truncated_json_keeps_complete_elements():
+    """Truncation cuts the array mid-element, as a length-limited reply would."""
+    client = TestClient(create_app(StubConfig(truncate_rate=1)))
+
+    content = _completion(client).json()["choices"][0]["message"]["content"]
+
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(content)
+    parser = JsonArrayStreamParser()
+    assert [e["tool_name"] for e in parser.feed(content)] == ["LiveKit Agents"]
+
+
+def test_answers_unchanged_for_previous_tools():
+    """Incremental prompts get short unchanged entries for listed tools."""
+    client = TestClient(create_app(StubConfig(unchanged_rate=1)))
+    previous = [{"tool_name": "LiveKit Agents", "classification": "signal", "confidence_score": 88}]
+    prompt = grok_service.build_discovery_prompt("voice_ai_ux", previous)
+
+    response = client.post("/chat/completions", json={"messages": [{"role": "user", "content": prompt}]})
+
+    entries = json.loads(response.json()["choices"][0]["message"]["content"])
+    assert entries[0] == {"tool_name": "LiveKit Agents", "unchanged": True}
+    assert [e["tool_name"] for e in entries[1:]] == ["EchoVoice"]
+
+
+def test_streams_chunks_and_usage():
+    """Streamed replies reassemble to the full array and end with [DONE]."""
+    client = TestClient(create_app(StubConfig(stream_chunk_chars=10)))
+
+    response = _completion(client, stream=True)
+
+    events = [line[6:] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(e) for e in events[:-1]]
+    content = "".join(c["choices"][0]["delta"].get("content") or "" for c in chunks)
+    assert [t["tool_name"] for t in json.loads(content)] == ["LiveKit Agents", "EchoVoice"]
+    assert chunks[-1]["usage"]["completion_tokens"] > 0
+
+
+def test_runtime_config_update():
+    """POST /stub/config changes only the given settings."""
+    client = TestClient(create_app(StubConfig(latency_ms=5)))
+
+    config = client.post("/stub/config", json={"error_rate_500": 1}).json()
+
+    assert config["latency_ms"] == 5
+    assert _completion(client).status_code == 500
+
+
+def test_invalid_config_update_rejected():
+    """POST /stub/config answers 422 for invalid settings and keeps the old ones."""
+    client = TestClient(create_app(StubConfig(latency_ms=5)))
+
+    response = client.post("/stub/config", json={"error_rate_500": 2, "latency_ms": 50})
+
+    assert response.status_code == 422
+    assert client.get("/stub/config").json()["latency_ms"] == 5
+
+
+def test_grok_service_runs_against_stub(stub_url):
+    """The plain and streaming analysis paths parse the stub's replies."""
+
+    async def analyze():
+        return (
+            await grok_service.analyze_focus_area_async("agent_orchestration"),
+            await grok_service.stream_focus_area_async("durable_runtime"),
+        )
+
+    with patch.object(grok_service, "LITELLM_BASE_URL", stub_url):
+        trends, streamed = asyncio.run(analyze())
+
+    assert [t["tool_name"] for t in trends] == ["LangGraph", "AgentVerse Pro"]
+    assert [t["tool_name"] for t in streamed] == ["Temporal", "InstantFlow"]
+
+
+def test_answers_batched_prompts_keyed_by_area():
+    """A batched prompt gets one object with every requested area's trends."""
+    client = TestClient(create_app(StubConfig()))
+    areas = list(grok_service.FOCUS_AREAS)
+    prompt = grok_service.build_batch_prompt(areas)
+
+    response = client.post("/chat/completions", json={"messages": [{"role": "user", "content": prompt}]})
+
+    content = response.json()["choices"][0]["message"]["content"]
+    result = grok_service.split_batch_response(content, areas)
+    assert [t["tool_name"] for t in result["durable_runtime"]] == ["Temporal", "InstantFlow"]
+    assert all(result[area] for area in areas)
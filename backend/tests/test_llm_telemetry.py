@@ -0,0 +1,167 @@
+"""Tests for LLM call telemetry."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, LLMCall
+from app.services import llm_telemetry as telemetry_module
+from app.services.grok_service import call_grok_with_retry
+from app.services.llm_telemetry import (
+    LLMTelemetry,
+    current_run_id,
+    llm_telemetry,
+    summarize_runs,
+    usage_tokens,
+)
+
+
+def _session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _response(prompt_tokens, completion_tokens):
+    return SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    )
+
+
+def test_usage_tokens():
+    """Test token counts are read from response usage when present."""
+    assert usage_tokens(_response(120, 30)) == (120, 30)
+    assert usage_tokens(SimpleNamespace()) == (None, None)
+
+
+def test_record_uses_configured_prices(monkeypatch):
+    """Test configured per-1K prices produce the cost estimate."""
+    monkeypatch.setattr(telemetry_module, "LLM_PROMPT_COST_PER_1K", "0.003")
+    monkeypatch.setattr(telemetry_module, "LLM_COMPLETION_COST_PER_1K", "0.015")
+    telemetry = LLMTelemetry()
+
+    call = telemetry.record("openai/grok-3", "success", 850, "voice_ai_ux", 1, _response(1000, 200))
+
+    assert call["cost_usd"] == 0.006
+    assert call["prompt_tokens"] == 1000
+
+
+def test_flush_persists_and_attributes_run():
+    """Test buffered calls are written with the run id active when recorded."""
+    telemetry = LLMTelemetry()
+    Session = _session_factory()
+
+    token = current_run_id.set("job-1")
+    telemetry.record("m", "error", 100, "voice_ai_ux", 1, error="timeout")
+    telemetry.record("m", "success", 300, "voice_ai_ux", 2, _response(10, 5))
+    current_run_id.reset(token)
+    telemetry.record("m", "cache_hit", 0, "durable_runtime", 0)
+
+    assert telemetry.flush(Session) == 3
+    assert telemetry.pending() == []
+    with Session() as db:
+        rows = db.query(LLMCall.run_id, LLMCall.attempt, LLMCall.outcome).order_by(LLMCall.id).all()
+    assert rows == [("job-1", 1, "error"), ("job-1", 2, "success"), (None, 0, "cache_hit")]
+
+
+def test_summarize_runs_percentiles():
+    """Test per-run aggregates exclude cache hits from latency percentiles."""
+    telemetry = LLMTelemetry()
+    Session = _session_factory()
+    token = current_run_id.set("job-1")
+    for latency in (100, 200, 300, 400, 1000):
+        telemetry.record("m", "success", latency, "voice_ai_ux", 1, _response(10, 5))
+    telemetry.record("m", "cache_hit", 0, "voice_ai_ux", 0)
+    current_run_id.reset(token)
+    telemetry.flush(Session)
+
+    with Session() as db:
+        [run] = summarize_runs(db)
+
+    assert run["run_id"] == "job-1"
+    assert (run["calls"], run["cache_hits"], run["errors"]) == (6, 1, 0)
+    assert (run["p50_latency_ms"], run["p95_latency_ms"]) == (300, 1000)
+    assert (run["prompt_tokens"], run["completion_tokens"]) == (50, 25)
+
+
+def test_summarize_runs_in_two_queries():
+    """Test several runs are summarized with one aggregate and one latency query."""
+    Session = _session_factory()
+    with Session() as db:
+        db.add_all(
+            [
+                _call("job-old", "2026-02-01T08:00:00", 100, cost_usd=0.25),
+                _call("job-old", "2026-02-01T08:00:05", 300, outcome="error"),
+                _call("job-new", "2026-02-08T08:00:00", 0, outcome="cache_hit"),
+                _call(None, "2026-02-05T08:00:00", 50),
+            ]
+        )
+        db.commit()
+
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(1))
+        runs = summarize_runs(db)
+
+    assert len(statements) == 2
+    assert [run["run_id"] for run in runs] == ["job-new", None, "job-old"]
+    old = runs[2]
+    assert (old["calls"], old["errors"], old["cost_usd"]) == (2, 1, 0.25)
+    assert (old["first_call"], old["p95_latency_ms"]) == ("2026-02-01T08:00:00", 300)
+    assert runs[0]["p50_latency_ms"] is None and runs[0]["cost_usd"] is None
+    assert runs[1]["p95_latency_ms"] == 50
+
+
+def _call(run_id, started_at, latency_ms, outcome="success", cost_usd=None):
+    return LLMCall(
+        run_id=run_id,
+        model="m",
+        attempt=1,
+        outcome=outcome,
+        started_at=started_at,
+        latency_ms=latency_ms,
+        cost_usd=cost_usd,
+    )
+
+
+@patch("app.services.grok_service.asyncio.sleep", return_value=None)
+@patch("app.services.grok_service.litellm.acompletion")
+def test_grok_calls_record_each_attempt(mock_completion, mock_sleep):
+    """Test retries are recorded with their attempt number and outcome."""
+    response = MagicMock()
+    response.choices[0].message.content = "[]"
+    response.usage = SimpleNamespace(prompt_tokens=900, completion_tokens=40)
+    mock_completion.side_effect = [Exception("rate limited"), response]
+
+    call_grok_with_retry("prompt", focus_area="durable_runtime")
+
+    calls = llm_telemetry.pending()
+    assert [(c["attempt"], c["outcome"]) for c in calls] == [(1, "error"), (2, "success")]
+    assert calls[0]["error"] == "rate limited"
+    assert calls[1]["focus_area"] == "durable_runtime"
+    assert calls[1]["prompt_tokens"] == 900
+
+
+@patch("app.services.grok_service.LLM_HEDGE_AFTER_MS", 20)
+@patch("app.services.grok_service.litellm.acompletion")
+def test_hedged_calls_record_each_request(mock_completion):
+    """Test a hedge and the request it beat are both recorded."""
+    response = MagicMock()
+    response.choices[0].message.content = "[]"
+    response.usage = SimpleNamespace(prompt_tokens=900, completion_tokens=40)
+
+    async def respond(**kwargs):
+        if mock_completion.call_count == 1:
+            await asyncio.sleep(1)
+        return response
+
+    mock_completion.side_effect = respond
+
+    call_grok_with_retry("prompt", focus_area="durable_runtime")
+
+    calls = llm_telemetry.pending()
+    assert sorted(c["outcome"] for c in calls) == ["cancelled", "success"]
+    assert {c["attempt"] for c in calls} == {1}
+    assert {c["focus_area"] for c in calls} == {"durable_runtime"}
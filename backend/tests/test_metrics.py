@@ -0,0 +1,88 @@
+"""Tests for request latency metrics and Server-Timing headers."""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import Histogram, timed
+from app.services.radar_store import save_radar
+from tests.conftest import make_trend
+
+
+@pytest.fixture
+def client(session_factory):
+    """Client over the in-memory database, seeded with one radar."""
+    with session_factory() as db:
+        save_radar(
+            db,
+            "2026-02-06",
+            [
+                make_trend(
+                    "LiveKit",
+                    confidence_score=90,
+                    technical_insight="WebRTC transport",
+                    signal_evidence=["180ms latency"],
+                    timestamp="2026-02-06T09:00:00Z",
+                )
+            ],
+        )
+    return TestClient(app)
+
+
+def _server_timing(response) -> dict:
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r"(\w+);dur=([\d.]+)", response.headers["server-timing"])
+    }
+
+
+def test_radar_response_splits_db_serialize_and_total(client):
+    """A rendered radar reports DB, serialization and total time."""
+    response = client.get("/api/radar", params={"focus_area": "voice_ai_ux"})
+
+    assert response.status_code == 200
+    timing = _server_timing(response)
+    assert set(timing) == {"db", "serialize", "total"}
+    assert timing["total"] >= timing["db"] + timing["serialize"] - 0.2
+
+
+def test_metrics_expose_route_templates(client):
+    """Histograms are labelled by route template, not the requested path."""
+    client.get("/api/radar")
+    client.get("/api/tools/LiveKit/timeline")
+    client.get("/no-such-path")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'route="/api/radar",status="200",le="+Inf"}' in body
+    assert 'route="/api/tools/{name}/timeline"' in body
+    assert "LiveKit" not in body
+    assert 'route="unmatched",status="404"' in body
+
+
+def test_timed_is_noop_outside_requests():
+    """Serialization helpers work unchanged when no request is active."""
+    with timed("serialize"):
+        pass
+
+
+def test_histogram_buckets_are_cumulative():
+    """Each observation counts in every bucket at or above its value."""
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 3.0)
+
+    lines = histogram.expose()
+
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+    assert 'demo_seconds_sum{route="/a"} 3.55' in lines
@@ -0,0 +1,260 @@
+"""Tests for schema migrations of existing radar.db files."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app import migrations
+from app.migrations import SCHEMA_VERSION, get_schema_version, migrate
+from app.models import Base
+
+LEGACY_TRENDS_DDL = """
+CREATE TABLE trends (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    radar_date VARCHAR NOT NULL,
+    focus_area VARCHAR NOT NULL,
+    tool_name VARCHAR NOT NULL,
+    classification VARCHAR NOT NULL,
+    confidence_score INTEGER NOT NULL,
+    technical_insight TEXT NOT NULL,
+    signal_evidence TEXT,
+    noise_indicators TEXT,
+    architectural_verdict BOOLEAN NOT NULL,
+    timestamp VARCHAR NOT NULL
+)
+"""
+
+
+def _legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'radar.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(LEGACY_TRENDS_DDL)
+        for radar_date, tool in [("2026-01-30", "A"), ("2026-01-30", "B"), ("2026-02-06", "C")]:
+            conn.execute(
+                text(
+                    "INSERT INTO trends (radar_date, focus_area, tool_name, classification, "
+                    "confidence_score, technical_insight, signal_evidence, noise_indicators, "
+                    "architectural_verdict, timestamp) VALUES (:d, 'voice_ai_ux', :t, 'signal', "
+                    "80, 'insight', '[]', '[]', 1, :d || 'T08:00:00Z')"
+                ),
+                {"d": radar_date, "t": tool},
+            )
+    return engine
+
+
+def test_migrates_legacy_database(tmp_path):
+    """Test a pre-index radar.db gains radar_day, indexes and radar_runs."""
+    engine = _legacy_engine(tmp_path)
+
+    Base.metadata.create_all(bind=engine)
+    assert migrate(engine) == SCHEMA_VERSION
+
+    inspector = inspect(engine)
+    assert "radar_day" in {c["name"] for c in inspector.get_columns("trends")}
+    assert "ix_trends_date_area_class" in {i["name"] for i in inspector.get_indexes("trends")}
+
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == SCHEMA_VERSION
+        runs = conn.execute(
+            text("SELECT radar_date, trends_count FROM radar_runs ORDER BY radar_day")
+        ).all()
+        days = conn.execute(text("SELECT DISTINCT radar_day FROM trends ORDER BY 1")).scalars().all()
+
+        payload = conn.execute(
+            text("SELECT payload FROM radar_runs WHERE radar_date = '2026-01-30'")
+        ).scalar()
+
+    assert runs == [("2026-01-30", 2), ("2026-02-06", 1)]
+    assert days == ["2026-01-30", "2026-02-06"]
+    assert [t["tool_name"] for t in json.loads(payload)["trends"]] == ["A", "B"]
+
+
+def test_migration_is_idempotent(tmp_path):
+    """Test running migrations twice leaves one run per radar date."""
+    engine = _legacy_engine(tmp_path)
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA user_version = 0")
+    migrate(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM radar_runs")).scalar() == 2
+
+
+def test_failed_step_keeps_earlier_steps(tmp_path, monkeypatch):
+    """Test each step commits on its own, so a failure resumes from the last good version."""
+    engine = _legacy_engine(tmp_path)
+    Base.metadata.create_all(bind=engine)
+
+    def fail(conn):
+        raise RuntimeError("step failed")
+
+    with monkeypatch.context() as patched:
+        patched.setitem(migrations.MIGRATIONS, 3, fail)
+        with pytest.raises(RuntimeError):
+            migrate(engine)
+
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == 2
+        assert conn.execute(text("SELECT COUNT(*) FROM radar_runs")).scalar() == 2
+    assert migrate(engine) == SCHEMA_VERSION
+
+
+def test_latest_lookup_uses_radar_runs_index(tmp_path):
+    """Test the latest radar query plan is a single index search."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT radar_date FROM radar_runs "
+            "WHERE status = 'complete' ORDER BY radar_day DESC LIMIT 1"
+        ).all()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_radar_runs_status_day" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_migration_registers_tools(tmp_path):
+    """Test existing trends are linked to tool rows by the v3 step."""
+    engine = _legacy_engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO trends (radar_date, focus_area, tool_name, classification, "
+                "confidence_score, technical_insight, architectural_verdict, timestamp) "
+                "VALUES ('2026-02-06', 'voice_ai_ux', 'a', 'noise', 40, 'insight', 0, "
+                "'2026-02-06T08:00:00Z')"
+            )
+        )
+
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+
+    with engine.connect() as conn:
+        tools = conn.execute(
+            text("SELECT canonical_name, display_name, first_seen, last_seen FROM tools ORDER BY 1")
+        ).all()
+        unlinked = conn.execute(text("SELECT COUNT(*) FROM trends WHERE tool_id IS NULL")).scalar()
+
+    assert tools == [
+        ("a", "A", "2026-01-30", "2026-02-06"),
+        ("b", "B", "2026-01-30", "2026-01-30"),
+        ("c", "C", "2026-02-06", "2026-02-06"),
+    ]
+    assert unlinked == 0
+    assert "ix_trends_tool_date" in {i["name"] for i in inspect(engine).get_indexes("trends")}
+
+
+def test_migration_builds_search_index(tmp_path):
+    """Test existing trends are indexed for full-text search by the v4 step."""
+    engine = _legacy_engine(tmp_path)
+
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+
+    with engine.begin() as conn:
+        matches = conn.execute(
+            text("SELECT rowid FROM trends_fts WHERE trends_fts MATCH 'insight'")
+        ).all()
+        conn.exec_driver_sql("UPDATE trends SET technical_insight = 'Rewritten' WHERE tool_name = 'A'")
+        rewritten = conn.execute(
+            text("SELECT COUNT(*) FROM trends_fts WHERE trends_fts MATCH 'rewritten'")
+        ).scalar()
+
+    assert len(matches) == 3
+    assert rewritten == 1
+
+
+def test_migration_indexes_evidence_text(tmp_path):
+    """Test the v8 step reindexes escaped JSON evidence as plain text."""
+    engine = _legacy_engine(tmp_path)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE trends SET signal_evidence = '[\"Latenz \\u00fcber 200ms\"]' "
+            "WHERE tool_name = 'A'"
+        )
+
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+
+    with engine.connect() as conn:
+        snippets = conn.execute(
+            text(
+                "SELECT snippet(trends_fts, 2, '[', ']', '', 8) FROM trends_fts "
+                "WHERE trends_fts MATCH 'über'"
+            )
+        ).scalars().all()
+
+    assert snippets == ["Latenz [über] 200ms"]
+
+
+def test_migration_splits_evidence(tmp_path):
+    """Test the v5 step fills trend_evidence from existing JSON arrays."""
+    engine = _legacy_engine(tmp_path)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE trends SET signal_evidence = '[\"SLA\", \"Benchmarks\"]', "
+            "noise_indicators = '[null]' WHERE tool_name = 'A'"
+        )
+
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA user_version = 4")
+    migrate(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT kind, position, text FROM trend_evidence ORDER BY position")
+        ).all()
+
+    assert rows == [("signal", 0, "SLA"), ("signal", 1, "Benchmarks")]
+
+
+def test_init_db_skips_current_schema(tmp_path, monkeypatch):
+    """Test a database already at SCHEMA_VERSION gets no create_all or migrate on boot."""
+    import app.database as database
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'radar.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+
+    assert database.init_db() is True
+    assert "radar_runs" in inspect(engine).get_table_names()
+
+    calls = []
+    monkeypatch.setattr(database, "migrate", calls.append)
+    assert database.init_db() is False
+    assert calls == []
+
+
+def test_migration_keeps_one_active_refresh(tmp_path):
+    """Test the v7 step interrupts all but the newest active job before indexing."""
+    engine = _legacy_engine(tmp_path)
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_refresh_jobs_single_active")
+        for job_id, created_at in (("old", "2026-02-01"), ("new", "2026-02-02")):
+            conn.exec_driver_sql(
+                "INSERT INTO refresh_jobs (id, status, created_at) "
+                f"VALUES ('{job_id}', 'running', '{created_at}')"
+            )
+        conn.exec_driver_sql("PRAGMA user_version = 6")
+    migrate(engine)
+
+    with engine.connect() as conn:
+        statuses = dict(conn.execute(text("SELECT id, status FROM refresh_jobs")).all())
+        indexes = conn.execute(
+            text(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'refresh_jobs'"
+            )
+        ).scalars().all()
+    assert statuses == {"old": "interrupted", "new": "running"}
+    assert "ix_refresh_jobs_single_active" in indexes
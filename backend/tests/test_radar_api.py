@@ -8,8 +8,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import get_db
+from app.database import get_db, get_write_db
 from app.models import Base, Trend
+from app.services.radar_cache import radar_cache
 
 
 # Create test database
@@ -32,6 +33,7 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_write_db] = override_get_db
 client = TestClient(app)
 
 
@@ -39,6 +41,7 @@ client = TestClient(app)
 def setup_database():
     """Set up test database before each test."""
     Base.metadata.create_all(bind=engine)
+    radar_cache.invalidate()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -147,6 +150,49 @@ def test_get_radar_by_date():
     assert data["trends"][0]["tool_name"] == "NewerTool"
 
 
+def test_get_radar_etag_not_modified():
+    """Test radar endpoint sends a strong ETag and honors If-None-Match."""
+    response = client.get("/api/radar")
+    etag = response.headers["etag"]
+    assert etag.startswith('"')
+
+    response = client.get("/api/radar", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_get_radar_cache_invalidated_on_refresh():
+    """Test a committed refresh invalidates the cached radar and its ETag."""
+    from unittest.mock import patch
+
+    first = client.get("/api/radar")
+    assert first.json()["trends"] == []
+
+    mock_result = {
+        "radar_date": "2026-02-03",
+        "trends": [
+            {
+                "focus_area": "durable_runtime",
+                "tool_name": "CachedTool",
+                "classification": "signal",
+                "confidence_score": 77,
+                "technical_insight": "Checkpointing",
+                "signal_evidence": [],
+                "noise_indicators": [],
+                "architectural_verdict": True,
+                "timestamp": "2026-02-03T12:00:00Z",
+            }
+        ],
+    }
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=mock_result):
+        client.post("/api/radar/refresh")
+
+    response = client.get("/api/radar", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 200
+    assert response.json()["trends"][0]["tool_name"] == "CachedTool"
+
+
 def test_response_time():
     """Test API responds within acceptable time (<200ms)."""
     import time
@@ -180,14 +226,22 @@ def test_refresh_endpoint_with_mock():
         ],
     }
 
-    with patch("app.services.grok_service.run_full_analysis", return_value=mock_result):
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=mock_result):
         response = client.post("/api/radar/refresh")
 
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+
+    # Background worker has finished by the time TestClient returns
+    response = client.get(f"/api/radar/refresh/{job['job_id']}")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "success"
     assert data["trends_count"] == 1
     assert data["radar_date"] == "2026-02-03"
+    assert data["finished_at"] is not None
+    assert data["analysis_ms"] is not None
 
     # Verify data was persisted
     response = client.get("/api/radar")
@@ -205,11 +259,11 @@ def test_refresh_endpoint_empty_results():
         "trends": [],
     }
 
-    with patch("app.services.grok_service.run_full_analysis", return_value=mock_result):
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=mock_result):
         response = client.post("/api/radar/refresh")
 
-    assert response.status_code == 200
-    data = response.json()
+    assert response.status_code == 202
+    data = client.get(f"/api/radar/refresh/{response.json()['job_id']}").json()
     assert data["status"] == "warning"
     assert data["trends_count"] == 0
 
@@ -254,13 +308,517 @@ def test_refresh_replaces_existing_data():
         ],
     }
 
-    with patch("app.services.grok_service.run_full_analysis", return_value=mock_result):
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=mock_result):
         response = client.post("/api/radar/refresh")
 
-    assert response.status_code == 200
+    assert response.status_code == 202
 
     # Verify old data was replaced
     response = client.get("/api/radar?date_param=2026-02-03")
     data = response.json()
     assert len(data["trends"]) == 1
     assert data["trends"][0]["tool_name"] == "NewTool"
+
+
+def test_refresh_job_reports_area_progress():
+    """Test refresh job records per focus area progress from the worker."""
+    from unittest.mock import patch
+
+    async def fake_analysis(on_progress=None, **kwargs):
+        await on_progress("voice_ai_ux", {"status": "done", "trends_count": 0, "duration_ms": 12})
+        return {"radar_date": "2026-02-03", "trends": []}
+
+    with patch("app.services.grok_service.run_full_analysis_async", side_effect=fake_analysis):
+        job_id = client.post("/api/radar/refresh").json()["job_id"]
+
+    data = client.get(f"/api/radar/refresh/{job_id}").json()
+    assert data["focus_areas"]["voice_ai_ux"] == {
+        "status": "done",
+        "trends_count": 0,
+        "duration_ms": 12,
+        "first_trend_ms": None,
+    }
+    assert data["focus_areas"]["durable_runtime"]["status"] == "pending"
+
+
+def test_refresh_job_failure_is_recorded():
+    """Test analysis errors mark the job failed instead of raising."""
+    from unittest.mock import patch
+
+    with patch(
+        "app.services.grok_service.run_full_analysis_async",
+        side_effect=RuntimeError("proxy down"),
+    ):
+        job_id = client.post("/api/radar/refresh").json()["job_id"]
+
+    data = client.get(f"/api/radar/refresh/{job_id}").json()
+    assert data["status"] == "failed"
+    assert "proxy down" in data["message"]
+
+
+def test_cancelled_refresh_job_is_interrupted():
+    """Test a cancelled job is finalized so it can't block later refreshes."""
+    import asyncio
+    from unittest.mock import patch
+
+    from app.services.refresh_jobs import create_job, get_job, run_refresh_job
+
+    db = TestingSessionLocal()
+    _finish_active_jobs(db)
+    job = create_job(db)
+
+    with patch(
+        "app.services.grok_service.run_full_analysis_async",
+        side_effect=asyncio.CancelledError(),
+    ):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run_refresh_job(job.id, engine))
+
+    db.expire_all()
+    assert get_job(db, job.id).status == "interrupted"
+    assert create_job(db) is not None
+    _finish_active_jobs(db)
+    db.close()
+
+
+def test_refresh_job_not_found():
+    """Test unknown job ids return 404."""
+    response = client.get("/api/radar/refresh/does-not-exist")
+    assert response.status_code == 404
+
+
+def test_interrupted_jobs_marked_on_restart():
+    """Test only jobs whose owning process exited are marked interrupted."""
+    import os
+    import socket
+    import subprocess
+    import sys
+
+    from app.services.refresh_jobs import (
+        create_job,
+        get_job,
+        mark_interrupted_jobs,
+        process_owner,
+    )
+
+    host = socket.gethostname()
+    exited = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True
+    )
+    cases = [
+        (f"{host}:{os.getppid()}:sibling", "queued"),  # another worker, still running
+        (process_owner(), "queued"),  # this process starting a second app
+        (f"{host}:{exited.stdout.strip()}:gone", "interrupted"),  # exited worker
+        (f"{host}:{os.getpid()}:earlier", "interrupted"),  # earlier boot that had our pid
+        (None, "interrupted"),  # created before owners were recorded
+    ]
+
+    db = TestingSessionLocal()
+    _finish_active_jobs(db)
+    for owner, expected in cases:
+        job = create_job(db)
+        job.owner = owner
+        db.commit()
+        assert mark_interrupted_jobs(db) == (expected == "interrupted")
+        assert get_job(db, job.id).status == expected
+        _finish_active_jobs(db)
+    db.close()
+
+
+def test_single_active_job_across_processes():
+    """Test the unique index refuses a second queued job, as from another worker."""
+    from app.services.refresh_jobs import create_job
+
+    db = TestingSessionLocal()
+    _finish_active_jobs(db)
+    first = create_job(db)
+    assert first is not None
+    assert create_job(db) is None
+
+    first.status = "success"
+    db.commit()
+    assert create_job(db) is not None
+    _finish_active_jobs(db)
+    db.close()
+
+
+def _finish_active_jobs(db):
+    from app.models import RefreshJob
+
+    db.query(RefreshJob).filter(RefreshJob.status.in_(("queued", "running"))).update(
+        {RefreshJob.status: "success"}, synchronize_session=False
+    )
+    db.commit()
+
+
+def test_refresh_records_radar_run():
+    """Test a successful refresh records a radar_runs row used for latest lookup."""
+    from unittest.mock import patch
+    from app.models import RadarRun
+
+    mock_result = {
+        "radar_date": "2026-02-10",
+        "trends": [
+            {
+                "focus_area": "agent_orchestration",
+                "tool_name": "RunTool",
+                "classification": "noise",
+                "confidence_score": 30,
+                "technical_insight": "Hype",
+                "signal_evidence": [],
+                "noise_indicators": ["marketing"],
+                "architectural_verdict": False,
+                "timestamp": "2026-02-10T12:00:00Z",
+            }
+        ],
+    }
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=mock_result):
+        client.post("/api/radar/refresh")
+
+    db = TestingSessionLocal()
+    run = db.query(RadarRun).filter(RadarRun.radar_date == "2026-02-10").one()
+    trend = db.query(Trend).filter(Trend.radar_date == "2026-02-10").one()
+    db.close()
+    assert run.status == "complete"
+    assert run.trends_count == 1
+    assert str(trend.radar_day) == "2026-02-10"
+    assert client.get("/api/radar").json()["radar_date"] == "2026-02-10"
+
+
+def test_get_radar_serves_stored_snapshot():
+    """Test the read path returns the snapshot bytes rendered at refresh time."""
+    from unittest.mock import patch
+    from app.api.radar import RadarResponse
+    from app.models import RadarRun
+
+    mock_result = {
+        "radar_date": "2026-02-10",
+        "trends": [
+            {
+                "focus_area": "voice_ai_ux",
+                "tool_name": "SnapTool",
+                "classification": "signal",
+                "confidence_score": 91,
+                "technical_insight": "Sub-200ms — measured",
+                "signal_evidence": ["published benchmarks"],
+                "noise_indicators": [],
+                "architectural_verdict": True,
+                "timestamp": "2026-02-10T12:00:00Z",
+                "extra_field": "not part of the contract",
+            }
+        ],
+    }
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=mock_result):
+        client.post("/api/radar/refresh")
+
+    db = TestingSessionLocal()
+    payload = db.query(RadarRun.payload).filter(RadarRun.radar_date == "2026-02-10").scalar()
+    db.close()
+
+    response = client.get("/api/radar?date_param=2026-02-10")
+    assert response.content == payload
+    assert response.headers["content-type"] == "application/json"
+    radar = RadarResponse.model_validate_json(response.content)
+    assert radar.trends[0].technical_insight == "Sub-200ms — measured"
+    assert "extra_field" not in response.json()["trends"][0]
+
+
+def test_refresh_force_bypasses_llm_cache():
+    """Test force=true is passed through to the analysis as use_cache=False."""
+    from unittest.mock import patch
+
+    with patch(
+        "app.services.grok_service.run_full_analysis_async",
+        return_value={"radar_date": "2026-02-03", "trends": []},
+    ) as mock_analysis:
+        client.post("/api/radar/refresh?force=true")
+
+    assert mock_analysis.call_args.kwargs["use_cache"] is False
+
+
+def test_refresh_publishes_radar_delta_event():
+    """Test a committed refresh pushes a radar event with the trend diff."""
+    from unittest.mock import patch
+
+    from app.services.radar_events import radar_events
+
+    def trend(tool_name, classification, score):
+        return {
+            "focus_area": "voice_ai_ux",
+            "tool_name": tool_name,
+            "classification": classification,
+            "confidence_score": score,
+            "technical_insight": "Insight",
+            "signal_evidence": [],
+            "noise_indicators": [],
+            "architectural_verdict": classification == "signal",
+            "timestamp": "2026-02-03T12:00:00Z",
+        }
+
+    first = {"radar_date": "2026-02-03", "trends": [trend("Kept", "signal", 90), trend("Gone", "noise", 40)]}
+    second = {"radar_date": "2026-02-04", "trends": [trend("Kept", "noise", 60), trend("Fresh", "signal", 85)]}
+
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=first):
+        client.post("/api/radar/refresh")
+    last_id = radar_events.last_event_id
+    with patch("app.services.grok_service.run_full_analysis_async", return_value=second):
+        job_id = client.post("/api/radar/refresh").json()["job_id"]
+
+    events = radar_events.events_since(last_id)
+    assert [event.type for event in events] == ["radar", "refresh"]
+
+    radar = events[0].data
+    assert radar["radar_date"] == "2026-02-04"
+    assert radar["previous_radar_date"] == "2026-02-03"
+    assert radar["latest"] is True
+    assert radar["trends_count"] == 2
+    assert [t["tool_name"] for t in radar["added"]] == ["Fresh"]
+    assert [(t["tool_name"], t["classification"]) for t in radar["changed"]] == [("Kept", "noise")]
+    assert radar["removed"] == [{"focus_area": "voice_ai_ux", "tool_name": "Gone"}]
+    assert radar["etag"] == client.get("/api/radar").headers["etag"]
+
+    assert events[1].data == {
+        "job_id": job_id,
+        "status": "success",
+        "radar_date": "2026-02-04",
+        "trends_count": 2,
+    }
+
+
+def _seed_filter_radar():
+    from app.services.radar_store import save_radar
+
+    def trend(focus_area, tool_name, classification, score):
+        return {
+            "focus_area": focus_area,
+            "tool_name": tool_name,
+            "classification": classification,
+            "confidence_score": score,
+            "technical_insight": "Insight",
+            "signal_evidence": ["evidence"] if classification == "signal" else [],
+            "noise_indicators": ["hype"] if classification == "noise" else [],
+            "architectural_verdict": classification == "signal",
+            "timestamp": "2026-02-05T12:00:00Z",
+        }
+
+    db = TestingSessionLocal()
+    save_radar(
+        db,
+        "2026-02-05",
+        [
+            trend("voice_ai_ux", "VoiceSignal", "signal", 90),
+            trend("voice_ai_ux", "VoiceNoise", "noise", 30),
+            trend("durable_runtime", "RuntimeSignal", "signal", 70),
+            trend("agent_orchestration", "AgentNoise", "noise", 55),
+        ],
+    )
+    db.close()
+
+
+def test_get_radar_filters():
+    """Test focus_area, classification and min_confidence filter trends."""
+    _seed_filter_radar()
+
+    response = client.get("/api/radar?classification=signal&min_confidence=80")
+    assert [t["tool_name"] for t in response.json()["trends"]] == ["VoiceSignal"]
+
+    response = client.get("/api/radar?focus_area=voice_ai_ux&focus_area=agent_orchestration")
+    names = [t["tool_name"] for t in response.json()["trends"]]
+    assert names == ["VoiceSignal", "VoiceNoise", "AgentNoise"]
+    assert response.json()["radar_date"] == "2026-02-05"
+
+
+def test_get_radar_fields_projection():
+    """Test fields returns only the requested trend fields."""
+    _seed_filter_radar()
+
+    response = client.get("/api/radar?fields=tool_name,noise_indicators&classification=noise")
+
+    assert response.json()["trends"] == [
+        {"tool_name": "VoiceNoise", "noise_indicators": ["hype"]},
+        {"tool_name": "AgentNoise", "noise_indicators": ["hype"]},
+    ]
+
+
+def test_get_radar_unknown_field_rejected():
+    """Test unknown projection fields are a validation error."""
+    response = client.get("/api/radar?fields=tool_name,secret")
+
+    assert response.status_code == 422
+    assert "secret" in response.json()["detail"]
+
+
+def test_get_radar_empty_fields_rejected():
+    """Test a fields list naming no field is a validation error, not an empty select."""
+    for fields in (",", " , ,"):
+        response = client.get("/api/radar", params={"fields": fields})
+        assert response.status_code == 422
+
+
+def test_get_radar_grouped_shape():
+    """Test shape=grouped nests trends by focus area and classification."""
+    _seed_filter_radar()
+
+    response = client.get("/api/radar?shape=grouped&fields=tool_name,confidence_score")
+    data = response.json()
+
+    assert data["radar_date"] == "2026-02-05"
+    assert data["focus_areas"]["voice_ai_ux"] == {
+        "signal": [{"tool_name": "VoiceSignal", "confidence_score": 90}],
+        "noise": [{"tool_name": "VoiceNoise", "confidence_score": 30}],
+    }
+    assert data["focus_areas"]["durable_runtime"]["noise"] == []
+    assert "etag" in response.headers
+
+
+def test_get_radar_filtered_cache_invalidated_on_save():
+    """Test filtered responses are cached per query and dropped on refresh."""
+    _seed_filter_radar()
+    first = client.get("/api/radar?classification=noise")
+
+    assert client.get("/api/radar?classification=noise").headers["etag"] == first.headers["etag"]
+    assert client.get("/api/radar").headers["etag"] != first.headers["etag"]
+
+    from app.services.radar_store import save_radar
+
+    db = TestingSessionLocal()
+    save_radar(db, "2026-02-05", [])
+    db.close()
+
+    assert client.get("/api/radar?classification=noise").json()["trends"] == []
+
+
+def _seed_history(dates):
+    from app.services.radar_store import save_radar
+
+    db = TestingSessionLocal()
+    for radar_date in dates:
+        save_radar(
+            db,
+            radar_date,
+            [
+                {
+                    "focus_area": focus_area,
+                    "tool_name": f"{focus_area}-{radar_date}",
+                    "classification": "signal",
+                    "confidence_score": 80,
+                    "technical_insight": "Insight",
+                    "signal_evidence": ["evidence"],
+                    "noise_indicators": [],
+                    "architectural_verdict": True,
+                    "timestamp": f"{radar_date}T12:00:00Z",
+                }
+                for focus_area in ("voice_ai_ux", "durable_runtime")
+            ],
+        )
+    db.close()
+
+
+def test_radar_history_streams_ndjson_range():
+    """Test history returns one NDJSON line per trend within the range."""
+    _seed_history(["2026-01-02", "2026-01-09", "2026-01-16", "2026-01-23"])
+
+    response = client.get("/api/radar/history?from=2026-01-09&to=2026-01-16")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(t["radar_date"], t["focus_area"]) for t in lines] == [
+        ("2026-01-09", "durable_runtime"),
+        ("2026-01-09", "voice_ai_ux"),
+        ("2026-01-16", "durable_runtime"),
+        ("2026-01-16", "voice_ai_ux"),
+    ]
+    assert lines[0]["signal_evidence"] == ["evidence"]
+    assert lines[0]["tool_name"] == "durable_runtime-2026-01-09"
+
+
+def test_radar_history_open_ended_and_invalid_range():
+    """Test omitted bounds are open and an inverted range is rejected."""
+    _seed_history(["2026-01-02", "2026-01-09"])
+
+    assert len(client.get("/api/radar/history").text.splitlines()) == 4
+    assert len(client.get("/api/radar/history?from=2026-01-05").text.splitlines()) == 2
+    assert client.get("/api/radar/history?from=2026-02-01&to=2026-01-01").status_code == 422
+    assert client.get("/api/radar/history?from=not-a-date").status_code == 422
+
+
+def test_radar_history_yields_one_chunk_per_batch():
+    """Test rows are streamed in yield_per batches rather than all at once."""
+    from app.services.radar_store import iter_history_ndjson
+
+    _seed_history(["2026-01-02", "2026-01-09", "2026-01-16"])
+
+    chunks = list(iter_history_ndjson(TestingSessionLocal, batch_size=2))
+
+    assert len(chunks) == 3
+    assert all(chunk.count(b"\n") == 2 for chunk in chunks)
+
+
+def test_incremental_refresh_sends_previous_radar():
+    """Test incremental refresh passes the latest radar and records reuse counts."""
+    from unittest.mock import patch
+
+    _seed_history(["2026-01-02", "2026-01-09"])
+
+    async def fake_analysis(previous_trends=None, **kwargs):
+        carried = [dict(t, carried_forward=True) for t in previous_trends]
+        return {
+            "radar_date": "2026-01-16",
+            "trends": carried,
+            "reused_count": len(carried),
+            "reanalyzed_count": 0,
+        }
+
+    with patch(
+        "app.services.grok_service.run_full_analysis_async", side_effect=fake_analysis
+    ) as mock_analysis:
+        job_id = client.post("/api/radar/refresh?incremental=true").json()["job_id"]
+
+    previous = mock_analysis.call_args.kwargs["previous_trends"]
+    assert {t["tool_name"] for t in previous} == {
+        "voice_ai_ux-2026-01-09",
+        "durable_runtime-2026-01-09",
+    }
+
+    job = client.get(f"/api/radar/refresh/{job_id}").json()
+    assert job["status"] == "success"
+    assert (job["reused_count"], job["reanalyzed_count"]) == (2, 0)
+    assert "2 carried forward" in job["message"]
+
+
+def test_full_refresh_sends_no_previous_radar():
+    """Test a default refresh analyzes from scratch."""
+    from unittest.mock import patch
+
+    _seed_history(["2026-01-02"])
+    with patch(
+        "app.services.grok_service.run_full_analysis_async",
+        return_value={"radar_date": "2026-01-09", "trends": []},
+    ) as mock_analysis:
+        client.post("/api/radar/refresh")
+
+    assert mock_analysis.call_args.kwargs["previous_trends"] is None
+
+
+def test_llm_metrics_per_refresh_run():
+    """Test calls made during a refresh job are aggregated under its id."""
+    from unittest.mock import patch
+
+    from app.services.llm_telemetry import llm_telemetry
+
+    async def fake_analysis(**kwargs):
+        llm_telemetry.record("openai/grok-3", "error", 400, "voice_ai_ux", 1, error="boom")
+        llm_telemetry.record("openai/grok-3", "success", 900, "voice_ai_ux", 2)
+        return {"radar_date": "2026-02-03", "trends": []}
+
+    with patch("app.services.grok_service.run_full_analysis_async", side_effect=fake_analysis):
+        job_id = client.post("/api/radar/refresh").json()["job_id"]
+
+    response = client.get("/api/metrics/llm")
+
+    assert response.status_code == 200
+    [run] = response.json()["runs"]
+    assert run["run_id"] == job_id
+    assert (run["calls"], run["errors"]) == (2, 1)
+    assert run["p95_latency_ms"] == 900
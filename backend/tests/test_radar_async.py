@@ -0,0 +1,146 @@
+"""Tests for the async (aiosqlite) radar read endpoints."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.radar import RadarResponse, get_radar_async, get_refresh_job_async
+from app.database import get_async_db
+from app.models import Base, Trend
+from app.services.radar_cache import radar_cache
+from app.services.radar_store import save_radar
+from app.services.refresh_jobs import create_job
+from tests.conftest import make_trend
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    """Client for an app serving the async read endpoints over a file database."""
+    url = f"sqlite:///{tmp_path / 'radar.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            yield db
+
+    app = FastAPI()
+    app.add_api_route("/api/radar", get_radar_async, response_model=RadarResponse)
+    app.add_api_route("/api/radar/refresh/{job_id}", get_refresh_job_async)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    radar_cache.invalidate()
+
+    yield TestClient(app), sessionmaker(bind=sync_engine)
+
+    sync_engine.dispose()
+
+
+def test_async_get_radar_empty(async_client):
+    """Test async radar endpoint returns empty trends when no data."""
+    client, _ = async_client
+    response = client.get("/api/radar")
+    assert response.status_code == 200
+    assert response.json()["trends"] == []
+
+
+def test_async_get_radar_snapshot_and_etag(async_client):
+    """Test async radar endpoint serves snapshots and honors If-None-Match."""
+    client, session_factory = async_client
+    with session_factory() as db:
+        save_radar(db, "2026-01-30", [make_trend("OldTool")])
+        save_radar(db, "2026-02-06", [make_trend("NewTool")])
+
+    response = client.get("/api/radar")
+    assert response.json()["radar_date"] == "2026-02-06"
+    assert response.json()["trends"][0]["tool_name"] == "NewTool"
+
+    response = client.get("/api/radar?date_param=2026-01-30")
+    assert response.json()["trends"][0]["tool_name"] == "OldTool"
+
+    etag = response.headers["etag"]
+    response = client.get("/api/radar?date_param=2026-01-30", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_async_get_radar_without_snapshot(async_client):
+    """Test async radar endpoint renders rows written without a run record."""
+    client, session_factory = async_client
+    with session_factory() as db:
+        db.add(
+            Trend(
+                radar_date="2026-01-30",
+                focus_area="durable_runtime",
+                tool_name="RowTool",
+                classification="noise",
+                confidence_score=40,
+                technical_insight="Hype",
+                signal_evidence=json.dumps([]),
+                noise_indicators=json.dumps(["marketing"]),
+                architectural_verdict=False,
+                timestamp="2026-01-30T08:00:00Z",
+            )
+        )
+        db.commit()
+
+    data = client.get("/api/radar").json()
+    assert data["radar_date"] == "2026-01-30"
+    assert data["trends"][0]["noise_indicators"] == ["marketing"]
+
+
+def test_async_get_refresh_job(async_client):
+    """Test async job status endpoint."""
+    client, session_factory = async_client
+    with session_factory() as db:
+        job_id = create_job(db).id
+
+    assert client.get(f"/api/radar/refresh/{job_id}").json()["status"] == "queued"
+    assert client.get("/api/radar/refresh/missing").status_code == 404
+
+
+def test_async_get_radar_filtered_grouped(async_client):
+    """Test async radar endpoint applies filters and the grouped shape."""
+    client, Session = async_client
+    low = make_trend("LowTool", confidence_score=40)
+    with Session() as db:
+        save_radar(db, "2026-02-06", [make_trend("HighTool"), low])
+
+    response = client.get("/api/radar?min_confidence=50&shape=grouped&fields=tool_name")
+
+    assert response.json() == {
+        "radar_date": "2026-02-06",
+        "focus_areas": {"voice_ai_ux": {"signal": [{"tool_name": "HighTool"}], "noise": []}},
+    }
+
+
+def test_async_engine_disposed_on_shutdown(tmp_path, monkeypatch):
+    """Test the lifespan closes the lazily created async engine on shutdown."""
+    import app.database as database
+    import app.main as main
+    from app.services.llm_telemetry import llm_telemetry
+
+    url = f"sqlite:///{tmp_path / 'radar.db'}"
+    sync_engine = create_engine(url)
+    monkeypatch.setattr(database, "engine", sync_engine)
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=sync_engine))
+    monkeypatch.setattr(llm_telemetry, "_session_factory", llm_telemetry._session_factory)
+    monkeypatch.setattr(database, "DATABASE_URL", url)
+    monkeypatch.setattr(
+        database, "ASYNC_DATABASE_URL", url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    )
+    monkeypatch.setattr(database, "_async_session_factory", None)
+    disposed = []
+
+    with TestClient(main.app):
+        engine = database.get_async_session_factory().kw["bind"]
+        event.listen(engine.sync_engine, "engine_disposed", disposed.append)
+
+    assert disposed == [engine.sync_engine]
+    assert database._async_session_factory is None
+    sync_engine.dispose()
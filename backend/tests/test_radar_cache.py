@@ -0,0 +1,103 @@
+"""Tests for the in-process radar response cache."""
+
+import asyncio
+import threading
+import time
+
+from app.services.radar_cache import RadarCache, etag_matches, make_etag
+
+
+def test_concurrent_misses_share_one_load():
+    """Test concurrent misses for the same key run the loader once."""
+    cache = RadarCache(ttl_seconds=60)
+    calls = 0
+
+    def loader():
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return b'{"radar_date": "2026-02-03", "trends": []}'
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("2026-02-03", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert len({entry.etag for entry in results}) == 1
+
+
+def test_invalidate_forces_reload():
+    """Test invalidate drops entries so the next read reloads."""
+    cache = RadarCache(ttl_seconds=60)
+    bodies = iter([b"first", b"second"])
+
+    first = cache.get_or_load(None, lambda: next(bodies))
+    cache.invalidate()
+    second = cache.get_or_load(None, lambda: next(bodies))
+
+    assert first.body == b"first"
+    assert second.body == b"second"
+    assert first.etag != second.etag
+
+
+def test_expired_entries_reload():
+    """Test entries past their TTL are reloaded."""
+    cache = RadarCache(ttl_seconds=0)
+    calls = 0
+
+    def loader():
+        nonlocal calls
+        calls += 1
+        return b"body"
+
+    cache.get_or_load("key", loader)
+    cache.get_or_load("key", loader)
+
+    assert calls == 2
+
+
+def test_entries_bounded_by_lru():
+    """Test client-chosen keys cannot grow the cache past max_entries."""
+    cache = RadarCache(ttl_seconds=60, max_entries=2)
+    cache.get_or_load("a", lambda: b"a")
+    cache.get_or_load("b", lambda: b"b")
+    cache.get_or_load("a", lambda: b"stale")  # hit; "a" becomes most recent
+    cache.get_or_load("c", lambda: b"c")
+
+    assert list(cache._entries) == ["a", "c"]
+    assert cache.get_or_load("a", lambda: b"reloaded").body == b"a"
+
+
+def test_key_locks_released_after_load():
+    """Test per-key locks do not outlive the loads that needed them."""
+    cache = RadarCache(ttl_seconds=60)
+
+    async def load_async():
+        async def loader():
+            return b"x"
+
+        await cache.get_or_load_async("async", loader)
+
+    for day in range(20):
+        cache.get_or_load(f"2026-01-{day:02d}", lambda: b"{}")
+    asyncio.run(load_async())
+
+    assert cache._key_locks == {}
+    assert cache._async_key_locks == {}
+
+
+def test_etag_matching():
+    """Test If-None-Match parsing for lists, weak tags and wildcards."""
+    etag = make_etag(b"payload")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,110 @@
+"""Tests for the radar Server-Sent Events broadcaster."""
+
+import asyncio
+import threading
+
+from app.services.radar_events import (
+    SUBSCRIBER_QUEUE_SIZE,
+    RadarEvent,
+    RadarEventBroadcaster,
+    compute_radar_delta,
+    event_stream,
+    format_sse,
+)
+
+
+def trend(tool_name, classification="signal", timestamp="2026-02-03T12:00:00Z"):
+    return {
+        "focus_area": "durable_runtime",
+        "tool_name": tool_name,
+        "classification": classification,
+        "timestamp": timestamp,
+    }
+
+
+def test_compute_radar_delta():
+    """Test added, changed and removed trends are detected by key."""
+    previous = [trend("Same"), trend("Flipped"), trend("Dropped")]
+    current = [trend("Same", timestamp="2026-02-04T12:00:00Z"), trend("Flipped", "noise"), trend("New")]
+
+    delta = compute_radar_delta(previous, current)
+
+    assert [t["tool_name"] for t in delta["added"]] == ["New"]
+    assert [t["tool_name"] for t in delta["changed"]] == ["Flipped"]
+    assert delta["removed"] == [{"focus_area": "durable_runtime", "tool_name": "Dropped"}]
+
+
+def test_format_sse():
+    """Test events are encoded in the event-stream wire format."""
+    body = format_sse(RadarEvent(7, "radar", {"radar_date": "2026-02-03"}))
+
+    assert body == b'id: 7\nevent: radar\ndata: {"radar_date":"2026-02-03"}\n\n'
+
+
+def test_publish_from_thread_reaches_subscriber():
+    """Test events published from a worker thread are delivered on the loop."""
+    broadcaster = RadarEventBroadcaster()
+
+    async def scenario():
+        with broadcaster.subscribe() as queue:
+            assert broadcaster.subscriber_count == 1
+            worker = threading.Thread(target=broadcaster.publish, args=("radar", {"n": 1}))
+            worker.start()
+            event = await asyncio.wait_for(queue.get(), 5)
+            worker.join()
+        return event
+
+    event = asyncio.run(scenario())
+
+    assert event == RadarEvent(1, "radar", {"n": 1})
+    assert broadcaster.subscriber_count == 0
+
+
+def test_subscribe_resumes_after_last_event_id():
+    """Test reconnecting clients receive buffered events they missed."""
+    broadcaster = RadarEventBroadcaster()
+    for n in range(3):
+        broadcaster.publish("radar", {"n": n})
+
+    async def scenario():
+        with broadcaster.subscribe(last_event_id=1) as queue:
+            return [queue.get_nowait().id for _ in range(queue.qsize())]
+
+    assert asyncio.run(scenario()) == [2, 3]
+
+
+def test_slow_subscriber_drops_oldest_events():
+    """Test a full subscriber queue keeps the newest events."""
+    broadcaster = RadarEventBroadcaster()
+
+    async def scenario():
+        with broadcaster.subscribe() as queue:
+            for n in range(SUBSCRIBER_QUEUE_SIZE + 2):
+                broadcaster.publish("radar", {"n": n})
+            await asyncio.sleep(0)
+            return [queue.get_nowait().id for _ in range(queue.qsize())]
+
+    ids = asyncio.run(scenario())
+
+    assert len(ids) == SUBSCRIBER_QUEUE_SIZE
+    assert ids[-1] == SUBSCRIBER_QUEUE_SIZE + 2
+
+
+def test_event_stream_yields_heartbeat_and_events():
+    """Test the stream body sends retry, keep-alive comments and events."""
+    broadcaster = RadarEventBroadcaster()
+
+    async def scenario():
+        stream = event_stream(broadcaster, heartbeat_seconds=0.01)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        broadcaster.publish("refresh", {"status": "success"})
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(scenario())
+
+    assert chunks[0] == b"retry: 5000\n\n"
+    assert chunks[1] == b": keep-alive\n\n"
+    assert chunks[2].startswith(b"id: 1\nevent: refresh\n")
+    assert broadcaster.subscriber_count == 0
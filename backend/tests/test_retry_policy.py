@@ -0,0 +1,226 @@
+"""Tests for the LLM retry policy, circuit breaker and hedging."""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import grok_service
+from app.services.retry_policy import (
+    CircuitBreaker,
+    RetryPolicy,
+    classify_error,
+    hedged,
+    llm_circuit_breaker,
+    retry_after_seconds,
+)
+
+
+class HTTPError(Exception):
+    """Stand-in for a LiteLLM exception carrying a status and headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.litellm_response_headers = headers or {}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClassifyError:
+    def test_statuses(self):
+        """Test 429s, 5xx and status-less errors retry; other 4xx do not."""
+        assert classify_error(HTTPError(429)) == "rate_limited"
+        assert classify_error(HTTPError(503)) == "transient"
+        assert classify_error(HTTPError(408)) == "transient"
+        assert classify_error(ConnectionResetError("reset")) == "transient"
+        assert classify_error(HTTPError(400)) == "fatal"
+        assert classify_error(HTTPError(401)) == "fatal"
+
+    def test_retry_after_formats(self):
+        """Test seconds, milliseconds and HTTP-date hints are understood."""
+        assert retry_after_seconds(HTTPError(429, {"retry-after": "3"})) == 3.0
+        assert retry_after_seconds(HTTPError(429, {"retry-after-ms": "1500"})) == 1.5
+        later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=20), usegmt=True)
+        assert 18 <= retry_after_seconds(HTTPError(429, {"retry-after": later})) <= 20
+        assert retry_after_seconds(HTTPError(429)) is None
+        assert retry_after_seconds(Exception("no headers")) is None
+
+
+class TestRetryPolicy:
+    def test_full_jitter_bounds(self):
+        """Test waits are drawn from [0, min(max_delay, base * 2**(n-1))]."""
+        policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=5, rng=random.Random(1))
+        for attempt, ceiling in [(1, 1), (2, 2), (3, 4), (4, 5), (8, 5)]:
+            delays = [policy.backoff(attempt) for _ in range(200)]
+            assert 0 <= min(delays) and max(delays) <= ceiling
+            assert max(delays) > ceiling * 0.8
+
+    def test_decisions(self):
+        """Test fatal errors stop, Retry-After sets the minimum wait, attempts are capped."""
+        policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=10)
+
+        assert not policy.decide(HTTPError(400), 1).retry
+        assert not policy.decide(HTTPError(503), 3).retry
+
+        decision = policy.decide(HTTPError(429, {"retry-after": "2"}), 1)
+        assert decision.retry and decision.delay >= 2
+
+        assert not policy.decide(HTTPError(429, {"retry-after": "60"}), 1).retry
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_probes(self):
+        """Test the breaker fails fast, lets one probe through, then closes."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, clock=clock)
+
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure(HTTPError(502))
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        clock.now = 10
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+        assert not breaker.allow()  # only one probe at a time
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.snapshot()["rejected_calls"] == 2
+
+    def test_failed_probe_reopens(self):
+        """Test a failing probe restarts the open period."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+        breaker.record_failure(TimeoutError())
+        clock.now = 10
+        assert breaker.allow()
+        breaker.record_failure(TimeoutError())
+
+        clock.now = 15
+        assert breaker.state == "open"
+
+    def test_rate_limits_and_fatal_errors_do_not_count(self):
+        """Test only upstream-health failures move the breaker."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        for _ in range(5):
+            breaker.record_failure(HTTPError(429))
+            breaker.record_failure(HTTPError(400))
+        assert breaker.state == "closed"
+
+
+class TestHedged:
+    def test_slow_first_call_is_hedged(self):
+        """Test a second call starts after the delay and the faster one wins."""
+        delays = iter([1.0, 0.01])
+        started = []
+
+        async def call():
+            delay = next(delays)
+            started.append(delay)
+            await asyncio.sleep(delay)
+            return delay
+
+        result = asyncio.run(hedged(call, 0.05))
+
+        assert result == 0.01
+        assert started == [1.0, 0.01]
+
+    def test_fast_call_is_not_hedged(self):
+        """Test no duplicate request is sent when the first answers in time."""
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "ok"
+
+        assert asyncio.run(hedged(call, 0.5)) == "ok"
+        assert len(calls) == 1
+
+    def test_both_failing_raises(self):
+        """Test the error surfaces when every hedged call fails."""
+
+        async def call():
+            await asyncio.sleep(0.02)
+            raise HTTPError(503)
+
+        with pytest.raises(HTTPError):
+            asyncio.run(hedged(call, 0.01))
+
+
+class TestGrokRetryIntegration:
+    @patch("app.services.grok_service.asyncio.sleep")
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_fatal_error_not_retried(self, mock_completion, mock_sleep):
+        """Test a 400 is returned as a failure without retrying."""
+        mock_completion.side_effect = HTTPError(400)
+
+        assert grok_service.call_grok_with_retry("prompt") is None
+        assert mock_completion.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("app.services.grok_service.asyncio.sleep")
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_retry_after_honored(self, mock_acompletion, mock_sleep):
+        """Test the wait after a 429 is at least the Retry-After hint."""
+        response = MagicMock()
+        response.choices[0].message.content = "ok"
+        mock_acompletion.side_effect = [HTTPError(429, {"retry-after": "4"}), response]
+
+        assert asyncio.run(grok_service.call_grok_with_retry_async("prompt")) == "ok"
+        assert mock_sleep.await_args.args[0] >= 4
+
+    @patch("app.services.grok_service.asyncio.sleep")
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_open_breaker_fails_fast_across_areas(self, mock_acompletion, mock_sleep):
+        """Test an unhealthy upstream stops calls for the remaining focus areas."""
+        mock_acompletion.side_effect = HTTPError(503)
+
+        result = asyncio.run(grok_service.run_full_analysis_async(max_concurrency=1))
+
+        assert result["trends"] == []
+        # Threshold failures open the breaker; later areas make no call at all
+        assert mock_acompletion.call_count == llm_circuit_breaker.failure_threshold
+        assert llm_circuit_breaker.state == "open"
+
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_cancelled_probe_released(self, mock_acompletion):
+        """Test a half-open probe cancelled mid-call lets the next call probe."""
+        clock = FakeClock()
+        mock_acompletion.side_effect = asyncio.CancelledError()
+        with patch.object(llm_circuit_breaker, "_clock", clock):
+            for _ in range(llm_circuit_breaker.failure_threshold):
+                llm_circuit_breaker.record_failure(HTTPError(503))
+            clock.now = llm_circuit_breaker.reset_seconds
+
+            with pytest.raises(asyncio.CancelledError):
+                asyncio.run(grok_service.call_grok_with_retry_async("prompt"))
+
+            assert llm_circuit_breaker.allow()
+
+    @patch.object(grok_service, "LLM_HEDGE_AFTER_MS", 20)
+    @patch("app.services.grok_service.litellm.acompletion")
+    def test_hedged_call(self, mock_acompletion):
+        """Test a slow first request is raced by a hedge."""
+        fast = MagicMock()
+        fast.choices[0].message.content = "fast"
+
+        async def respond(**kwargs):
+            if mock_acompletion.call_count == 1:
+                await asyncio.sleep(1)
+            return fast
+
+        mock_acompletion.side_effect = respond
+
+        assert asyncio.run(grok_service.call_grok_with_retry_async("prompt")) == "fast"
+        assert mock_acompletion.call_count == 2
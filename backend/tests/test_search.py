@@ -0,0 +1,131 @@
+"""Tests for full-text trend search."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.radar_store import save_radar
+from app.services.trend_search import build_match_query
+from tests.conftest import make_trend
+
+
+@pytest.fixture
+def client(session_factory):
+    """Client over the in-memory database, seeded with two radars."""
+    with session_factory() as db:
+        save_radar(
+            db,
+            "2026-01-30",
+            [
+                make_trend("LiveKit", technical_insight="WebRTC transport with 180ms latency"),
+                make_trend(
+                    "Modal",
+                    "durable_runtime",
+                    technical_insight="Snapshots",
+                    signal_evidence=["Cold-start under 1s"],
+                ),
+            ],
+        )
+        save_radar(
+            db,
+            "2026-02-06",
+            [
+                make_trend(
+                    "HypeRuntime",
+                    "durable_runtime",
+                    "noise",
+                    technical_insight="Claims instant cold-start",
+                ),
+                make_trend("WebRTC Kit", technical_insight="Browser audio"),
+                make_trend(
+                    "Injector",
+                    classification="noise",
+                    technical_insight="<img src=x onerror=alert(1)> payload",
+                ),
+            ],
+        )
+    return TestClient(app), session_factory
+
+
+def test_build_match_query_quotes_terms():
+    """Test user input can't inject FTS5 query syntax."""
+    assert build_match_query("cold-start") == '"cold-start"'
+    assert build_match_query('C++ OR "two words"') == '"C++" "OR" "two words"'
+    assert build_match_query("bench*") == '"bench"*'
+    assert build_match_query('  "" ') == ""
+
+
+def test_search_ranks_and_snippets(client):
+    """Test matches are ranked with tool names weighted highest."""
+    client, _ = client
+
+    response = client.get("/api/search?q=webrtc")
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["tool_name"] for r in results] == ["WebRTC Kit", "LiveKit"]
+    assert "<mark>WebRTC</mark>" in results[1]["snippet"]
+
+
+def test_search_snippet_escapes_stored_text(client):
+    """Test markup in LLM-written text is escaped while hits stay highlighted."""
+    client, _ = client
+
+    results = client.get("/api/search?q=payload").json()["results"]
+
+    assert results[0]["snippet"] == "&lt;img src=x onerror=alert(1)&gt; <mark>payload</mark>"
+
+
+def test_search_covers_evidence_and_filters(client):
+    """Test evidence text is searchable and filters narrow results."""
+    client, _ = client
+
+    names = {r["tool_name"] for r in client.get("/api/search?q=cold-start").json()["results"]}
+    assert names == {"Modal", "HypeRuntime"}
+
+    response = client.get("/api/search?q=cold-start&classification=noise")
+    assert [r["tool_name"] for r in response.json()["results"]] == ["HypeRuntime"]
+
+    response = client.get("/api/search?q=cold-start&from=2026-01-01&to=2026-01-31")
+    assert [r["tool_name"] for r in response.json()["results"]] == ["Modal"]
+
+    response = client.get("/api/search?q=latenc*&focus_area=voice_ai_ux")
+    assert [r["tool_name"] for r in response.json()["results"]] == ["LiveKit"]
+
+
+def test_search_evidence_as_text(client):
+    """Test non-ASCII evidence is searchable and its snippet has no JSON syntax."""
+    client, Session = client
+
+    with Session() as db:
+        save_radar(
+            db,
+            "2026-02-13",
+            [make_trend("Pipecat", signal_evidence=["Latenz über 200ms", "SLA"])],
+        )
+
+    results = client.get("/api/search?q=über").json()["results"]
+
+    assert [r["tool_name"] for r in results] == ["Pipecat"]
+    assert results[0]["snippet"] == "Latenz <mark>über</mark> 200ms; SLA"
+
+
+def test_search_index_follows_refresh(client):
+    """Test replacing a radar removes its old rows from the index."""
+    client, Session = client
+
+    with Session() as db:
+        replacement = make_trend("Replacement", technical_insight="Opus codec")
+        save_radar(db, "2026-02-06", [replacement])
+
+    assert client.get("/api/search?q=HypeRuntime").json()["results"] == []
+    assert client.get("/api/search?q=opus").json()["results"][0]["tool_name"] == "Replacement"
+
+
+def test_search_validation(client):
+    """Test missing queries and inverted ranges are rejected."""
+    client, _ = client
+
+    assert client.get("/api/search").status_code == 422
+    assert client.get("/api/search?q=x&from=2026-02-01&to=2026-01-01").status_code == 422
+    assert client.get('/api/search?q=" AND (').json()["results"] == []
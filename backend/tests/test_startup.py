@@ -0,0 +1,71 @@
+"""Tests for cold start cost: import budget and deferred heavy imports."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.lazy_imports import LazyModule
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Cumulative `python -X importtime` budget for app.main, in milliseconds
+IMPORT_BUDGET_MS = float(os.getenv("RADAR_IMPORT_BUDGET_MS", "3000"))
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Run statement in a fresh interpreter and return cumulative import times (us)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_main_import_budget():
+    """Test importing the app stays within budget and does not load LiteLLM."""
+    times = _import_times("import app.main")
+
+    assert "litellm" not in times
+    assert times["app.main"] / 1000 < IMPORT_BUDGET_MS
+
+
+def test_refresh_modules_defer_litellm():
+    """Test the lifespan's imports leave LiteLLM for the first refresh."""
+    times = _import_times(
+        "import app.services.refresh_jobs, app.services.llm_http; "
+        "from app.services.llm_http import llm_http; llm_http.open()"
+    )
+
+    assert "app.services.grok_service" in times
+    assert "litellm" not in times
+
+
+def test_lazy_module_imports_on_first_use(tmp_path, monkeypatch):
+    """Test the module loads on attribute access and on_load callbacks run once."""
+    (tmp_path / "lazy_probe.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe", raising=False)
+    seen = []
+
+    module = LazyModule("lazy_probe")
+    module.on_load(lambda loaded: seen.append(loaded.VALUE))
+    assert not module.loaded
+    assert seen == []
+
+    assert module.VALUE == 42
+    assert module.loaded
+    assert seen == [42]
+    module.on_load(lambda loaded: seen.append("late"))
+    assert seen == [42, "late"]
+    monkeypatch.delitem(sys.modules, "lazy_probe")
@@ -0,0 +1,71 @@
+"""Tests for the tool registry and the tool timeline endpoint."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Tool, Trend
+from app.services.radar_store import save_radar
+from app.services.tool_registry import canonical_tool_name
+from tests.conftest import make_trend
+
+
+def test_canonical_tool_name():
+    """Test spelling variants share one canonical name."""
+    assert canonical_tool_name("LangGraph") == "langgraph"
+    assert canonical_tool_name(" Lang-Graph ") == "langgraph"
+    assert canonical_tool_name("lang_graph.io") == "langgraphio"
+    assert canonical_tool_name("C++") != canonical_tool_name("C")
+
+
+def test_save_radar_links_trends_to_tools(session_factory):
+    """Test variants across radars resolve to a single tool row."""
+    with session_factory() as db:
+        save_radar(db, "2026-01-30", [make_trend("LangGraph")])
+        save_radar(db, "2026-02-06", [make_trend("langgraph"), make_trend("Temporal")])
+
+        tools = {tool.canonical_name: tool for tool in db.query(Tool)}
+        assert set(tools) == {"langgraph", "temporal"}
+        assert tools["langgraph"].display_name == "LangGraph"
+        assert (tools["langgraph"].first_seen, tools["langgraph"].last_seen) == (
+            "2026-01-30",
+            "2026-02-06",
+        )
+        assert {t.tool_id for t in db.query(Trend).filter(Trend.tool_name.ilike("langgraph"))} == {
+            tools["langgraph"].id
+        }
+
+
+def test_separator_only_names_not_merged(session_factory):
+    """Test names with no canonical key get no tool instead of sharing one."""
+    with session_factory() as db:
+        save_radar(db, "2026-01-30", [make_trend("---"), make_trend(" . "), make_trend("Temporal")])
+
+        assert [tool.canonical_name for tool in db.query(Tool)] == ["temporal"]
+        unregistered = db.query(Trend.tool_name).filter(Trend.tool_id.is_(None))
+        assert sorted(name for (name,) in unregistered) == [" . ", "---"]
+
+
+def test_tool_timeline_endpoint(session_factory):
+    """Test the timeline lists each classification in date order."""
+    with session_factory() as db:
+        noise = make_trend("langgraph", classification="noise", confidence_score=40)
+        save_radar(db, "2026-02-06", [noise])
+        save_radar(db, "2026-01-30", [make_trend("LangGraph", confidence_score=85)])
+
+    response = TestClient(app).get("/api/tools/Lang-Graph/timeline")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["canonical_name"] == "langgraph"
+    assert data["first_seen"] == "2026-01-30"
+    assert [(e["radar_date"], e["classification"], e["tool_name"]) for e in data["timeline"]] == [
+        ("2026-01-30", "signal", "LangGraph"),
+        ("2026-02-06", "noise", "langgraph"),
+    ]
+
+
+def test_tool_timeline_unknown_tool(session_factory):
+    """Test unknown tools return 404."""
+    response = TestClient(app).get("/api/tools/nothing/timeline")
+
+    assert response.status_code == 404
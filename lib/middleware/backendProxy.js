@@ -0,0 +1,47 @@
+/**
+ * UI5 server middleware forwarding /api requests to the FastAPI backend.
+ *
+ * Keeps the app on relative URLs (/api/radar, /api/radar/events) during
+ * `npm start`, the same as behind a reverse proxy in production. Responses
+ * are piped through unbuffered so the Server-Sent Events stream works.
+ * The target comes from the BACKEND_URL environment variable or the
+ * `baseUrl` configuration in ui5.yaml.
+ */
+"use strict";
+
+const http = require("http");
+const https = require("https");
+
+module.exports = function ({ log, options }) {
+    const configuration = (options && options.configuration) || {};
+    const baseUrl = new URL(process.env.BACKEND_URL || configuration.baseUrl || "http://localhost:8000");
+    const mountPath = configuration.mountPath || "/api";
+    const transport = baseUrl.protocol === "https:" ? https : http;
+
+    return function backendProxy(req, res, next) {
+        if (req.url !== mountPath && !req.url.startsWith(mountPath + "/") && !req.url.startsWith(mountPath + "?")) {
+            next();
+            return;
+        }
+        const target = new URL(req.url, baseUrl);
+        const headers = Object.assign({}, req.headers, { host: target.host });
+        const upstream = transport.request(target, { method: req.method, headers: headers }, function (upstreamRes) {
+            res.writeHead(upstreamRes.statusCode, upstreamRes.headers);
+            upstreamRes.pipe(res);
+        });
+        upstream.on("error", function (err) {
+            log.warn("Backend proxy error for " + req.url + ": " + err.message);
+            if (!res.headersSent) {
+                res.statusCode = 502;
+                res.end("Backend unavailable at " + baseUrl.origin);
+            } else {
+                res.end();
+            }
+        });
+        // Stop the upstream request (e.g. the event stream) when the browser goes away
+        req.on("close", function () {
+            upstream.destroy();
+        });
+        req.pipe(upstream);
+    };
+};
@@ -11,6 +11,80 @@ sap.ui.define([
             // Wait for radar model to load data
             var oRadarModel = this.getOwnerComponent().getModel("radar");
             oRadarModel.attachRequestCompleted(this._onDataLoaded, this);
+
+            this._connectRadarEvents();
+        },
+
+        onExit: function () {
+            if (this._oEventSource) {
+                this._oEventSource.close();
+                this._oEventSource = null;
+            }
+        },
+
+        _connectRadarEvents: function () {
+            var sUrl = this.getOwnerComponent().getManifestEntry("/sap.ui5/config/radarEventsUrl");
+
+            // Server pushes radar deltas, so the dashboard never polls
+            if (!sUrl || !window.EventSource) {
+                return;
+            }
+            this._oEventSource = new EventSource(sUrl);
+            this._oEventSource.addEventListener("radar", this._onRadarEvent.bind(this));
+        },
+
+        _onRadarEvent: function (oEvent) {
+            var oEventData = JSON.parse(oEvent.data);
+            var oRadarModel = this.getOwnerComponent().getModel("radar");
+            var oData = oRadarModel.getData();
+
+            if (!oEventData.latest) {
+                return;
+            }
+
+            // Patch in place only if we hold the radar the delta was computed against
+            var bCurrent = oData && oData.trends &&
+                (oData.radar_date === oEventData.previous_radar_date || oData.radar_date === oEventData.radar_date);
+            var aTrends = bCurrent ? this._applyRadarDelta(oData.trends, oEventData) : null;
+
+            if (!aTrends || aTrends.length !== oEventData.trends_count) {
+                this._reloadRadar();
+                return;
+            }
+
+            oRadarModel.setData({ radar_date: oEventData.radar_date, trends: aTrends });
+            this._createFocusAreaModels(aTrends);
+        },
+
+        _applyRadarDelta: function (aTrends, oDelta) {
+            var fnKey = function (oTrend) {
+                return oTrend.focus_area + "|" + oTrend.tool_name;
+            };
+            var mReplaced = {};
+            var mRemoved = {};
+
+            oDelta.changed.forEach(function (oTrend) {
+                mReplaced[fnKey(oTrend)] = oTrend;
+            });
+            oDelta.removed.forEach(function (oKey) {
+                mRemoved[fnKey(oKey)] = true;
+            });
+
+            return aTrends
+                .filter(function (oTrend) {
+                    return !mRemoved[fnKey(oTrend)];
+                })
+                .map(function (oTrend) {
+                    return mReplaced[fnKey(oTrend)] || oTrend;
+                })
+                .concat(oDelta.added);
+        },
+
+        _reloadRadar: function () {
+            var oComponent = this.getOwnerComponent();
+            var sUri = oComponent.getManifestEntry("/sap.app/dataSources/radarData/uri");
+
+            oComponent.getModel("radar").loadData(oComponent.getManifestObject().resolveUri(sUri));
         },
 
         _onDataLoaded: function () {